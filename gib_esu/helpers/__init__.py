@@ -1,3 +1,31 @@
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .concurrency import AIMDLimiter
+from .csv_row import CsvRow
+from .dispatcher import dispatch, dispatch_async, pipeline, pipeline_async
+from .journal import Journal
+from .jsonl_writer import JsonLinesWriter
+from .lru_cache import LRUCache
+from .process_pool import process_map
 from .py_utils import PyUtils
+from .rate_limiter import TokenBucket
+from .result_collector import ResultCollector
+from .snapshot import SnapshotStore
 
-__all__ = ["PyUtils"]
+__all__ = [
+    "AIMDLimiter",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CsvRow",
+    "Journal",
+    "JsonLinesWriter",
+    "LRUCache",
+    "PyUtils",
+    "ResultCollector",
+    "SnapshotStore",
+    "TokenBucket",
+    "dispatch",
+    "dispatch_async",
+    "pipeline",
+    "pipeline_async",
+    "process_map",
+]
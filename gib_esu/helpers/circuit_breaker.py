@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Callable
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker to fail fast while a remote service is down.
+
+    The circuit opens after `failure_threshold` consecutive failures and
+    rejects calls until `reset_timeout` seconds have passed. It then becomes
+    half-open and lets a single probe call through, which closes the circuit
+    on success or opens it again on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """CircuitBreaker constructor.
+
+        Args:
+            failure_threshold (int, optional): Number of consecutive failures
+            opening the circuit. Defaults to 5.
+            reset_timeout (float, optional): Seconds to wait before letting a
+            probe call through an open circuit. Defaults to 30.
+            clock (Callable[[], float], optional): Monotonic clock in seconds.
+            Defaults to time.monotonic.
+
+        Raises:
+            ValueError: When `failure_threshold` or `reset_timeout` is not positive
+        """
+        if failure_threshold < 1 or reset_timeout <= 0:
+            raise ValueError("`failure_threshold` ve `reset_timeout` pozitif olmalıdır")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = float(reset_timeout)
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _state(self, now: float) -> str:
+        if self._failures < self.failure_threshold:
+            return self.CLOSED
+        if now - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit, one of `closed`, `open` or `half_open`."""
+        with self._lock:
+            return self._state(self._clock())
+
+    def allow(self) -> bool:
+        """Checks whether a call may proceed.
+
+        In half-open state only the first caller is let through, the cool-down
+        restarts so that concurrent callers are rejected until the probe
+        call is recorded or another `reset_timeout` passes.
+
+        Returns:
+            bool: True when the call may proceed
+        """
+        with self._lock:
+            now = self._clock()
+            state = self._state(now)
+            if state == self.HALF_OPEN:
+                self._opened_at = now
+                return True
+            return state == self.CLOSED
+
+    def record_success(self) -> None:
+        """Records a successful call, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Records a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from typing import List, Optional, Tuple
+
+
+class AIMDLimiter:
+    """Thread-safe concurrency limit adapting to latency and failures (AIMD).
+
+    The limit grows additively, by about one for each full window of healthy
+    completions, and shrinks multiplicatively when the moving average of
+    latencies exceeds `latency_tolerance` times its lowest value so far or when
+    a failure is reported. Only one decrease is applied per window, so that the
+    requests already in flight during a slowdown do not collapse the limit.
+    """
+
+    # absolute latency slack in seconds, ignoring jitter of very fast requests
+    LATENCY_SLACK = 0.01
+    # weight of a completion in the moving average of latencies
+    SMOOTHING = 0.1
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """AIMDLimiter constructor.
+
+        Args:
+            initial (int, optional): Initial limit. Defaults to 4.
+            minimum (int, optional): Lower bound of the limit. Defaults to 1.
+            maximum (int, optional): Upper bound of the limit. Defaults to 32.
+            latency_tolerance (float, optional): Ratio of the average latency to
+            its lowest value above which completions are considered slow.
+            Defaults to 2.
+            decrease_factor (float, optional): Multiplier applied to the limit
+            on slowdowns and failures. Defaults to 0.5.
+
+        Raises:
+            ValueError: When the bounds or factors are inconsistent
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("1 <= `minimum` <= `initial` <= `maximum` olmalıdır")
+        if latency_tolerance < 1 or not 0 < decrease_factor < 1:
+            raise ValueError(
+                "`latency_tolerance` en az 1, `decrease_factor` 0 ile 1 arasında "
+                "olmalıdır"
+            )
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.peak = initial
+        self._limit = float(initial)
+        self._latency: Optional[float] = None
+        self._min_latency: Optional[float] = None
+        self._since_decrease = float("inf")  # allows an immediate first decrease
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def limit(self) -> int:
+        """Current number of allowed in-flight operations."""
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Blocks the calling thread until an in-flight slot is free."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Suspends the calling task until an in-flight slot is free."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, latency: Optional[float] = None, failed: bool = False) -> None:
+        """Frees an in-flight slot and adapts the limit to the outcome.
+
+        Args:
+            latency (Optional[float], optional): Duration of the operation in
+            seconds. Defaults to None (not taken into account).
+            failed (bool, optional): Whether the operation failed.
+            Defaults to False.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._since_decrease += 1
+            if failed or self._slow(latency):
+                self._decrease()
+            else:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self.peak = max(self.peak, self.limit)
+            self._wake()
+
+    def backoff(self) -> None:
+        """Reports congestion noticed before the operation completes."""
+        with self._condition:
+            self._decrease()
+
+    def _slow(self, latency: Optional[float]) -> bool:
+        if latency is None:
+            return False
+        # compares smoothed latency, a single slow completion is just noise
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self.SMOOTHING * (latency - self._latency)
+        if self._min_latency is None or self._latency < self._min_latency:
+            self._min_latency = self._latency
+        return (
+            self._latency
+            > self._min_latency * self.latency_tolerance + self.LATENCY_SLACK
+        )
+
+    def _decrease(self) -> None:
+        # one decrease per window of completions, long enough for the moving
+        # average to reflect the previous decrease
+        if self._since_decrease >= max(self.limit, 1 / self.SMOOTHING):
+            self._limit = max(self.minimum, self._limit * self.decrease_factor)
+            self._since_decrease = 0
+
+    def _wake(self) -> None:
+        self._condition.notify_all()
+        waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_set_done, waiter)
+
+
+def _set_done(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,54 @@
+from typing import Any, Iterator, Mapping, Optional, Tuple, TypeVar, Union, overload
+
+T = TypeVar("T")
+
+
+class CsvRow(Mapping[str, str]):
+    """Read-only csv row, a tuple of values with a column index shared by
+    the rows of the same input.
+
+    A row takes a fraction of the memory of a dictionary, as the column names
+    and the hash table are stored once per input instead of once per row.
+    Rows are mappings, they are read like the dictionaries of
+    `csv.DictReader` and converted with `dict(row)` where a dictionary is needed.
+    """
+
+    __slots__ = ("_columns", "_values")
+
+    def __init__(self, columns: Mapping[str, int], values: Tuple[str, ...]) -> None:
+        """CsvRow constructor.
+
+        Args:
+            columns (Mapping[str, int]): Index of the values per column name,
+            shared by the rows of an input
+            values (Tuple[str, ...]): Values of the row, one per column
+        """
+        self._columns = columns
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        return self._values[self._columns[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._columns
+
+    @overload
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @overload
+    def get(self, key: str, default: Union[str, T]) -> Union[str, T]:
+        ...
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._columns.get(key)
+        return default if index is None else self._values[index]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
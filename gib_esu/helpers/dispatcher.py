@@ -0,0 +1,235 @@
+import asyncio
+import queue
+import threading
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# marks the end of the input for a consumer
+_DONE = object()
+
+
+def dispatch(
+    items: Iterable[T],
+    worker: Callable[[T], None],
+    workers: int,
+    queue_size: Optional[int] = None,
+    on_error: Optional[Callable[[T, Exception], None]] = None,
+) -> None:
+    """Processes items with a pool of threads fed through a bounded queue.
+
+    Items are pulled from `items` by the calling thread only as fast as the
+    consumers take them, so memory use does not depend on the number of items
+    and processing starts before the input is exhausted.
+
+    Args:
+        items (Iterable[T]): Items to process, possibly a lazy iterator
+        worker (Callable[[T], None]): Processes a single item
+        workers (int): Number of consumer threads
+        queue_size (Optional[int], optional): Maximum number of items waiting
+        in the queue. Defaults to None (twice the number of consumers).
+        on_error (Optional[Callable[[T, Exception], None]], optional): Handles
+        an item's exception and lets the processing go on. When None, the first
+        exception stops the processing and is raised. Defaults to None.
+
+    Raises:
+        ValueError: When `workers` is not positive
+    """
+
+    def stage(item: T) -> bool:
+        worker(item)
+        return False
+
+    pipeline(items, [stage], workers, queue_size=queue_size, on_error=on_error)
+
+
+def pipeline(
+    items: Iterable[T],
+    stages: Sequence[Callable[[T], bool]],
+    workers: int,
+    queue_size: Optional[int] = None,
+    on_error: Optional[Callable[[T, Exception], None]] = None,
+) -> None:
+    """Processes items through consecutive stages, each run by its own pool of
+    threads fed through its own bounded queue.
+
+    A stage returns whether the item goes on to the next stage, so the later
+    stages of an item can be skipped once an earlier one fails. An item enters
+    the next stage as soon as it leaves the previous one, so the stages of
+    different items overlap, e.g. the first stage of later items runs while
+    the second stage of earlier ones does.
+
+    Args:
+        items (Iterable[T]): Items to process, possibly a lazy iterator
+        stages (Sequence[Callable[[T], bool]]): Process a single item, each
+        returning whether the item goes on to the next stage
+        workers (int): Number of consumer threads per stage
+        queue_size (Optional[int], optional): Maximum number of items waiting
+        in each queue. Defaults to None (twice the number of consumers).
+        on_error (Optional[Callable[[T, Exception], None]], optional): Handles
+        an item's exception, which ends the item's processing, and lets the
+        processing go on. When None, the first exception stops the processing
+        and is raised. Defaults to None.
+
+    Raises:
+        ValueError: When `workers` is not positive or `stages` is empty
+    """
+    if workers < 1:
+        raise ValueError("`workers` en az 1 olmalıdır")
+    if not stages:
+        raise ValueError("`stages` en az bir aşama içermelidir")
+    queues: "List[queue.Queue[Any]]" = [
+        queue.Queue(queue_size or 2 * workers) for _ in stages
+    ]
+    errors: List[Exception] = []
+
+    def consume(index: int) -> None:
+        stage = stages[index]
+        next_queue = queues[index + 1] if index + 1 < len(queues) else None
+        while True:
+            item = queues[index].get()
+            if item is _DONE:
+                return
+            if errors:
+                continue  # draining after a failure
+            try:
+                if stage(item) and next_queue is not None:
+                    next_queue.put(item)
+            except Exception as error:
+                if on_error is None:
+                    errors.append(error)
+                else:
+                    on_error(item, error)
+
+    pools = [
+        [
+            threading.Thread(target=consume, args=(index,), daemon=True)
+            for _ in range(workers)
+        ]
+        for index in range(len(stages))
+    ]
+    for threads in pools:
+        for thread in threads:
+            thread.start()
+    try:
+        for item in items:
+            if errors:
+                break
+            queues[0].put(item)
+    finally:
+        # a stage is closed once the previous one has handed over all its items
+        for items_queue, threads in zip(queues, pools):
+            for _ in threads:
+                items_queue.put(_DONE)
+            for thread in threads:
+                thread.join()
+    if errors:
+        raise errors[0]
+
+
+async def dispatch_async(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[None]],
+    workers: int,
+    queue_size: Optional[int] = None,
+    on_error: Optional[Callable[[T, Exception], None]] = None,
+) -> None:
+    """Processes items with a pool of tasks fed through a bounded queue.
+
+    Asyncio counterpart of `dispatch`, bounding the number of both in-flight
+    and pending items.
+
+    Args:
+        items (Iterable[T]): Items to process, possibly a lazy iterator
+        worker (Callable[[T], Awaitable[None]]): Processes a single item
+        workers (int): Number of consumer tasks
+        queue_size (Optional[int], optional): Maximum number of items waiting
+        in the queue. Defaults to None (twice the number of consumers).
+        on_error (Optional[Callable[[T, Exception], None]], optional): Handles
+        an item's exception and lets the processing go on. When None, the first
+        exception stops the processing and is raised. Defaults to None.
+
+    Raises:
+        ValueError: When `workers` is not positive
+    """
+
+    async def stage(item: T) -> bool:
+        await worker(item)
+        return False
+
+    await pipeline_async(
+        items, [stage], workers, queue_size=queue_size, on_error=on_error
+    )
+
+
+async def pipeline_async(
+    items: Iterable[T],
+    stages: Sequence[Callable[[T], Awaitable[bool]]],
+    workers: int,
+    queue_size: Optional[int] = None,
+    on_error: Optional[Callable[[T, Exception], None]] = None,
+) -> None:
+    """Processes items through consecutive stages, each run by its own pool of
+    tasks fed through its own bounded queue.
+
+    Asyncio counterpart of `pipeline`.
+
+    Args:
+        items (Iterable[T]): Items to process, possibly a lazy iterator
+        stages (Sequence[Callable[[T], Awaitable[bool]]]): Process a single
+        item, each returning whether the item goes on to the next stage
+        workers (int): Number of consumer tasks per stage
+        queue_size (Optional[int], optional): Maximum number of items waiting
+        in each queue. Defaults to None (twice the number of consumers).
+        on_error (Optional[Callable[[T, Exception], None]], optional): Handles
+        an item's exception, which ends the item's processing, and lets the
+        processing go on. When None, the first exception stops the processing
+        and is raised. Defaults to None.
+
+    Raises:
+        ValueError: When `workers` is not positive or `stages` is empty
+    """
+    if workers < 1:
+        raise ValueError("`workers` en az 1 olmalıdır")
+    if not stages:
+        raise ValueError("`stages` en az bir aşama içermelidir")
+    queues: "List[asyncio.Queue[Any]]" = [
+        asyncio.Queue(queue_size or 2 * workers) for _ in stages
+    ]
+    errors: List[Exception] = []
+
+    async def consume(index: int) -> None:
+        stage = stages[index]
+        next_queue = queues[index + 1] if index + 1 < len(queues) else None
+        while True:
+            item = await queues[index].get()
+            if item is _DONE:
+                return
+            if errors:
+                continue  # draining after a failure
+            try:
+                if await stage(item) and next_queue is not None:
+                    await next_queue.put(item)
+            except Exception as error:
+                if on_error is None:
+                    errors.append(error)
+                else:
+                    on_error(item, error)
+
+    pools = [
+        [asyncio.ensure_future(consume(index)) for _ in range(workers)]
+        for index in range(len(stages))
+    ]
+    try:
+        for item in items:
+            if errors:
+                break
+            await queues[0].put(item)
+    finally:
+        # a stage is closed once the previous one has handed over all its items
+        for items_queue, tasks in zip(queues, pools):
+            for _ in tasks:
+                await items_queue.put(_DONE)
+            await asyncio.gather(*tasks)
+    if errors:
+        raise errors[0]
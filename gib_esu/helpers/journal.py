@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Type
+
+
+class Journal:
+    """Append-only journal of completed operations in JSON lines format.
+
+    Every completed operation is written as a single line and flushed right
+    away, so that an interrupted batch can be resumed by loading the journal
+    instead of replaying the operations. A line cut short by a crash is
+    ignored when loading. The entries loaded from a previous run are kept
+    apart from the ones recorded in this run, see `loaded`.
+    """
+
+    def __init__(self, path: str, resume: bool = False, fsync: bool = False) -> None:
+        """Journal constructor.
+
+        Args:
+            path (str): Journal file path
+            resume (bool, optional): Whether to load the existing entries and
+            append to them, the file is truncated otherwise. Defaults to False.
+            fsync (bool, optional): Whether to also sync every entry to disk,
+            surviving power loss in addition to process crashes.
+            Defaults to False.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        terminated = True
+        if resume and os.path.exists(path):
+            terminated = self._load()
+        # entries of the previous runs, not updated by `record`
+        self._loaded = dict(self._entries)
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        if not terminated:
+            self._file.write("\n")  # keeps a cut short line apart from new ones
+
+    def __len__(self) -> int:
+        """Number of completed operations."""
+        return len(self._entries)
+
+    def __enter__(self) -> "Journal":
+        """Enters the runtime context, returning the journal itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exits the runtime context, closing the journal file."""
+        self.close()
+
+    def _load(self) -> bool:
+        # returns whether the file ends with a complete line
+        line = "\n"
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                    key, operation = entry.pop("key"), entry.pop("operation")
+                except (ValueError, KeyError, AttributeError):
+                    continue  # partially written line
+                self._entries[(key, operation)] = entry
+        return line.endswith("\n")
+
+    def get(self, key: str, operation: str) -> Optional[Dict[str, Any]]:
+        """Returns the recorded fields of a completed operation.
+
+        Args:
+            key (str): Key of the processed item
+            operation (str): Name of the operation
+
+        Returns:
+            Optional[Dict[str, Any]]: Recorded fields, None when the operation
+            is not completed yet
+        """
+        return self._entries.get((key, operation))
+
+    def loaded(self, key: str, operation: str) -> Optional[Dict[str, Any]]:
+        """Returns the recorded fields of an operation completed in a previous
+        run, ignoring the ones recorded since the journal was opened.
+
+        Args:
+            key (str): Key of the processed item
+            operation (str): Name of the operation
+
+        Returns:
+            Optional[Dict[str, Any]]: Recorded fields, None when the operation
+            was not completed in a previous run
+        """
+        return self._loaded.get((key, operation))
+
+    def record(self, key: str, operation: str, **fields: Any) -> None:
+        """Records a completed operation.
+
+        Args:
+            key (str): Key of the processed item
+            operation (str): Name of the operation
+            **fields (Any): JSON serializable fields to record
+        """
+        line = json.dumps(
+            {"key": key, "operation": operation, **fields}, ensure_ascii=False
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._entries[(key, operation)] = fields
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        self._file.close()
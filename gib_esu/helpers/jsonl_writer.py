@@ -0,0 +1,55 @@
+import gzip
+import threading
+from types import TracebackType
+from typing import IO, Optional, Type, Union
+
+
+class JsonLinesWriter:
+    """Thread-safe writer of JSON documents, one per line, as they are produced.
+
+    Paths ending with ".gz" are gzip compressed. Plain files are flushed after
+    every line so that they can be followed while being written, compressed
+    files are flushed when closed to keep the compression ratio.
+    """
+
+    def __init__(self, path: str) -> None:
+        """JsonLinesWriter constructor.
+
+        Args:
+            path (str): Output file path, truncated when it exists
+        """
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self._file: Union[gzip.GzipFile, IO[bytes]] = (
+            gzip.GzipFile(path, "wb") if self.compressed else open(path, "wb")
+        )
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "JsonLinesWriter":
+        """Enters the runtime context, returning the writer itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exits the runtime context, closing the output file."""
+        self.close()
+
+    def write(self, document: bytes) -> None:
+        """Writes a serialized JSON document as a line.
+
+        Args:
+            document (bytes): Utf-8 encoded JSON document without line breaks
+        """
+        with self._lock:
+            self._file.write(document + b"\n")
+            if not self.compressed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Closes the output file."""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe bounded cache evicting the least recently used entry.
+
+    Used to share the values built from inputs repeated across the rows of a
+    batch, so that each distinct input is parsed and validated once and the
+    rows hold references to the same objects. Cached values are shared by
+    every caller and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """LRUCache constructor.
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+
+        Raises:
+            ValueError: When `maxsize` is not positive
+        """
+        if maxsize < 1:
+            raise ValueError("`maxsize` en az 1 olmalıdır")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of the lookups served from the cache, 0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: K, factory: Callable[[], V]) -> V:
+        """Returns the cached value of a key, building and caching it on a miss.
+
+        The value is built outside the lock, concurrent misses of the same key
+        may build it more than once and the last one built is kept. Nothing is
+        cached when the factory raises.
+
+        Args:
+            key (K): Key of the value
+            factory (Callable[[], V]): Builds the value of the key
+
+        Returns:
+            V: Cached or newly built value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = factory()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Removes the cached entries and resets the hit and miss counts."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
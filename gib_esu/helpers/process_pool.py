@@ -0,0 +1,47 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# chunks per process, balancing the load against the inter-process overhead
+_CHUNKS_PER_WORKER = 4
+
+
+def process_map(
+    function: Callable[[T], R],
+    items: Sequence[T],
+    workers: Optional[int] = None,
+) -> Iterator[R]:
+    """Applies a function to items across a pool of processes, in input order.
+
+    Items are sent to the processes in chunks to amortize the pickling and
+    inter-process overhead. CPU bound work such as model validation then runs
+    in parallel instead of competing for the GIL with the calling process.
+    With a single worker, or a single item, the function is applied in the
+    calling process without starting a pool.
+
+    Args:
+        function (Callable[[T], R]): Picklable function, e.g. a module level
+        function or a `functools.partial` of one
+        items (Sequence[T]): Picklable items
+        workers (Optional[int], optional): Number of processes.
+        Defaults to None (number of CPUs).
+
+    Raises:
+        ValueError: When `workers` is not positive
+
+    Yields:
+        Iterator[R]: Results of the function, in the order of the items
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("`workers` en az 1 olmalıdır")
+    if workers == 1 or len(items) <= 1:
+        yield from map(function, items)
+        return
+    workers = min(workers, len(items))
+    chunksize = max(1, len(items) // (workers * _CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, items, chunksize=chunksize)
@@ -1,15 +1,16 @@
 import csv
 import io
-from typing import Dict, List, Union
+import sys
+from typing import Iterator, List, Mapping, Optional, Sequence, Union
+
+from gib_esu.helpers.csv_row import CsvRow
 
 
 class PyUtils:
     """Class encapsulating various python utility methods."""
 
     @classmethod
-    def read_csv(
-        cls, filepath_or_buffer: Union[str, io.StringIO]
-    ) -> List[Dict[str, str]]:
+    def read_csv(cls, filepath_or_buffer: Union[str, io.StringIO]) -> List[CsvRow]:
         """Reads input data from a CSV file or string stream.
 
         Args:
@@ -17,8 +18,29 @@ class PyUtils:
             or a string stream containing CSV data.
 
         Returns:
-            List[Dict[str, str]]: A list of dictionaries representing rows in the CSV
-            with all fields as strings.
+            List[CsvRow]: A list of read-only mappings representing rows in the
+            CSV with all fields as strings.
+        """
+
+        return list(cls.iter_csv(filepath_or_buffer))
+
+    @classmethod
+    def iter_csv(cls, filepath_or_buffer: Union[str, io.StringIO]) -> Iterator[CsvRow]:
+        """Lazily reads input data from a CSV file or string stream, row by row.
+
+        The file is opened on first iteration and closed once the rows are
+        exhausted or the iterator is closed. Rows share the column index of
+        the input and the values repeated across rows are interned, so that
+        a whole inventory can be kept in memory.
+
+        Args:
+            filepath_or_buffer (Union[str, io.StringIO]): Path to a CSV file
+            or a string stream containing CSV data.
+
+        Yields:
+            CsvRow: Read-only mapping representing a row in the CSV
+            with all fields as strings, missing fields being empty and extra
+            fields being left out.
         """
 
         if isinstance(filepath_or_buffer, str) and not isinstance(
@@ -29,13 +51,39 @@ class PyUtils:
             file = filepath_or_buffer
 
         with file:
-            reader = csv.DictReader(file)
-
-            records = []
+            reader = csv.reader(file)
+            header = next(reader, None) or []
+            # a repeated column name refers to its last value, as in DictReader
+            columns = {name: index for index, name in enumerate(header)}
+            width = len(header)
+            padding = [""] * width
             for row in reader:
-                record = {
-                    key: str(row.get(key, "") or "") for key in reader.fieldnames or []
-                }
-                records.append(record)
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + padding)[:width]
+                yield CsvRow(columns, tuple(map(sys.intern, row)))
+
+    @classmethod
+    def write_csv(
+        cls,
+        filepath: str,
+        rows: Sequence[Mapping[str, str]],
+        fieldnames: Optional[List[str]] = None,
+    ) -> None:
+        """Writes rows to a CSV file readable by `read_csv` and `iter_csv`.
+
+        Args:
+            filepath (str): Path to the CSV file, truncated when it exists.
+            rows (Sequence[Mapping[str, str]]): Rows to write.
+            fieldnames (Optional[List[str]], optional): Column names.
+            Defaults to None (the keys of the first row).
+        """
 
-        return records
+        columns = fieldnames or (list(rows[0]) if rows else [])
+        with open(filepath, mode="w", encoding="utf-8", newline="") as file:
+            if not columns:
+                return
+            writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
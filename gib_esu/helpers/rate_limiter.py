@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket to pace requests at a given rate.
+
+    Tokens are refilled continuously at `rate` tokens per second up to
+    `capacity`. Callers reserve tokens in advance, so concurrent callers are
+    spaced evenly instead of being released in bursts.
+    """
+
+    # process-wide buckets shared by all service instances
+    _shared: Dict[Hashable, "TokenBucket"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """TokenBucket constructor.
+
+        Args:
+            rate (float): Number of tokens refilled per second
+            capacity (Optional[float], optional): Maximum number of tokens the
+            bucket can hold, i.e. the allowed burst size. Defaults to 1.
+            clock (Callable[[], float], optional): Monotonic clock in seconds.
+            Defaults to time.monotonic.
+
+        Raises:
+            ValueError: When `rate` or `capacity` is not positive
+        """
+        capacity = 1.0 if capacity is None else capacity
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("`rate` ve `capacity` pozitif olmalıdır")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(
+        cls, key: Hashable, rate: float, capacity: Optional[float] = None
+    ) -> "TokenBucket":
+        """Returns the process-wide bucket registered under `key`.
+
+        The bucket is created on first use, later calls with the same key
+        return the existing bucket along with its original rate.
+
+        Args:
+            key (Hashable): Registry key of the bucket
+            rate (float): Number of tokens refilled per second
+            capacity (Optional[float], optional): Maximum number of tokens.
+            Defaults to None.
+
+        Returns:
+            TokenBucket: Shared bucket instance
+        """
+        with cls._shared_lock:
+            bucket = cls._shared.get(key)
+            if bucket is None:
+                bucket = cls._shared[key] = cls(rate, capacity)
+            return bucket
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Reserves tokens and returns how long the caller has to wait for them.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds to wait before the reserved tokens become available
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Takes tokens only if they are available right away.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            bool: True when the tokens are taken
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Blocks the calling thread until the requested tokens are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Suspends the calling task until the requested tokens are available.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
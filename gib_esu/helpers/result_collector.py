@@ -0,0 +1,59 @@
+from typing import Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ResultCollector(Generic[R]):
+    """Collects the results of a batch in input order, with one slot per item.
+
+    Slots are reserved by the single thread reading the input, workers then
+    write each result into its own slot, so no shared list is appended to
+    concurrently and the collected results keep the input order.
+    """
+
+    def __init__(self) -> None:
+        """ResultCollector constructor."""
+        self._slots: List[Optional[R]] = []
+
+    def __len__(self) -> int:
+        """Number of reserved slots."""
+        return len(self._slots)
+
+    def reserve(self) -> int:
+        """Reserves a slot for the next input item.
+
+        Returns:
+            int: Index of the reserved slot
+        """
+        self._slots.append(None)
+        return len(self._slots) - 1
+
+    def enumerate(self, items: Iterable[T]) -> Iterator[Tuple[int, T]]:
+        """Lazily pairs input items with the indices of their reserved slots.
+
+        Args:
+            items (Iterable[T]): Input items
+
+        Yields:
+            Tuple[int, T]: Slot index and the input item
+        """
+        for item in items:
+            yield self.reserve(), item
+
+    def put(self, index: int, result: R) -> None:
+        """Stores the result of an item in its slot.
+
+        Args:
+            index (int): Index of the slot reserved for the item
+            result (R): Result of the item
+        """
+        self._slots[index] = result
+
+    def results(self) -> List[R]:
+        """Returns the stored results in input order, skipping empty slots.
+
+        Returns:
+            List[R]: Collected results
+        """
+        return [result for result in self._slots if result is not None]
@@ -0,0 +1,56 @@
+import random
+import threading
+from typing import Callable, Optional
+
+
+def exponential_backoff(
+    attempt: int,
+    base: float,
+    cap: float,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Computes a capped exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): Number of the failed attempt, starting from 1
+        base (float): Delay in seconds after the first failed attempt
+        cap (float): Upper bound of the delay in seconds
+        rng (Callable[[], float], optional): Random number generator returning
+        values in [0, 1). Defaults to random.random.
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return rng() * min(cap, base * 2 ** (attempt - 1))
+
+
+class RetryBudget:
+    """Thread-safe counter limiting the total number of retries of a batch."""
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        """RetryBudget constructor.
+
+        Args:
+            limit (Optional[int], optional): Maximum number of retries,
+            unlimited when None. Defaults to None.
+
+        Raises:
+            ValueError: When `limit` is negative
+        """
+        if limit is not None and limit < 0:
+            raise ValueError("`limit` negatif olamaz")
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self) -> bool:
+        """Takes one retry from the budget if any is left.
+
+        Returns:
+            bool: True when the retry is allowed
+        """
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+
+class SnapshotStore:
+    """Content hashes of the payloads last accepted per key, kept in a json file.
+
+    Lets a batch send only the items whose content changed since the last
+    successful run. The file is rewritten atomically on `save`, so that an
+    interrupted run leaves the previous snapshot intact.
+    """
+
+    def __init__(self, path: str) -> None:
+        """SnapshotStore constructor, loading the file when it exists.
+
+        Args:
+            path (str): Snapshot file path
+        """
+        self.path = path
+        self._hashes: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._hashes = json.load(file)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of keys in the snapshot."""
+        return len(self._hashes)
+
+    @staticmethod
+    def digest(payload: bytes) -> str:
+        """Computes the content hash of a payload.
+
+        Args:
+            payload (bytes): Normalized payload
+
+        Returns:
+            str: Hex encoded SHA-256 digest
+        """
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the content hash recorded for a key.
+
+        Args:
+            key (str): Item key
+
+        Returns:
+            Optional[str]: Content hash, None when the key is not in the snapshot
+        """
+        return self._hashes.get(key)
+
+    def unchanged(self, key: str, digest: str) -> bool:
+        """Checks whether a payload matches the one recorded for its key.
+
+        Args:
+            key (str): Item key
+            digest (str): Content hash of the payload
+
+        Returns:
+            bool: Whether the content hash equals the recorded one
+        """
+        return self._hashes.get(key) == digest
+
+    def update(self, key: str, digest: str) -> None:
+        """Records the content hash of an accepted payload.
+
+        Args:
+            key (str): Item key
+            digest (str): Content hash of the payload
+        """
+        with self._lock:
+            self._hashes[key] = digest
+
+    def save(self) -> None:
+        """Writes the snapshot to its file, replacing the previous one."""
+        temp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._hashes, file, separators=(",", ":"))
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
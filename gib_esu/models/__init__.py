@@ -1,3 +1,11 @@
+from .column_validator import (
+    DogrulamaKurali,
+    SutunDogrulamaSonucu,
+    csv_dogrula,
+    csv_sutunlari,
+    sutunlara_ayir,
+    sutunlari_dogrula,
+)
 from .request_models import (
     ESU,
     CityCode,
@@ -24,14 +32,27 @@ from .request_models import (
 )
 from .response_models import Durum, Sonuc, Yanit
 from .service_models import (
+    AraBellekIstatistigi,
+    DevreKesici,
+    DogrulamaHatasi,
+    DogrulamaSonucu,
     ESUKayitSonucu,
     ESUServisKonfigurasyonu,
     ESUTopluGuncellemeSonucu,
+    ESUTopluKapatmaSonucu,
     ESUTopluKayitSonucu,
+    EszamanlilikAyari,
     EvetVeyaHayir,
+    IslemDurumu,
+    KuruCalistirmaSonucu,
     MukellefKayitSonucu,
+    SatirSonucu,
     TopluGuncellemeSonuc,
+    TopluIslemSonucu,
+    TopluKapatmaSonuc,
     TopluKayitSonuc,
+    YenidenDenemePolitikasi,
+    ZamanAsimi,
 )
 
 __all__ = [
@@ -68,4 +89,23 @@ __all__ = [
     "TopluKayitSonuc",
     "ESUTopluGuncellemeSonucu",
     "TopluGuncellemeSonuc",
+    "ESUTopluKapatmaSonucu",
+    "TopluKapatmaSonuc",
+    "TopluIslemSonucu",
+    "DogrulamaHatasi",
+    "DogrulamaSonucu",
+    "KuruCalistirmaSonucu",
+    "AraBellekIstatistigi",
+    "YenidenDenemePolitikasi",
+    "ZamanAsimi",
+    "DevreKesici",
+    "EszamanlilikAyari",
+    "IslemDurumu",
+    "SatirSonucu",
+    "DogrulamaKurali",
+    "SutunDogrulamaSonucu",
+    "sutunlari_dogrula",
+    "sutunlara_ayir",
+    "csv_sutunlari",
+    "csv_dogrula",
 ]
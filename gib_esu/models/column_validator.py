@@ -0,0 +1,554 @@
+import csv
+import io
+import itertools
+import operator
+import re
+from enum import IntFlag
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from gib_esu.models.base_model import CustomBaseModel
+from gib_esu.models.request_models import (
+    _TARIH_DESENI,
+    _VKN_DESENI,
+    CityCode,
+    ESUGuncellemeModel,
+    ESUKapatmaModel,
+    ESUKayitModel,
+    ESUMukellefModel,
+    ESUTipi,
+    RegEx__Il_Kodu,
+    RegEx__Soket_No,
+    SoketTipi,
+)
+
+# whitespace stripped by the `strip_whitespace` constraint of pydantic,
+# which unlike `str.strip` keeps the separators \x1c-\x1f
+_BOSLUKLAR = (
+    "\t\n\x0b\x0c\r \x85\xa0\u1680"
+    + "".join(map(chr, range(0x2000, 0x200B)))
+    + "\u2028\u2029\u202f\u205f\u3000"
+)
+
+# field patterns are searched by the regex engine of pydantic, where `^` and
+# `$` only match at the ends of the text, these equivalents hold for ascii
+# values and the other values are checked by pydantic itself
+_SOKET_NO_DESENI = re.compile(r"\ASoket\d+\Z")
+_SOKET_SAYISI_DESENI = re.compile(r"\A[1-9]\Z")
+_IL_KODU_DESENI = re.compile(RegEx__Il_Kodu)
+_SOKET_NO: TypeAdapter[str] = TypeAdapter(
+    Annotated[str, Field(pattern=RegEx__Soket_No)]
+)
+_IL_KODU: TypeAdapter[str] = TypeAdapter(CityCode)
+
+_ESU_TIPLERI = frozenset(tip.value for tip in ESUTipi)
+_SOKET_TIPLERI = frozenset(tip.value for tip in SoketTipi)
+
+# request models the column-wise validation supports
+_MODELLER: FrozenSet[Type[BaseModel]] = frozenset(
+    {ESUKayitModel, ESUMukellefModel, ESUGuncellemeModel, ESUKapatmaModel}
+)
+
+
+class DogrulamaKurali(IntFlag):
+    """Rules a batch row is validated against, bits of the error bitmap of the
+    column-wise validation."""
+
+    ESU_SERI_NO = 1 << 1
+    ESU_SOKET_TIPI = 1 << 2
+    ESU_SOKET_SAYISI = 1 << 3
+    ESU_SOKET_DETAY = 1 << 4
+    ESU_MARKASI = 1 << 5
+    ESU_MODELI = 1 << 6
+    SOKET_TIPI_UYUMU = 1 << 7
+    SOKET_SAYISI_UYUMU = 1 << 8
+    AC_DC_SOKETLERI = 1 << 9
+    IL_KODU = 1 << 10
+    ILCE = 1 << 11
+    MUKELLEF_VKN = 1 << 12
+    MULKIYET_SAHIBI_VKN_TCKN = 1 << 13
+    FATURA_TUTARLILIGI = 1 << 14
+    MULKIYET_TUTARLILIGI = 1 << 15
+    SERTIFIKA_TUTARLILIGI = 1 << 16
+    FATURA_YA_DA_MULKIYET = 1 << 17
+    FATURA_TARIHI = 1 << 18
+    SERTIFIKA_TARIHI = 1 << 19
+
+    @property
+    def mesaj(self) -> str:
+        """Error message of the rule."""
+        return _MESAJLAR[self]
+
+
+_MESAJLAR = {
+    DogrulamaKurali.ESU_SERI_NO: "`esu_seri_no` boş olamaz",
+    DogrulamaKurali.ESU_SOKET_TIPI: "`esu_soket_tipi` AC, DC ya da AC/DC olmalıdır",
+    DogrulamaKurali.ESU_SOKET_SAYISI: "`esu_soket_sayisi` 1-9 arası bir sayı olmalıdır",
+    DogrulamaKurali.ESU_SOKET_DETAY: (
+        "`esu_soket_detay` SoketN:AC ya da SoketN:DC çiftlerinden oluşmalıdır"
+    ),
+    DogrulamaKurali.ESU_MARKASI: "`esu_markasi` boş olamaz",
+    DogrulamaKurali.ESU_MODELI: "`esu_modeli` boş olamaz",
+    DogrulamaKurali.SOKET_TIPI_UYUMU: (
+        "Soket detayları `esu_soket_tipi` ile uyumlu değil"
+    ),
+    DogrulamaKurali.SOKET_SAYISI_UYUMU: (
+        "`esu_soket_sayisi` kadar `esu_soket_detay` olmalı"
+    ),
+    DogrulamaKurali.AC_DC_SOKETLERI: "Soket detayları AC/DC EŞÜ ile uyumlu değil",
+    DogrulamaKurali.IL_KODU: "`il_kodu` üç haneli olmalıdır",
+    DogrulamaKurali.ILCE: "`ilce` boş olamaz",
+    DogrulamaKurali.MUKELLEF_VKN: (
+        "`mukellef_vkn` geçerli bir vergi kimlik numarası değil"
+    ),
+    DogrulamaKurali.MULKIYET_SAHIBI_VKN_TCKN: (
+        "`mulkiyet_sahibi_vkn_tckn` geçerli bir vergi kimlik numarası değil"
+    ),
+    DogrulamaKurali.FATURA_TUTARLILIGI: (
+        "`fatura_tarihi` ile `fatura_ettn` tutarsız; "
+        "ikisi de boş veya ikisi de dolu olmalı"
+    ),
+    DogrulamaKurali.MULKIYET_TUTARLILIGI: (
+        "`mulkiyet_sahibi_vkn_tckn` ile `mulkiyet_sahibi_ad_unvan` tutarsız; "
+        "ikisi de boş veya ikisi de dolu olmalı"
+    ),
+    DogrulamaKurali.SERTIFIKA_TUTARLILIGI: (
+        "`sertifika_no` ile `sertifika_tarihi` tutarsız; "
+        "ikisi de boş veya ikisi de dolu olmalı"
+    ),
+    DogrulamaKurali.FATURA_YA_DA_MULKIYET: (
+        "`fatura_ettn` veya `mulkiyet_sahibi_vkn_tckn` "
+        "alanlarından biri ve yalnız biri mevcut olmalıdır"
+    ),
+    DogrulamaKurali.FATURA_TARIHI: "`fatura_tarihi` YYYY-MM-DD formatında olmalıdır",
+    DogrulamaKurali.SERTIFIKA_TARIHI: (
+        "`sertifika_tarihi` YYYY-MM-DD formatında olmalıdır"
+    ),
+}
+
+# rules of the charge point fields the socket constraints depend on
+_SOKET_ALANLARI = (
+    DogrulamaKurali.ESU_SOKET_TIPI.value
+    | DogrulamaKurali.ESU_SOKET_SAYISI.value
+    | DogrulamaKurali.ESU_SOKET_DETAY.value
+)
+
+# csv columns read by the column-wise validation
+ALANLAR = (
+    "esu_seri_no",
+    "esu_soket_tipi",
+    "esu_soket_sayisi",
+    "esu_soket_detay",
+    "esu_markasi",
+    "esu_modeli",
+    "il_kodu",
+    "ilce",
+    "mukellef_vkn",
+    "mukellef_unvan",
+    "fatura_tarihi",
+    "fatura_ettn",
+    "mulkiyet_sahibi_vkn_tckn",
+    "mulkiyet_sahibi_ad_unvan",
+    "sertifika_no",
+    "sertifika_tarihi",
+)
+
+
+class SutunDogrulamaSonucu(CustomBaseModel):
+    """Column-wise validation output model of a batch input or a chunk of it."""
+
+    hatalar: List[int] = Field(default_factory=list)  # bitmap per row, 0 if valid
+
+    @property
+    def hatali_satirlar(self) -> List[int]:
+        """Zero based indices of the invalid rows."""
+        return [sira for sira, bitler in enumerate(self.hatalar) if bitler]
+
+    def kurallar(self, sira: int) -> List[DogrulamaKurali]:
+        """Rules a row does not satisfy.
+
+        Args:
+            sira (int): Zero based row index
+
+        Returns:
+            List[DogrulamaKurali]: Rules whose bits are set for the row
+        """
+        return [kural for kural in DogrulamaKurali if self.hatalar[sira] & kural]
+
+    def mesajlar(self, sira: int) -> List[str]:
+        """Error messages of a row.
+
+        Args:
+            sira (int): Zero based row index
+
+        Returns:
+            List[str]: Messages of the rules the row does not satisfy
+        """
+        return [kural.mesaj for kural in self.kurallar(sira)]
+
+
+def _gecerli(adapter: TypeAdapter, deger: str) -> bool:
+    """Checks a value against a pydantic type."""
+    try:
+        adapter.validate_python(deger)
+    except ValidationError:
+        return False
+    return True
+
+
+def _bos(deger: Optional[str]) -> bool:
+    """Whether a value fails the `NonEmptyString` type."""
+    return not deger or not deger.strip(_BOSLUKLAR)
+
+
+def _vkn_gecerli(deger: Optional[str]) -> bool:
+    """Whether a value passes the `TaxNumberOrEmpty` type."""
+    if deger is None:
+        return True
+    deger = deger.strip()
+    return not deger or _VKN_DESENI.fullmatch(deger) is not None
+
+
+def _il_kodu_gecerli(deger: Optional[str]) -> bool:
+    """Whether a value passes the `CityCode` type."""
+    if deger is None:
+        return False
+    deger = deger.strip(_BOSLUKLAR)
+    if deger.isascii():
+        return _IL_KODU_DESENI.search(deger) is not None
+    return _gecerli(_IL_KODU, deger)
+
+
+def _soket_tipleri(detay: Optional[str]) -> Optional[List[str]]:
+    """Socket types of the `esu_soket_detay` value of a row, parsed the way the
+    service builds the `Soket` models.
+
+    Returns:
+        Optional[List[str]]: Socket types, None when a socket is invalid
+    """
+    if detay is None:
+        return None
+    tipler = []
+    for cift in detay.split(";"):
+        parcalar = cift.split(":")
+        if len(parcalar) < 2 or parcalar[1] not in _SOKET_TIPLERI:
+            return None
+        soket_no = parcalar[0]
+        if not (
+            _SOKET_NO_DESENI.match(soket_no) is not None
+            if soket_no.isascii()
+            else _gecerli(_SOKET_NO, soket_no)
+        ):
+            return None
+        tipler.append(parcalar[1])
+    return tipler
+
+
+def _soket_sayisi_gecerli(deger: Optional[str]) -> bool:
+    """Whether a value passes the `esu_soket_sayisi` pattern."""
+    return deger is not None and _SOKET_SAYISI_DESENI.match(deger) is not None
+
+
+def _tarih_gecersiz(deger: str) -> bool:
+    """Whether a date fails the model validator, empty dates being allowed."""
+    return bool(deger.strip()) and _TARIH_DESENI.match(deger) is None
+
+
+def _soket_kisitlari(alanlar: Tuple[Any, Any, Any]) -> int:
+    """Socket constraints of the registration model a row does not satisfy.
+
+    Args:
+        alanlar (Tuple[Any, Any, Any]): `esu_soket_tipi`, `esu_soket_sayisi` and
+        `esu_soket_detay` values of a row
+
+    Returns:
+        int: Bits of the broken constraints, 0 when the fields are invalid
+    """
+    tip, sayi, detay = alanlar
+    tipler = _soket_tipleri(detay)
+    if tip not in _ESU_TIPLERI or not _soket_sayisi_gecerli(sayi) or tipler is None:
+        return 0
+    kumesi = set(tipler)
+    bitler = 0
+    if tip != ESUTipi.AC_DC.value and kumesi - {tip}:
+        bitler |= DogrulamaKurali.SOKET_TIPI_UYUMU.value
+    if len(tipler) != int(sayi):
+        bitler |= DogrulamaKurali.SOKET_SAYISI_UYUMU.value
+    if tip == ESUTipi.AC_DC.value and len(kumesi) < len(_SOKET_TIPLERI):
+        bitler |= DogrulamaKurali.AC_DC_SOKETLERI.value
+    return bitler
+
+
+def _degerlere_gore(
+    kontrol: Callable[[Any], Any], sutun: Sequence[Any], gecerli: bool = False
+) -> List[Any]:
+    """Applies a check once per distinct value of a column, inventories repeating
+    most values such as socket details or city codes.
+
+    Args:
+        kontrol (Callable[[Any], Any]): Check of a value
+        sutun (Sequence[Any]): Hashable values of a column
+        gecerli (bool, optional): Whether the check tells valid values, whose
+        results are then negated into an error mask. Defaults to False.
+
+    Returns:
+        List[Any]: Results of the check per row
+    """
+    sonuclar = {deger: kontrol(deger) for deger in set(sutun)}
+    if gecerli:
+        sonuclar = {deger: not sonuc for deger, sonuc in sonuclar.items()}
+    return list(map(sonuclar.__getitem__, sutun))
+
+
+def sutunlari_dogrula(
+    sutunlar: Mapping[str, Sequence[Any]],
+    modeller: Iterable[Type[BaseModel]],
+) -> SutunDogrulamaSonucu:
+    """Validates batch rows given as columns against the request models the
+    service builds from them.
+
+    Each rule is applied once to a whole column with precompiled patterns and
+    the consistency rules of the invoice, ownership and certificate fields are
+    evaluated as column masks. A row is valid exactly when the service builds
+    the given request models from it without a validation error.
+
+    Args:
+        sutunlar (Mapping[str, Sequence[Any]]): Values per csv column, missing
+        values and columns being None, see `ALANLAR`
+        modeller (Iterable[Type[BaseModel]]): Request models built from a row,
+        among `ESUKayitModel`, `ESUMukellefModel`, `ESUGuncellemeModel` and
+        `ESUKapatmaModel`
+
+    Raises:
+        ValueError: When the columns differ in length or a model is not supported
+
+    Returns:
+        SutunDogrulamaSonucu: Error bitmap per row
+    """
+    modeller = set(modeller)
+    if modeller - _MODELLER:
+        adlar = ", ".join(sorted(model.__name__ for model in modeller - _MODELLER))
+        raise ValueError(f"{adlar} sütun bazında doğrulanamaz")
+    uzunluklar = {len(sutun) for sutun in sutunlar.values()}
+    if len(uzunluklar) > 1:
+        raise ValueError("Sütunlar aynı sayıda satır içermelidir")
+    satir_sayisi = uzunluklar.pop() if uzunluklar else 0
+    eksik: Sequence[Any] = [None] * satir_sayisi
+    hatalar = [0] * satir_sayisi
+
+    def sutun(alan: str) -> Sequence[Any]:
+        return sutunlar.get(alan, eksik)
+
+    def isaretle(kural: int, maske: Iterable[Any]) -> None:
+        for sira in itertools.compress(range(satir_sayisi), maske):
+            hatalar[sira] |= kural
+
+    # every request model carries the serial number
+    isaretle(DogrulamaKurali.ESU_SERI_NO.value, map(_bos, sutun("esu_seri_no")))
+
+    # charge point model, also built for the tax payer model
+    if modeller & {ESUKayitModel, ESUMukellefModel}:
+        soket_tipi = sutun("esu_soket_tipi")
+        soket_sayisi = sutun("esu_soket_sayisi")
+        soket_detay = sutun("esu_soket_detay")
+        isaretle(
+            DogrulamaKurali.ESU_SOKET_TIPI.value,
+            _degerlere_gore(_ESU_TIPLERI.__contains__, soket_tipi, gecerli=True),
+        )
+        isaretle(
+            DogrulamaKurali.ESU_SOKET_SAYISI.value,
+            _degerlere_gore(_soket_sayisi_gecerli, soket_sayisi, gecerli=True),
+        )
+        isaretle(
+            DogrulamaKurali.ESU_SOKET_DETAY.value,
+            _degerlere_gore(_soket_tipleri, soket_detay, gecerli=True),
+        )
+        isaretle(
+            DogrulamaKurali.ESU_MARKASI.value,
+            _degerlere_gore(_bos, sutun("esu_markasi")),
+        )
+        isaretle(
+            DogrulamaKurali.ESU_MODELI.value,
+            _degerlere_gore(_bos, sutun("esu_modeli")),
+        )
+
+    # socket constraints of the registration model, for valid socket fields
+    if ESUKayitModel in modeller:
+        kisitlar = _degerlere_gore(
+            _soket_kisitlari, list(zip(soket_tipi, soket_sayisi, soket_detay))
+        )
+        for sira, bitler in enumerate(kisitlar):
+            if bitler and not hatalar[sira] & _SOKET_ALANLARI:
+                hatalar[sira] |= bitler
+
+    # location, ownership, invoice and certificate models
+    if modeller & {ESUMukellefModel, ESUGuncellemeModel}:
+        isaretle(
+            DogrulamaKurali.IL_KODU.value,
+            _degerlere_gore(_il_kodu_gecerli, sutun("il_kodu"), gecerli=True),
+        )
+        isaretle(DogrulamaKurali.ILCE.value, _degerlere_gore(_bos, sutun("ilce")))
+
+        # the service picks the invoice or the ownership fields of a row
+        fatura_var = [not deger for deger in sutun("mulkiyet_sahibi_vkn_tckn")]
+        mulkiyet_var = [not deger for deger in sutun("fatura_ettn")]
+        sertifika_var = [bool(deger) for deger in sutun("sertifika_no")]
+
+        def secili(alan: str, var: List[bool]) -> List[str]:
+            return [
+                (deger or "") if secildi else ""
+                for deger, secildi in zip(sutun(alan), var)
+            ]
+
+        fatura_tarihi = secili("fatura_tarihi", fatura_var)
+        mulkiyet_vkn = secili("mulkiyet_sahibi_vkn_tckn", mulkiyet_var)
+        sertifika_tarihi = secili("sertifika_tarihi", sertifika_var)
+        isaretle(
+            DogrulamaKurali.MULKIYET_SAHIBI_VKN_TCKN.value,
+            (not _vkn_gecerli(deger) for deger in mulkiyet_vkn),
+        )
+
+        # emptiness as checked by the model validator, with `str.strip`
+        def yok(degerler: List[str]) -> List[bool]:
+            return [not deger.strip() for deger in degerler]
+
+        fatura_tarihi_yok = yok(fatura_tarihi)
+        fatura_ettn_yok = yok(secili("fatura_ettn", fatura_var))
+        mulkiyet_vkn_yok = yok(mulkiyet_vkn)
+        mulkiyet_unvan_yok = yok(secili("mulkiyet_sahibi_ad_unvan", mulkiyet_var))
+        sertifika_no_yok = yok(secili("sertifika_no", sertifika_var))
+
+        isaretle(
+            DogrulamaKurali.FATURA_TUTARLILIGI.value,
+            map(operator.ne, fatura_ettn_yok, fatura_tarihi_yok),
+        )
+        isaretle(
+            DogrulamaKurali.MULKIYET_TUTARLILIGI.value,
+            map(operator.ne, mulkiyet_vkn_yok, mulkiyet_unvan_yok),
+        )
+        isaretle(
+            DogrulamaKurali.SERTIFIKA_TUTARLILIGI.value,
+            map(operator.ne, sertifika_no_yok, yok(sertifika_tarihi)),
+        )
+        isaretle(
+            DogrulamaKurali.FATURA_YA_DA_MULKIYET.value,
+            map(operator.eq, fatura_ettn_yok, mulkiyet_vkn_yok),
+        )
+        isaretle(
+            DogrulamaKurali.FATURA_TARIHI.value,
+            _degerlere_gore(_tarih_gecersiz, fatura_tarihi),
+        )
+        isaretle(
+            DogrulamaKurali.SERTIFIKA_TARIHI.value,
+            _degerlere_gore(_tarih_gecersiz, sertifika_tarihi),
+        )
+
+    # tax payer given in the row, the company is the tax payer otherwise
+    if ESUMukellefModel in modeller:
+        isaretle(
+            DogrulamaKurali.MUKELLEF_VKN.value,
+            (
+                bool(vkn and unvan) and not _vkn_gecerli(vkn)
+                for vkn, unvan in zip(sutun("mukellef_vkn"), sutun("mukellef_unvan"))
+            ),
+        )
+
+    return SutunDogrulamaSonucu(hatalar=hatalar)
+
+
+def sutunlara_ayir(
+    satirlar: Sequence[Mapping[str, Any]],
+) -> Dict[str, List[Any]]:
+    """Splits batch rows read by `PyUtils.iter_csv` into the columns of `ALANLAR`.
+
+    Args:
+        satirlar (Sequence[Mapping[str, Any]]): Batch rows
+
+    Returns:
+        Dict[str, List[Any]]: Values per column
+    """
+    return {alan: [satir.get(alan) for satir in satirlar] for alan in ALANLAR}
+
+
+def csv_sutunlari(
+    kaynak: Union[str, io.StringIO], parca_boyutu: int = 100000
+) -> Iterator[Dict[str, Sequence[Any]]]:
+    """Reads a csv input as columns, in chunks of rows.
+
+    Columns are built by transposing the rows of a chunk, keeping the values
+    `PyUtils.iter_csv` gives to the batch methods: blank lines are skipped,
+    short rows are padded with empty values and the values beyond the header
+    are left out.
+
+    Args:
+        kaynak (Union[str, io.StringIO]): Csv file path or string stream
+        parca_boyutu (int, optional): Number of rows per chunk. Defaults to 100000.
+
+    Raises:
+        ValueError: When `parca_boyutu` is not positive
+
+    Yields:
+        Iterator[Dict[str, Sequence[Any]]]: Values per column of each chunk
+    """
+    if parca_boyutu < 1:
+        raise ValueError("`parca_boyutu` en az 1 olmalıdır")
+    # opened as `PyUtils.iter_csv` opens the input of the batch methods
+    dosya = (
+        open(kaynak, mode="r", encoding="utf-8") if isinstance(kaynak, str) else kaynak
+    )
+    with dosya:
+        okuyucu = csv.reader(dosya)
+        basliklar = next(okuyucu, None)
+        if basliklar is None:
+            return
+        genislik = len(basliklar)
+        dolgu = [""] * genislik
+        while True:
+            parca = list(itertools.islice(okuyucu, parca_boyutu))
+            if not parca:
+                return
+            satirlar = [
+                satir if len(satir) == genislik else (satir + dolgu)[:genislik]
+                for satir in parca
+                if satir
+            ]
+            if satirlar:
+                yield dict(zip(basliklar, zip(*satirlar)))
+
+
+def csv_dogrula(
+    kaynak: Union[str, io.StringIO],
+    modeller: Iterable[Type[BaseModel]],
+    parca_boyutu: int = 100000,
+) -> SutunDogrulamaSonucu:
+    """Validates a csv input column-wise, chunk by chunk.
+
+    Args:
+        kaynak (Union[str, io.StringIO]): Csv file path or string stream
+        modeller (Iterable[Type[BaseModel]]): Request models built from a row
+        parca_boyutu (int, optional): Number of rows per chunk. Defaults to 100000.
+
+    Returns:
+        SutunDogrulamaSonucu: Error bitmap per row of the whole input
+    """
+    modeller = list(modeller)
+    hatalar: List[int] = []
+    for sutunlar in csv_sutunlari(kaynak, parca_boyutu):
+        hatalar.extend(sutunlari_dogrula(sutunlar, modeller).hatalar)
+    return SutunDogrulamaSonucu(hatalar=hatalar)
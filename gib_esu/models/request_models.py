@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 from enum import Enum
-from typing import Annotated, List, Optional, TypeVar, Union, cast
+from typing import Annotated, Any, Dict, List, Optional, TypeVar, Union, cast
 
 from pydantic import (
     AfterValidator,
@@ -23,6 +23,10 @@ RegEx__Firma_VKN = r"\b\d{10}\b"
 RegEx__Il_Kodu = r"\b\d{3}\b"
 RegEx__Tarih = r"^\d{4}-\d{2}-\d{2}$"  # YYYY-MM-DD
 
+# patterns matched by the validator functions, compiled once
+_VKN_DESENI = re.compile(RegEx__Firma_VKN)
+_TARIH_DESENI = re.compile(RegEx__Tarih)
+
 
 # validators
 def _validate_tax_number(tax_nr: str) -> str:
@@ -38,7 +42,7 @@ def _validate_tax_number(tax_nr: str) -> str:
         str: Validated tax_nr
     """
     v_str = tax_nr.strip()
-    if not v_str or re.fullmatch(RegEx__Firma_VKN, v_str):
+    if not v_str or _VKN_DESENI.fullmatch(v_str):
         return v_str
     raise ValueError(f"{tax_nr} geçerli bir vergi kimlik numarası değil")
 
@@ -111,17 +115,27 @@ def _validate_tax_payer_and_update_models(model: CustomBaseModelWithValidator) -
 
     # conditionally check fatura_tarihi
     if not fatura_tarihi_does_not_exist and not bool(
-        re.match(RegEx__Tarih, fatura_tarihi)
+        _TARIH_DESENI.match(fatura_tarihi)
     ):
         raise ValueError("`fatura_tarihi` YYYY-MM-DD formatında olmalıdır")
 
     # conditionally check sertifika_tarihi
-    if sertifika_tarihi_does_exist and not bool(
-        re.match(RegEx__Tarih, sertifika_tarihi)
-    ):
+    if sertifika_tarihi_does_exist and not bool(_TARIH_DESENI.match(sertifika_tarihi)):
         raise ValueError("`sertifika_tarihi` YYYY-MM-DD formatında olmalıdır")
 
 
+def _alanlari_birlestir(*modeller: CustomBaseModel) -> Dict[str, Any]:
+    """Merges the field values of validated models without validating them again.
+
+    Returns:
+        Dict[str, Any]: Field values of all models
+    """
+    alanlar: Dict[str, Any] = {}
+    for model in modeller:
+        alanlar.update(model.__dict__)
+    return alanlar
+
+
 # type definitions
 
 T = TypeVar("T")
@@ -286,17 +300,27 @@ class ESUKayitModel(Firma):
     kayit_bilgisi: ESU
 
     @classmethod
-    def olustur(cls, firma: Firma, esu: ESU) -> ESUKayitModel:
+    def olustur(
+        cls, firma: Firma, esu: ESU, dogrulanmis: bool = False
+    ) -> ESUKayitModel:
         """Constructs a ESUKayitModel from given `esu` and `firma` arguments.
 
         Args:
             firma (Firma): Company information
             esu (ESU): Charge point information
+            dogrulanmis (bool, optional): Whether the arguments are validated
+            model instances, whose fields are then not validated again while
+            the model constraints are still enforced. Defaults to False.
 
         Returns:
             ESUKayitModel: Constructed model instance
         """
         combined_data = {**firma.__dict__, "kayit_bilgisi": esu}
+        if dogrulanmis:
+            # validating an instance only runs the model validators
+            return ESUKayitModel.model_validate(
+                ESUKayitModel.model_construct(**combined_data)
+            )
         return ESUKayitModel(**combined_data)
 
     @model_validator(mode="after")
@@ -307,11 +331,11 @@ class ESUKayitModel(Firma):
         soket_sayisi = kayit.esu_soket_sayisi
         soket_detay = kayit.esu_soket_detay
 
+        soket_tipleri = {esu_soket.soket_tip for esu_soket in soket_detay}
+
         # check socket type integrity
-        for esu_soket in soket_detay:
-            soket_tip = esu_soket.soket_tip
-            if soket_tipi in SoketTipi.__members__.values() and soket_tip != soket_tipi:
-                raise ValueError("Soket detayları `esu_soket_tipi` ile uyumlu değil")
+        if soket_tipi != ESUTipi.AC_DC and soket_tipleri - {SoketTipi(soket_tipi)}:
+            raise ValueError("Soket detayları `esu_soket_tipi` ile uyumlu değil")
 
         # compare socket count to socket details length
         assert len(soket_detay) == int(
@@ -319,10 +343,10 @@ class ESUKayitModel(Firma):
         ), "`esu_soket_sayisi` kadar `esu_soket_detay` olmalı"
 
         # check socket details when charge point type is AC/DC
-        if soket_tipi == ESUTipi.AC_DC.value:
-            has_ac = any(item.soket_tip == SoketTipi.AC.value for item in soket_detay)
-            has_dc = any(item.soket_tip == SoketTipi.DC.value for item in soket_detay)
-            assert has_ac and has_dc, "Soket detayları AC/DC EŞÜ ile uyumlu değil"
+        if soket_tipi == ESUTipi.AC_DC:
+            assert (
+                SoketTipi.AC in soket_tipleri and SoketTipi.DC in soket_tipleri
+            ), "Soket detayları AC/DC EŞÜ ile uyumlu değil"
         return self
 
 
@@ -348,6 +372,7 @@ class ESUMukellefModel(CustomBaseModelWithValidator, FirmaKodu):
         mukellef: Mukellef,
         mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
         sertifika: Optional[Sertifika] = None,
+        dogrulanmis: bool = False,
     ) -> ESUMukellefModel:
         """Constructs a ESUMukellefModel from given arguments.
 
@@ -360,10 +385,30 @@ class ESUMukellefModel(CustomBaseModelWithValidator, FirmaKodu):
             mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
             Ownership information. Defaults to None.
             sertifika (Optional[Sertifika], optional): Certificate. Defaults to None.
+            dogrulanmis (bool, optional): Whether the arguments are validated,
+            e.g. the serial number of an ESU instance and the company code of a
+            Firma instance, their fields are then not validated again while the
+            cross-field rules are still enforced. Defaults to False.
 
         Returns:
             ESUMukellefModel: Constructed model instance
         """
+        if dogrulanmis:
+            return ESUMukellefModel.model_validate(
+                ESUMukellefModel.model_construct(
+                    firma_kodu=firma_kodu,
+                    durum_bilgileri=ESUMukellefBilgisi.model_construct(
+                        esu_seri_no=esu_seri_no,
+                        **_alanlari_birlestir(
+                            fatura,
+                            lokasyon,
+                            mukellef,
+                            mulkiyet_sahibi or MulkiyetSahibi(),
+                            sertifika or Sertifika(),
+                        ),
+                    ),
+                )
+            )
         combined_data = {
             **ESUSeriNo(esu_seri_no=esu_seri_no).model_dump(),
             **fatura.model_dump(),
@@ -393,6 +438,7 @@ class ESUGuncellemeModel(CustomBaseModelWithValidator, FirmaKodu):
         lokasyon: Lokasyon,
         mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
         sertifika: Optional[Sertifika] = None,
+        dogrulanmis: bool = False,
     ) -> ESUGuncellemeModel:
         """Constructs a ESUGuncellemeModel from given arguments.
 
@@ -404,10 +450,29 @@ class ESUGuncellemeModel(CustomBaseModelWithValidator, FirmaKodu):
             mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
             Ownership information. Defaults to None.
             sertifika (Optional[Sertifika], optional): Certificate. Defaults to None.
+            dogrulanmis (bool, optional): Whether the arguments are validated,
+            e.g. the company code of a Firma instance, their fields are then
+            not validated again while the cross-field rules are still enforced.
+            Defaults to False.
 
         Returns:
             ESUGuncellemeModel: Constructed model instance
         """
+        if dogrulanmis:
+            return ESUGuncellemeModel.model_validate(
+                ESUGuncellemeModel.model_construct(
+                    firma_kodu=firma_kodu,
+                    guncelleme_istek_bilgileri=ESUGuncellemeBilgisi.model_construct(
+                        **_alanlari_birlestir(
+                            esu_seri_no,
+                            fatura,
+                            lokasyon,
+                            mulkiyet_sahibi or MulkiyetSahibi(),
+                            sertifika or Sertifika(),
+                        )
+                    ),
+                )
+            )
         combined_data = {
             **esu_seri_no.model_dump(),
             **fatura.model_dump(),
@@ -1,7 +1,16 @@
 from enum import Enum
-from typing import List, Optional
-
-from pydantic import HttpUrl
+from typing import Dict, FrozenSet, List, Optional
+
+from pydantic import (
+    Field,
+    HttpUrl,
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    model_validator,
+)
+from typing_extensions import Self
 
 from gib_esu.models.base_model import CustomBaseModel
 from gib_esu.models.request_models import (
@@ -21,6 +30,14 @@ class EvetVeyaHayir(str, Enum):
     HAYIR = "0"
 
 
+class IslemDurumu(str, Enum):
+    """Enum for processing status of a batch row."""
+
+    BASARILI = "basarili"
+    HATALI = "hatali"
+    REDDEDILDI = "reddedildi"  # answered by GIB with a failure
+
+
 # service config models
 
 
@@ -49,9 +66,85 @@ class ESUServisKonfigurasyonu(CustomBaseModel):
     GIB_TEST_FIRMA_VKN: TaxNumberOrEmpty
 
 
+class YenidenDenemePolitikasi(CustomBaseModel):
+    """Retry policy model for a service path.
+
+    Requests that certainly did not reach GIB (connection failures, 429 and 503
+    responses) are retried on every service path. Requests that may have been
+    processed (read timeouts, dropped connections, other 5xx responses) are
+    only retried on idempotent service paths.
+    """
+
+    azami_deneme: PositiveInt = 3  # including the first attempt
+    taban_bekleme: NonNegativeFloat = 0.5  # seconds
+    azami_bekleme: NonNegativeFloat = 8.0  # seconds
+    idempotent: bool = False
+    durum_kodlari: FrozenSet[int] = Field(
+        default_factory=lambda: frozenset({500, 502, 504})
+    )
+
+
+class ZamanAsimi(CustomBaseModel):
+    """Connect and read timeouts (in seconds) model for a service path."""
+
+    baglanti: PositiveFloat = 10.0
+    okuma: PositiveFloat = 60.0
+
+
+class DevreKesici(CustomBaseModel):
+    """Circuit breaker settings model.
+
+    The circuit opens after `hata_esigi` consecutive failures, i.e. transport
+    errors, responses with one of `durum_kodlari` or results with one of
+    `sistemik_kodlar`, and rejects requests for `bekleme_suresi` seconds.
+    """
+
+    hata_esigi: PositiveInt = 5
+    bekleme_suresi: PositiveFloat = 30.0  # seconds
+    durum_kodlari: FrozenSet[int] = Field(
+        default_factory=lambda: frozenset({401, 403, 500, 502, 503, 504})
+    )
+    sistemik_kodlar: FrozenSet[str] = Field(default_factory=frozenset)
+
+
+class EszamanlilikAyari(CustomBaseModel):
+    """Adaptive concurrency settings model for batch methods.
+
+    The number of rows in flight starts at `baslangic` and grows additively
+    while the average row latency stays within `gecikme_toleransi` times its
+    lowest value, it is halved when rows slow down and on retried requests.
+    """
+
+    baslangic: PositiveInt = 4
+    asgari: PositiveInt = 1
+    azami: PositiveInt = 32
+    gecikme_toleransi: float = Field(default=2.0, ge=1.0)
+
+    @model_validator(mode="after")
+    def _sinirlari_denetle(self) -> Self:
+        """Validates that the initial concurrency is within the bounds."""
+        if not self.asgari <= self.baslangic <= self.azami:
+            raise ValueError("`asgari` <= `baslangic` <= `azami` olmalıdır")
+        return self
+
+
 # service output models
 
 
+class SatirSonucu(CustomBaseModel):
+    """Processing details model for a batch row."""
+
+    sira: Optional[PositiveInt] = None  # row number in the input
+    durum: IslemDurumu = IslemDurumu.BASARILI
+    sure: Optional[NonNegativeFloat] = None  # seconds
+    hata: Optional[str] = None
+    kod: Optional[str] = None  # code of the result rejected by GIB
+    deneme: Optional[NonNegativeInt] = None  # http attempts
+    girdi: Optional[Dict[str, str]] = None  # input columns of failed rows
+    # service paths not sent since an earlier request of the row failed
+    gonderilmeyen_istekler: Optional[List[str]] = None
+
+
 class ESUKayitSonucu(CustomBaseModel):
     """Charge point registration output model."""
 
@@ -64,27 +157,96 @@ class MukellefKayitSonucu(CustomBaseModel):
     mukellef_kayit_sonucu: str
 
 
-class ESUTopluKayitSonucu(ESUSeriNo, ESUKayitSonucu, MukellefKayitSonucu):
+class ESUTopluKayitSonucu(SatirSonucu, ESUSeriNo, ESUKayitSonucu, MukellefKayitSonucu):
     """Batch registration output model for single charge point."""
 
     pass
 
 
-class TopluKayitSonuc(CustomBaseModel):
+class DogrulamaHatasi(CustomBaseModel):
+    """Pre-validation error model for a batch row."""
+
+    sira: PositiveInt  # row number in the input
+    esu_seri_no: str
+    hata: str
+
+
+class DogrulamaSonucu(CustomBaseModel):
+    """Pre-validation output model of a batch input."""
+
+    toplam: int
+    hatalar: List[DogrulamaHatasi] = Field(default_factory=list)
+
+    @property
+    def hata_orani(self) -> float:
+        """Ratio of the invalid rows to all rows."""
+        return len(self.hatalar) / self.toplam if self.toplam else 0.0
+
+
+class KuruCalistirmaSonucu(CustomBaseModel):
+    """Dry run output model of a batch, the request payloads are not sent."""
+
+    toplam: int
+    hatalar: List[DogrulamaHatasi] = Field(default_factory=list)
+    cikti_dosya_yolu: str  # json lines file of the request payloads
+    # seconds spent on reading, building and serializing the payloads
+    okuma_suresi: NonNegativeFloat = 0.0
+    dogrulama_suresi: NonNegativeFloat = 0.0
+    serilestirme_suresi: NonNegativeFloat = 0.0
+    toplam_sure: NonNegativeFloat = 0.0  # wall time of the dry run
+
+
+class AraBellekIstatistigi(CustomBaseModel):
+    """Hit statistics of a cache of the values shared across batch rows."""
+
+    boyut: NonNegativeInt  # cached entries
+    isabet: NonNegativeInt  # lookups served from the cache
+    iska: NonNegativeInt  # lookups building a new value
+
+    @property
+    def isabet_orani(self) -> float:
+        """Ratio of the lookups served from the cache."""
+        aramalar = self.isabet + self.iska
+        return self.isabet / aramalar if aramalar else 0.0
+
+
+class TopluIslemSonucu(CustomBaseModel):
+    """Common fields of the batch output models."""
+
+    toplam: int
+    gonderilmeyenler: List[str] = Field(default_factory=list)
+    atlananlar: List[str] = Field(default_factory=list)  # completed before
+    eszamanlilik: Optional[int] = None  # concurrency reached by parallel runs
+    dogrulama: Optional[DogrulamaSonucu] = None  # set when pre-validated
+    durdurma_nedeni: Optional[str] = None  # set when stopped after canary rows
+
+
+class TopluKayitSonuc(TopluIslemSonucu):
     """Charge point batch registration output model."""
 
     sonuclar: List[ESUTopluKayitSonucu]
-    toplam: int
 
 
-class ESUTopluGuncellemeSonucu(ESUSeriNo):
+class ESUTopluGuncellemeSonucu(SatirSonucu, ESUSeriNo):
     """Batch update output model for single charge point."""
 
     guncelleme_kayit_sonucu: str
 
 
-class TopluGuncellemeSonuc(CustomBaseModel):
+class TopluGuncellemeSonuc(TopluIslemSonucu):
     """Charge point batch update output model."""
 
     sonuclar: List[ESUTopluGuncellemeSonucu]
-    toplam: int
+    degismeyen: int = 0  # rows unchanged since the last accepted update
+
+
+class ESUTopluKapatmaSonucu(SatirSonucu, ESUSeriNo):
+    """Batch delisting output model for single charge point."""
+
+    kapatma_sonucu: str
+
+
+class TopluKapatmaSonuc(TopluIslemSonucu):
+    """Charge point batch delisting output model."""
+
+    sonuclar: List[ESUTopluKapatmaSonucu]
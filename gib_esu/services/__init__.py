@@ -1,3 +1,4 @@
+from .async_esu_service import AsyncESUServis
 from .esu_service import ESUServis
 
-__all__ = ["ESUServis"]
+__all__ = ["ESUServis", "AsyncESUServis"]
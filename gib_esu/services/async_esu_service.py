@@ -0,0 +1,1003 @@
+import asyncio
+import io
+import time
+from types import TracebackType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from gib_esu.helpers.circuit_breaker import CircuitOpenError
+from gib_esu.helpers.dispatcher import pipeline_async
+from gib_esu.helpers.journal import Journal
+from gib_esu.helpers.jsonl_writer import JsonLinesWriter
+from gib_esu.helpers.result_collector import ResultCollector
+from gib_esu.helpers.retry import RetryBudget
+from gib_esu.models.request_models import (
+    ESU,
+    ESUGuncellemeModel,
+    ESUKapatmaModel,
+    ESUKayitModel,
+    ESUMukellefModel,
+    Fatura,
+    Lokasyon,
+    Mukellef,
+    MulkiyetSahibi,
+    Sertifika,
+)
+from gib_esu.models.response_models import Yanit
+from gib_esu.models.service_models import (
+    DevreKesici,
+    DogrulamaSonucu,
+    ESUTopluGuncellemeSonucu,
+    ESUTopluKapatmaSonucu,
+    ESUTopluKayitSonucu,
+    EszamanlilikAyari,
+    IslemDurumu,
+    SatirSonucu,
+    TopluGuncellemeSonuc,
+    TopluIslemSonucu,
+    TopluKapatmaSonuc,
+    TopluKayitSonuc,
+    YenidenDenemePolitikasi,
+    ZamanAsimi,
+)
+from gib_esu.services.base_service import BaseESUServis, _AsamaliSatir, _TopluIslem
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore[assignment]
+
+R = TypeVar("R", bound=SatirSonucu)
+
+
+class AsyncESUServis(BaseESUServis):
+    """Class that handles GIB ESU EKS service operations with asyncio.
+
+    Requires the optional `httpx` dependency (`pip install gib_esu[async]`).
+    """
+
+    def __init__(
+        self,
+        _config: Optional[Dict[str, str | None]] = None,
+        azami_eszamanli_istek: Optional[int] = None,
+        hiz_limitleri: Optional[Union[float, Mapping[str, float]]] = None,
+        hiz_limitini_paylas: bool = False,
+        yeniden_deneme: Optional[
+            Union[YenidenDenemePolitikasi, Mapping[str, YenidenDenemePolitikasi]]
+        ] = None,
+        zaman_asimi: Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]] = None,
+        devre_kesici: Optional[DevreKesici] = None,
+        eszamanlilik: Optional[EszamanlilikAyari] = None,
+    ) -> None:
+        """AsyncESUServis constructor.
+
+        Args:
+            _config (Optional[Dict[str, str  |  None]], optional):
+            Dictionary or env file path to read the config from. Defaults to None.
+            azami_eszamanli_istek (Optional[int], optional):
+            Fixed number of in-flight requests of batches, used when
+            `eszamanlilik` is not given. Defaults to None (adaptive).
+            hiz_limitleri (Optional[Union[float, Mapping[str, float]]], optional):
+            Maximum requests per second, either for all service paths or per
+            service path (e.g. `{"/yeniEsuKayit": 5}`). Defaults to None (no limit).
+            hiz_limitini_paylas (bool, optional): Whether to share the rate limits
+            with all service instances of the same company in the process.
+            Defaults to False.
+            yeniden_deneme (Optional[Union[YenidenDenemePolitikasi,
+            Mapping[str, YenidenDenemePolitikasi]]], optional):
+            Retry policy for all service paths or per service path.
+            Defaults to None (`_VARSAYILAN_YENIDEN_DENEME`).
+            zaman_asimi (Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]],
+            optional): Connect and read timeouts for all service paths or per
+            service path. Defaults to None (`ZamanAsimi()`).
+            devre_kesici (Optional[DevreKesici], optional): Circuit breaker
+            settings. Defaults to None (`DevreKesici()`).
+            eszamanlilik (Optional[EszamanlilikAyari], optional): Adaptive
+            concurrency settings of batches, `azami` also sizes the keep-alive
+            connection pool. Defaults to None (`EszamanlilikAyari()`, unless
+            `azami_eszamanli_istek` is given).
+
+        Raises:
+            ImportError: When the optional `httpx` dependency is not installed
+        """
+        if httpx is None:  # pragma: no cover
+            raise ImportError(
+                "AsyncESUServis için httpx gereklidir: pip install gib_esu[async]"
+            )
+        super().__init__(
+            _config,
+            hiz_limitleri,
+            hiz_limitini_paylas,
+            yeniden_deneme,
+            zaman_asimi,
+            devre_kesici,
+        )
+
+        if azami_eszamanli_istek is not None and azami_eszamanli_istek < 1:
+            raise ValueError("`azami_eszamanli_istek` en az 1 olmalıdır")
+        self._eszamanlilik = self._eszamanlilik_ayari(
+            eszamanlilik, azami_eszamanli_istek
+        )
+        eszamanli_istek = self._eszamanlilik.azami
+        self._istemci = httpx.AsyncClient(
+            verify=self._api.ssl_dogrulama,
+            limits=httpx.Limits(
+                max_connections=eszamanli_istek,
+                max_keepalive_connections=eszamanli_istek,
+            ),
+            timeout=None,
+        )
+
+    async def __aenter__(self) -> "AsyncESUServis":
+        """Enters the runtime context, returning the service instance itself."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exits the runtime context, closing the underlying http client."""
+        await self.kapat()
+
+    async def kapat(self) -> None:
+        """Closes the http client along with its pooled connections."""
+        await self._istemci.aclose()
+
+    async def _api_isteği(
+        self,
+        govde: bytes,
+        istek_tipi: BaseESUServis._ISTEK_TIPI = BaseESUServis._ISTEK_TIPI.ESU_KAYIT,
+    ) -> Yanit:
+        """Internal method to perform API requests.
+
+        Args:
+            govde (bytes): Serialized request body
+            istek_tipi (_ISTEK_TIPI, optional): Service path. Defaults to ESU_KAYIT.
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        hiz_siniri = self._hiz_siniri(istek_tipi)
+        zaman_asimi = self._zaman_asimlari[istek_tipi]
+        deneme = 0
+        while True:
+            deneme += 1
+            self._denemeyi_say()
+            self._devreyi_denetle(istek_tipi)
+            if hiz_siniri is not None:
+                await hiz_siniri.acquire_async()
+            try:
+                response = await self._istemci.post(
+                    url=self._istek_url(istek_tipi),
+                    headers=self._basliklar,
+                    content=govde,
+                    timeout=httpx.Timeout(
+                        zaman_asimi.okuma, connect=zaman_asimi.baglanti
+                    ),
+                )
+            except httpx.TransportError as hata:
+                self._devre_kesici.record_failure()
+                bekleme = self._yeniden_deneme_beklemesi(
+                    istek_tipi, deneme, self._istek_gonderilmedi(hata)
+                )
+                if bekleme is None:
+                    raise
+                self.logger.warning(
+                    f"{istek_tipi.value} isteği başarısız ({hata!r}), "
+                    f"{bekleme:.2f} sn sonra yeniden denenecek"
+                )
+                await asyncio.sleep(bekleme)
+                continue
+
+            sistemik = self._durum_kodunu_bildir(response.status_code)
+            islenmedi = self._durum_kodu_islenmedi(istek_tipi, response.status_code)
+            if islenmedi is not None:
+                bekleme = self._yeniden_deneme_beklemesi(
+                    istek_tipi, deneme, islenmedi, response.headers.get("Retry-After")
+                )
+                if bekleme is not None:
+                    self.logger.warning(
+                        f"{istek_tipi.value} isteği HTTP {response.status_code} "
+                        f"döndü, {bekleme:.2f} sn sonra yeniden denenecek"
+                    )
+                    await asyncio.sleep(bekleme)
+                    continue
+            yanit = self._yaniti_coz(response.content)
+            return yanit if sistemik else self._yaniti_bildir(yanit)
+
+    @staticmethod
+    def _istek_gonderilmedi(hata: Exception) -> bool:
+        """Internal method to check whether a failed request never reached GIB.
+
+        Args:
+            hata (Exception): Exception raised while sending the request
+
+        Returns:
+            bool: True when the connection could not be established
+        """
+        return isinstance(
+            hata, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        )
+
+    async def cihaz_kayit(self, cihaz_bilgileri: Union[ESUKayitModel, ESU]) -> Yanit:
+        """Registers a charge point with the GIB ESU EKS system.
+
+        Args:
+            cihaz_bilgileri (Union[ESUKayitModel, ESU]): Charge point information
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        cihaz = self._kayit_modeli_hazirla(cihaz_bilgileri)
+        govde = self._istek_govdesi(cihaz)
+        self._istegi_logla(govde)
+        return await self._api_isteği(govde)
+
+    async def mukellef_kayit(
+        self,
+        mukellef_bilgileri: Union[ESUMukellefModel, Any] = None,
+        esu: Optional[Union[ESU, str]] = None,
+        lokasyon: Optional[Lokasyon] = None,
+        fatura: Optional[Fatura] = None,
+        mukellef: Optional[Mukellef] = None,
+        mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
+        sertifika: Optional[Sertifika] = None,
+    ) -> Yanit:
+        """Registers tax payer information for a charge point identified by `esu`.
+
+        Args:
+            mukellef_bilgileri (Union[ESUMukellefModel, Any], optional):
+                Tax payer request model. Defaults to None.
+            esu (Optional[Union[ESU, str]], optional):
+                Charge point information. Defaults to None.
+            lokasyon (Optional[Lokasyon], optional):
+                Location information. Defaults to None.
+            fatura (Optional[Fatura], optional):
+                Invoice information. Defaults to None.
+            mukellef (Optional[Mukellef], optional):
+                Tax payer information. Defaults to None.
+            mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
+                Ownership information. Defaults to None.
+            sertifika (Optional[Sertifika], optional):
+                Certificate information. Defaults to None.
+
+        Raises:
+            ValueError: When some information is missing to construct the request model
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        veri = self._mukellef_modeli_hazirla(
+            mukellef_bilgileri=mukellef_bilgileri,
+            esu=esu,
+            lokasyon=lokasyon,
+            fatura=fatura,
+            mukellef=mukellef,
+            mulkiyet_sahibi=mulkiyet_sahibi,
+            sertifika=sertifika,
+        )
+        govde = self._istek_govdesi(veri)
+        self._istegi_logla(govde)
+
+        return await self._api_isteği(
+            govde, istek_tipi=AsyncESUServis._ISTEK_TIPI.ESU_MUKELLEF
+        )
+
+    async def kayit_guncelle(
+        self,
+        kayit_bilgileri: Union[ESUGuncellemeModel, Any] = None,
+        esu_seri_no: Optional[str] = None,
+        lokasyon: Optional[Lokasyon] = None,
+        fatura: Optional[Fatura] = None,
+        mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
+        sertifika: Optional[Sertifika] = None,
+    ) -> Yanit:
+        """Updates a previously registered charge point's information.
+
+        Args:
+            kayit_bilgileri (Union[ESUGuncellemeModel, Any], optional):
+                Charge point update request model. Defaults to None.
+            esu_seri_no (Optional[str], optional):
+                Charge point serial number. Defaults to None.
+            lokasyon (Optional[Lokasyon], optional):
+                Location information. Defaults to None.
+            fatura (Optional[Fatura], optional):
+                Invoice information. Defaults to None.
+            mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
+                Ownership information. Defaults to None.
+            sertifika (Optional[Sertifika], optional):
+                Certificate information. Defaults to None.
+
+        Raises:
+            ValueError: When some information is missing to construct the request model
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        veri = self._guncelleme_modeli_hazirla(
+            kayit_bilgileri=kayit_bilgileri,
+            esu_seri_no=esu_seri_no,
+            lokasyon=lokasyon,
+            fatura=fatura,
+            mulkiyet_sahibi=mulkiyet_sahibi,
+            sertifika=sertifika,
+        )
+        govde = self._istek_govdesi(veri)
+        self._istegi_logla(govde)
+
+        return await self._api_isteği(
+            govde, istek_tipi=AsyncESUServis._ISTEK_TIPI.ESU_GUNCELLEME
+        )
+
+    async def cihaz_kapatma(
+        self,
+        cihaz_bilgisi: Optional[ESUKapatmaModel] = None,
+        esu_seri_no: Optional[str] = None,
+    ) -> Yanit:
+        """Unregisters/delists a previously registered charge point.
+
+        Args:
+            cihaz_bilgisi (Optional[ESUKapatmaModel], optional):
+                Charge point delisting request model. Defaults to None.
+            esu_seri_no (Optional[str], optional):
+                Charge point serial number. Defaults to None.
+
+        Raises:
+            ValueError: When none of the arguments are provided
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        cihaz = self._kapatma_modeli_hazirla(
+            cihaz_bilgisi=cihaz_bilgisi, esu_seri_no=esu_seri_no
+        )
+        return await self._api_isteği(
+            self._istek_govdesi(cihaz),
+            istek_tipi=AsyncESUServis._ISTEK_TIPI.ESU_KAPATMA,
+        )
+
+    async def _cihaz_kaydi_isle(self, kayit: Mapping[str, str]) -> ESUTopluKayitSonucu:
+        """Internal method to register the charge point of a batch row, the
+        first stage of a batch registration.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            ESUTopluKayitSonucu: Registration result of the charge point, without
+            the tax payer result
+        """
+        try:
+            cihaz = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_KAYIT,
+                lambda: self._kayit_bilgisi_hazirla(kayit),
+            )
+            esu_sonucu = (
+                self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_KAYIT)
+                or self._gunluge_yaz(
+                    kayit, self._ISTEK_TIPI.ESU_KAYIT, await self.cihaz_kayit(cihaz)
+                )
+            ).mesaj
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluKayitSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                esu_kayit_sonucu="",
+                mukellef_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
+            )
+        return ESUTopluKayitSonucu(
+            esu_seri_no=cihaz.kayit_bilgisi.esu_seri_no,
+            esu_kayit_sonucu=esu_sonucu,
+            mukellef_kayit_sonucu="",
+        )
+
+    async def _mukellef_kaydi_isle(
+        self, kayit: Mapping[str, str], sonuc: ESUTopluKayitSonucu
+    ) -> None:
+        """Internal method to register the tax payer of a batch row whose charge
+        point is registered, the second stage of a batch registration.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            sonuc (ESUTopluKayitSonucu): Registration result of the charge point,
+            completed with the tax payer result
+        """
+        try:
+            mukellef = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_MUKELLEF,
+                lambda: self._mukellef_bilgisi_hazirla(kayit, sonuc.esu_seri_no),
+            )
+            sonuc.mukellef_kayit_sonucu = (
+                self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_MUKELLEF)
+                or self._gunluge_yaz(
+                    kayit,
+                    self._ISTEK_TIPI.ESU_MUKELLEF,
+                    await self.mukellef_kayit(mukellef),
+                )
+            ).mesaj
+        except Exception as hata:
+            sonuc.durum = IslemDurumu.HATALI
+            sonuc.hata = self._satir_hatasi(kayit, hata)
+
+    async def _guncelleme_kaydi_isle(
+        self, kayit: Mapping[str, str]
+    ) -> ESUTopluGuncellemeSonucu:
+        """Internal method to update a previously registered charge point's information.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            ESUTopluGuncellemeSonucu: Update result of the charge point
+        """
+        try:
+            veri = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_GUNCELLEME,
+                lambda: self._guncelleme_bilgisi_hazirla(kayit),
+            )
+            guncelleme_sonuc = self._gunlukteki_sonuc(
+                kayit, self._ISTEK_TIPI.ESU_GUNCELLEME
+            )
+            if guncelleme_sonuc is None:
+                yanit = await self.kayit_guncelle(veri)
+                self._anlik_goruntuye_yaz(veri, yanit)
+                guncelleme_sonuc = self._gunluge_yaz(
+                    kayit, self._ISTEK_TIPI.ESU_GUNCELLEME, yanit
+                )
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluGuncellemeSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                guncelleme_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
+            )
+        return ESUTopluGuncellemeSonucu(
+            esu_seri_no=kayit["esu_seri_no"],
+            guncelleme_kayit_sonucu=guncelleme_sonuc.mesaj,
+        )
+
+    async def _kapatma_kaydi_isle(
+        self, kayit: Mapping[str, str]
+    ) -> ESUTopluKapatmaSonucu:
+        """Internal method to delist a charge point read from batch input.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            ESUTopluKapatmaSonucu: Delisting result of the charge point
+        """
+        try:
+            kapatma_sonuc = self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_KAPATMA)
+            if kapatma_sonuc is None:
+                kapatma_sonuc = self._gunluge_yaz(
+                    kayit,
+                    self._ISTEK_TIPI.ESU_KAPATMA,
+                    await self.cihaz_kapatma(
+                        self._istek_modeli(
+                            kayit,
+                            self._ISTEK_TIPI.ESU_KAPATMA,
+                            lambda: self._kapatma_modeli_hazirla(
+                                esu_seri_no=kayit.get("esu_seri_no")
+                            ),
+                        )
+                    ),
+                )
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluKapatmaSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                kapatma_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
+            )
+        return ESUTopluKapatmaSonucu(
+            esu_seri_no=kayit["esu_seri_no"], kapatma_sonucu=kapatma_sonuc.mesaj
+        )
+
+    async def _kayitlari_gonder(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        isle: Callable[[Mapping[str, str]], Awaitable[R]],
+        istek_tipleri: Tuple[BaseESUServis._ISTEK_TIPI, ...],
+        islem: _TopluIslem,
+        sonraki_asamalar: Sequence[
+            Callable[[Mapping[str, str], R], Awaitable[None]]
+        ] = (),
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk: Optional[Journal] = None,
+        degismedi: Optional[Callable[[Mapping[str, str]], bool]] = None,
+        rapor: Optional[JsonLinesWriter] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Internal method to process csv rows with adaptive concurrency.
+
+        Rows are read lazily and fed to the worker tasks of each stage through
+        bounded queues, keeping memory use independent of the input size, while
+        the limiter adapts the number of requests in flight. A row operation
+        may consist of several stages, one per service path, a row going on to
+        its next stage only when the previous one succeeded, so that the later
+        stages of earlier rows overlap the first stage of later rows.
+
+        Args:
+            kayitlar (Iterable[Mapping[str, str]]): Rows read from csv input
+            isle (Callable[[Mapping[str, str]], Awaitable[R]]): Row processor, the
+            first stage
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            islem (_TopluIslem): State of the batch, shared by its rows only
+            sonraki_asamalar (Sequence[Callable[..., Awaitable[None]]], optional):
+                Later stages, completing the row result. Defaults to ().
+            yeniden_deneme_butcesi (Optional[int], optional):
+                Maximum number of retries across the whole batch. Defaults to None.
+            sure_siniri (Optional[float], optional):
+                Time limit of the batch in seconds. Defaults to None.
+            gunluk (Optional[Journal], optional):
+                Journal of completed requests, closed at the end of the batch.
+                Defaults to None.
+            degismedi (Optional[Callable[[Mapping[str, str]], bool]], optional):
+                Tells the rows unchanged since the last run, which are not sent.
+                Defaults to None.
+            rapor (Optional[JsonLinesWriter], optional):
+                Report receiving a line per finished row and a summary line at
+                the end, closed at the end of the batch. Defaults to None.
+            oncu_kayit_sayisi (Optional[int], optional):
+                Number of canary rows sent one at a time before the others,
+                which are not sent when the canary rows reveal a systemic
+                failure.
+                Defaults to None.
+
+        Returns:
+            Dict[str, Any]: Fields of the batch result, i.e. row results in input
+            order, the serial numbers of the rows skipped after the time limit or
+            while the circuit breaker is open, of the rows completed in a
+            previous run, the number of unchanged rows, the concurrency
+            reached and the reason of a stop after the canary rows
+        """
+        bitis = None if sure_siniri is None else time.monotonic() + sure_siniri
+        toplayici: ResultCollector[R] = ResultCollector()
+        gonderilmeyenler: List[Tuple[int, str]] = []
+        atlananlar: List[Tuple[int, str]] = []
+        degismeyenler: List[int] = []
+        sinirlayici = self._eszamanlilik_siniri()
+
+        asama_sayisi = 1 + len(sonraki_asamalar)
+
+        async def calistir(
+            satir: _AsamaliSatir, asama: Callable[[], Awaitable[Any]]
+        ) -> Any:
+            await sinirlayici.acquire_async()
+            baslangic = time.perf_counter()
+            sure: Optional[float] = None
+            try:
+                with self._satir_takibi(satir.takip):
+                    sonuc = await asama()
+                sure = time.perf_counter() - baslangic
+                satir.sure += sure
+                return sonuc
+            finally:
+                # the slot is freed whatever the stage raised, cancellation
+                # included, as a failure
+                sinirlayici.release(sure, failed=sure is None)
+
+        def bitir(satir: _AsamaliSatir) -> None:
+            toplayici.put(satir.sira, satir.sonuc)
+            if rapor is not None:
+                rapor.write(satir.sonuc.__pydantic_serializer__.to_json(satir.sonuc))
+
+        def ilerle(satir: _AsamaliSatir) -> bool:
+            if self._asamayi_tamamla(satir, asama_sayisi, istek_tipleri):
+                return True
+            bitir(satir)
+            return False
+
+        def hatali(satir: _AsamaliSatir, hata: Exception) -> None:
+            # a row whose stage raised is reported as failed instead of lost
+            self._asama_hatasi(satir, hata, asama_sayisi, istek_tipleri)
+            bitir(satir)
+
+        async def ilk_asama(satir: _AsamaliSatir) -> bool:
+            sira, kayit = satir.sira, satir.kayit
+            if self._gunlukte_tamamlandi(kayit, istek_tipleri):
+                atlananlar.append((sira, self._seri_no(kayit)))
+                return False
+            if degismedi is not None and degismedi(kayit):
+                degismeyenler.append(sira)
+                return False
+            # rows are not sent after the time limit or while the circuit is open
+            if not self._sure_doldu(bitis):
+                try:
+                    satir.sonuc = await calistir(satir, lambda: isle(kayit))
+                except CircuitOpenError:
+                    pass
+                else:
+                    return ilerle(satir)
+            gonderilmeyenler.append((sira, self._seri_no(kayit)))
+            return False
+
+        async def sonraki_asama(satir: _AsamaliSatir) -> bool:
+            asama = sonraki_asamalar[satir.asama - 1]
+            await calistir(satir, lambda: asama(satir.kayit, satir.sonuc))
+            return ilerle(satir)
+
+        islem.yeniden_deneme_butcesi = RetryBudget(yeniden_deneme_butcesi)
+        islem.sinirlayici = sinirlayici
+        islem.gunluk = gunluk
+        try:
+            satirlar = (
+                _AsamaliSatir(sira, kayit)
+                for sira, kayit in toplayici.enumerate(kayitlar)
+            )
+            asamalar = [ilk_asama] + [sonraki_asama] * len(sonraki_asamalar)
+            # canary rows are sent one at a time, stopping the batch before the
+            # rest is sent when they reveal a systemic failure
+            oncu: List[_AsamaliSatir] = []
+            while len(oncu) < (oncu_kayit_sayisi or 0):
+                satir = next(satirlar, None)
+                if satir is None:
+                    break
+                try:
+                    for asama in asamalar:
+                        if not await asama(satir):
+                            break
+                except Exception as hata:
+                    hatali(satir, hata)
+                if satir.sonuc is not None and satir.sonuc.deneme:
+                    oncu.append(satir)
+            durdurma_nedeni = (
+                self._oncu_gonderimi_degerlendir(oncu) if oncu_kayit_sayisi else None
+            )
+            if durdurma_nedeni is not None:
+                gonderilmeyenler.extend(
+                    (satir.sira, self._seri_no(satir.kayit)) for satir in satirlar
+                )
+            else:
+                await pipeline_async(
+                    satirlar, asamalar, sinirlayici.maximum, on_error=hatali
+                )
+            sonuclar = toplayici.results()
+            alanlar: Dict[str, Any] = {
+                "sonuclar": sonuclar,
+                "toplam": len(sonuclar),
+                "gonderilmeyenler": [
+                    seri_no for _, seri_no in sorted(gonderilmeyenler)
+                ],
+                "atlananlar": [seri_no for _, seri_no in sorted(atlananlar)],
+                "eszamanlilik": sinirlayici.limit,
+            }
+            if degismedi is not None:
+                # only the update result has the count of unchanged rows
+                alanlar["degismeyen"] = len(degismeyenler)
+            if durdurma_nedeni is not None:
+                alanlar["durdurma_nedeni"] = durdurma_nedeni
+            if rapor is not None:
+                self._rapor_ozeti_yaz(rapor, alanlar)
+        finally:
+            if gunluk is not None:
+                gunluk.close()
+            if rapor is not None:
+                rapor.close()
+
+        if atlananlar:
+            self.logger.info(f"{len(atlananlar)} kayıt önceki gönderimde tamamlanmış")
+        if degismeyenler:
+            self.logger.info(
+                f"{len(degismeyenler)} kayıt son gönderimden beri değişmedi"
+            )
+        if gonderilmeyenler:
+            self.logger.warning(f"{len(gonderilmeyenler)} kayıt gönderilmedi")
+        self.logger.info(f"Eşzamanlılık: {sinirlayici.limit}")
+        return alanlar
+
+    async def _toplu_islem(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        isle: Callable[[Mapping[str, str]], Awaitable[R]],
+        istek_tipleri: Tuple[BaseESUServis._ISTEK_TIPI, ...],
+        sonuc_modeli: Type[TopluIslemSonucu],
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+        anlik_goruntu_dosya_yolu: Optional[str] = None,
+        degismedi: Optional[Callable[[Mapping[str, str]], bool]] = None,
+        sonraki_asamalar: Sequence[
+            Callable[[Mapping[str, str], R], Awaitable[None]]
+        ] = (),
+    ) -> dict[str, Any]:
+        """Internal batch engine running a row operation over a row source.
+
+        Keyword arguments other than the ones below are the batch options
+        described in `BaseESUServis`.
+
+        Args:
+            kayitlar (Iterable[Mapping[str, str]]): Row source, read lazily
+            isle (Callable[[Mapping[str, str]], Awaitable[R]]): Row operation
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            sonuc_modeli (Type[TopluIslemSonucu]): Batch result model
+            anlik_goruntu_dosya_yolu (Optional[str], optional):
+                Snapshot file path holding the content hashes of the update
+                payloads last accepted by GIB, only new or changed rows are
+                sent and the snapshot is refreshed at the end of the batch.
+                Defaults to None (all rows are sent).
+            degismedi (Optional[Callable[[Mapping[str, str]], bool]], optional):
+                Tells the rows unchanged since the last run, which are not sent.
+                Defaults to None.
+            sonraki_asamalar (Sequence[Callable[..., Awaitable[None]]], optional):
+                Later stages of the row operation, one per service path after
+                the first. Defaults to ().
+
+        Returns:
+            dict[str, Any]: Batch result model instance as a dictionary
+        """
+        self._azami_hata_oranini_denetle(azami_hata_orani)
+        self._oncu_kayit_sayisini_denetle(oncu_kayit_sayisi)
+        if kuru_calistir:
+            kuru = await asyncio.get_running_loop().run_in_executor(
+                None, self._kuru_calistir, kayitlar, istek_tipleri, cikti_dosya_yolu
+            )
+            return kuru.model_dump()
+        with self._toplu_islem_baglami(
+            istekleri_logla, anlik_goruntu_dosya_yolu
+        ) as islem:
+            dogrulama: Optional[DogrulamaSonucu] = None
+            if on_dogrulama or azami_hata_orani is not None:
+                kayitlar, dogrulama = await asyncio.get_running_loop().run_in_executor(
+                    None, self._on_dogrula, kayitlar, istek_tipleri, islem
+                )
+            rapor = self._rapor_ac(cikti_dosya_yolu) if dosyaya_yaz else None
+            alanlar = self._dogrulama_sonucunu_isle(
+                kayitlar, dogrulama, azami_hata_orani, rapor
+            )
+            if alanlar is None:
+                self.logger.info("GİB'e gönderim başlıyor...")
+                alanlar = await self._kayitlari_gonder(
+                    kayitlar,
+                    isle,
+                    istek_tipleri,
+                    islem,
+                    sonraki_asamalar=sonraki_asamalar,
+                    yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+                    sure_siniri=sure_siniri,
+                    gunluk=self._gunluk_ac(gunluk_dosya_yolu, devam_et),
+                    degismedi=degismedi,
+                    oncu_kayit_sayisi=oncu_kayit_sayisi,
+                    rapor=rapor,
+                )
+            sonuc = sonuc_modeli(**alanlar, dogrulama=dogrulama)
+            if hatali_kayit_dosya_yolu:
+                self._hatali_kayitlari_yaz(hatali_kayit_dosya_yolu, alanlar["sonuclar"])
+
+            # without a path, the report is the streaming one written above
+            if bool(dosyaya_yaz) and rapor is None and cikti_dosya_yolu:
+                self._dosyaya_yaz(
+                    cikti_dosya_yolu=cikti_dosya_yolu,
+                    icerik=sonuc.model_dump_json(indent=4),
+                )
+
+        return sonuc.model_dump()
+
+    async def toplu_kayit(
+        self,
+        giris_dosya_yolu: Optional[str] = None,  # using "envanter.csv" when None
+        csv_string: Optional[io.StringIO] = None,
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Batch registers charge points along with their tax payer information.
+
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+
+        Returns:
+            dict[str, Any]: TopluKayitSonuc instance
+            (which contains batch processing results) as a dictionary
+        """
+        return await self._toplu_islem(
+            self._csv_satirlari(giris_dosya_yolu, csv_string),
+            self._cihaz_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_KAYIT, self._ISTEK_TIPI.ESU_MUKELLEF),
+            TopluKayitSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
+            sonraki_asamalar=(self._mukellef_kaydi_isle,),
+        )
+
+    async def toplu_guncelle(
+        self,
+        giris_dosya_yolu: Optional[str] = None,  # using "envanter.csv" when None
+        csv_string: Optional[io.StringIO] = None,
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+        anlik_goruntu_dosya_yolu: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Batch updates previously registered charge points' information.
+
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+            anlik_goruntu_dosya_yolu (Optional[str], optional):
+                Snapshot file path holding the content hashes of the update
+                payloads last accepted by GIB, only new or changed rows are
+                sent and the snapshot is refreshed at the end of the batch.
+                Defaults to None (all rows are sent).
+
+        Returns:
+            dict[str, Any]: TopluGuncellemeSonuc instance
+            (which contains batch update results) as a dictionary
+        """
+        return await self._toplu_islem(
+            self._csv_satirlari(giris_dosya_yolu, csv_string),
+            self._guncelleme_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_GUNCELLEME,),
+            TopluGuncellemeSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
+            anlik_goruntu_dosya_yolu=anlik_goruntu_dosya_yolu,
+            degismedi=self._guncelleme_degismedi,
+        )
+
+    async def toplu_kapatma(
+        self,
+        giris_dosya_yolu: Optional[str] = None,  # using "envanter.csv" when None
+        csv_string: Optional[io.StringIO] = None,
+        seri_nolar: Optional[Iterable[str]] = None,
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Batch delists previously registered charge points.
+
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+            seri_nolar (Optional[Iterable[str]], optional):
+                Serial numbers as alternative input, e.g. a generator.
+                Defaults to None (the `esu_seri_no` column of the csv input).
+
+        Returns:
+            dict[str, Any]: TopluKapatmaSonuc instance
+            (which contains batch delisting results) as a dictionary
+        """
+        return await self._toplu_islem(
+            (
+                ({"esu_seri_no": seri_no} for seri_no in seri_nolar)
+                if seri_nolar is not None
+                else self._csv_satirlari(giris_dosya_yolu, csv_string)
+            ),
+            self._kapatma_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_KAPATMA,),
+            TopluKapatmaSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
+        )
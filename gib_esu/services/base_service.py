@@ -0,0 +1,1936 @@
+import base64
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from dotenv import dotenv_values
+from pydantic import BaseModel, HttpUrl
+
+from gib_esu.helpers.circuit_breaker import CircuitBreaker, CircuitOpenError
+from gib_esu.helpers.concurrency import AIMDLimiter
+from gib_esu.helpers.journal import Journal
+from gib_esu.helpers.jsonl_writer import JsonLinesWriter
+from gib_esu.helpers.lru_cache import LRUCache
+from gib_esu.helpers.process_pool import process_map
+from gib_esu.helpers.py_utils import PyUtils
+from gib_esu.helpers.rate_limiter import TokenBucket
+from gib_esu.helpers.retry import RetryBudget, exponential_backoff
+from gib_esu.helpers.snapshot import SnapshotStore
+from gib_esu.models.column_validator import sutunlara_ayir, sutunlari_dogrula
+from gib_esu.models.request_models import (
+    ESU,
+    ESUGuncellemeModel,
+    ESUKapatmaModel,
+    ESUKayitModel,
+    ESUMukellefModel,
+    ESUSeriNo,
+    ESUTipi,
+    Fatura,
+    Firma,
+    Lokasyon,
+    Mukellef,
+    MulkiyetSahibi,
+    Sertifika,
+    Soket,
+    SoketTipi,
+)
+from gib_esu.models.response_models import Durum, Sonuc, Yanit
+from gib_esu.models.service_models import (
+    APIParametreleri,
+    AraBellekIstatistigi,
+    DevreKesici,
+    DogrulamaHatasi,
+    DogrulamaSonucu,
+    ESUServisKonfigurasyonu,
+    ESUTopluGuncellemeSonucu,
+    ESUTopluKapatmaSonucu,
+    ESUTopluKayitSonucu,
+    EszamanlilikAyari,
+    EvetVeyaHayir,
+    IslemDurumu,
+    KuruCalistirmaSonucu,
+    SatirSonucu,
+    YenidenDenemePolitikasi,
+    ZamanAsimi,
+)
+
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+
+
+class _SatirTakibi:
+    """Processing details of the batch row handled by a thread or a task."""
+
+    __slots__ = ("deneme", "red", "durum_kodu")
+
+    def __init__(self) -> None:
+        self.deneme = 0  # http attempts
+        self.red: Optional[Sonuc] = None  # last result rejected by GIB
+        self.durum_kodu: Optional[int] = None  # http status of the last response
+
+
+class _AsamaliSatir:
+    """Batch row passing through the stages of a row operation."""
+
+    __slots__ = ("sira", "kayit", "sonuc", "takip", "asama", "sure")
+
+    def __init__(self, sira: int, kayit: Mapping[str, str]) -> None:
+        self.sira = sira  # index in the input
+        self.kayit = kayit
+        self.sonuc: Any = None  # row result, created by the first stage
+        self.takip = _SatirTakibi()
+        self.asama = 0  # number of completed stages
+        self.sure = 0.0  # seconds spent in the stages
+
+
+class _TopluIslem:
+    """State of a running batch, apart from the other batches of the client."""
+
+    __slots__ = (
+        "gunluk",
+        "yeniden_deneme_butcesi",
+        "sinirlayici",
+        "anlik_goruntu",
+        "hazir_istekler",
+    )
+
+    def __init__(self, anlik_goruntu: Optional[SnapshotStore] = None) -> None:
+        self.gunluk: Optional[Journal] = None  # journal of the completed requests
+        # retries left to the whole batch
+        self.yeniden_deneme_butcesi: Optional[RetryBudget] = None
+        # concurrency limiter of a parallel batch
+        self.sinirlayici: Optional[AIMDLimiter] = None
+        # snapshot of the accepted update payloads
+        self.anlik_goruntu = anlik_goruntu
+        # request models built by the pre-validation, per serial number
+        self.hazir_istekler: Optional[
+            Dict[str, Dict[BaseESUServis._ISTEK_TIPI, BaseModel]]
+        ] = None
+
+
+# marker of the columns missing in a batch row
+_EKSIK = object()
+
+# tracker of the batch row being processed, isolated per thread and per task
+_SATIR_TAKIBI: ContextVar[Optional[_SatirTakibi]] = ContextVar(
+    "satir_takibi", default=None
+)
+
+# state of the batch whose row is being processed, isolated per thread and
+# per task so that batches running at the same time on a client do not share it
+_TOPLU_ISLEM: ContextVar[Optional[_TopluIslem]] = ContextVar(
+    "toplu_islem", default=None
+)
+
+
+class BaseESUServis:
+    """Base class for GIB ESU EKS service clients.
+
+    Holds the configuration, the company information and the request model
+    construction logic shared by the synchronous and asynchronous clients.
+
+    The batch methods of both clients (`toplu_kayit`, `toplu_guncelle` and
+    `toplu_kapatma`) take the following batch options as keyword arguments.
+
+    Batch options:
+        dosyaya_yaz (Optional[bool], optional):
+            Boolean flag to control whether report the results to a file.
+            Defaults to None.
+        cikti_dosya_yolu (Optional[str], optional):
+            Output file path (if `dosyaya_yaz` is True), ".jsonl" and
+            ".jsonl.gz" reports receive a line per row as soon as it is
+            finished and a summary line at the end, other paths receive the
+            whole report as pretty printed json at the end. Defaults to None.
+        istekleri_logla (Optional[bool], optional):
+            Boolean flag to log api requests to console.
+        yeniden_deneme_butcesi (Optional[int], optional):
+            Maximum number of retries across the whole batch.
+            Defaults to None (limited only by the retry policies).
+        sure_siniri (Optional[float], optional):
+            Time limit of the batch in seconds, rows not yet sent when it
+            runs out are skipped and listed in `gonderilmeyenler`.
+            Defaults to None (no time limit).
+        gunluk_dosya_yolu (Optional[str], optional):
+            Journal file path, every response is appended to the journal
+            as it arrives. Defaults to None (no journal, or
+            "gonderim_gunlugu.jsonl" when `devam_et` is True).
+        devam_et (Optional[bool], optional):
+            Boolean flag to resume an interrupted batch from the journal,
+            requests accepted by GIB before are not sent again, rejected
+            ones are, and the rows completed before are listed in
+            `atlananlar`. Defaults to None.
+        on_dogrulama (Optional[bool], optional):
+            Boolean flag to validate the whole input across a process pool
+            before sending, the invalid rows are listed in `dogrulama`.
+            Defaults to None.
+        azami_hata_orani (Optional[float], optional):
+            Maximum ratio of invalid rows, between 0 and 1, above which
+            nothing is sent, implies `on_dogrulama`. Defaults to None.
+        kuru_calistir (Optional[bool], optional):
+            Boolean flag to build and validate the request payloads without
+            sending them, the payloads are written as json lines to
+            `cikti_dosya_yolu` ("kuru_calistirma.jsonl" when None) along
+            with the timings of the local processing, and a
+            KuruCalistirmaSonucu is returned. Defaults to None.
+        hatali_kayit_dosya_yolu (Optional[str], optional):
+            Csv file path to write the input columns of the failed and
+            rejected rows to, in the schema of the input, so that only
+            those rows are sent again when it is given as
+            `giris_dosya_yolu`. Defaults to None.
+        oncu_kayit_sayisi (Optional[int], optional):
+            Number of canary rows sent one at a time before the rest of the
+            batch, nothing else is sent when they all fail with HTTP
+            401/403 or are rejected by GIB with the same result code, when
+            any of them is rejected with a result code listed in
+            `sistemik_kodlar` of the circuit breaker settings or when the
+            circuit breaker opens, and the reason is returned in
+            `durdurma_nedeni`.
+            Defaults to None (no canary rows).
+    """
+
+    # name of the default environment file to read the configuration
+    _DEFAULT_ENV = ".env"
+
+    # minimum number of rows worth a process of the pre-validation pool
+    _DOGRULAMA_ISLEM_BASINA_SATIR = 1000
+
+    # batch rows are built into request models from validated sub-models,
+    # which are combined without validating their fields again
+    _GUVENILIR_OLUSTURMA = True
+
+    # charge point and location models of the values repeated across batch
+    # rows, keyed by their input columns, shared by the instances of a process
+    # as the pre-validation pool builds request models without an instance
+    _ESU_SABLONLARI: LRUCache[Tuple[Any, ...], ESU] = LRUCache(maxsize=1024)
+    _LOKASYONLAR: LRUCache[Tuple[Any, ...], Lokasyon] = LRUCache(maxsize=1024)
+
+    class _API(str, Enum):
+        """Enum for available GIB ESU EKS service base urls."""
+
+        PROD = "https://okc.gib.gov.tr/api/v1/okc/okcesu"
+        TEST = "https://okctest.gib.gov.tr/api/v1/okc/okcesu"
+
+    class _ISTEK_TIPI(str, Enum):
+        """Enum for available GIB ESU EKS service paths."""
+
+        ESU_KAYIT = "/yeniEsuKayit"
+        ESU_MUKELLEF = "/esuMukellefDurum"
+        ESU_GUNCELLEME = "/esuGuncelleme"
+        ESU_KAPATMA = "/esuKapatma"
+
+    # request models built from a batch row per service path
+    _ISTEK_MODELLERI: Dict[_ISTEK_TIPI, Type[BaseModel]] = {
+        _ISTEK_TIPI.ESU_KAYIT: ESUKayitModel,
+        _ISTEK_TIPI.ESU_MUKELLEF: ESUMukellefModel,
+        _ISTEK_TIPI.ESU_GUNCELLEME: ESUGuncellemeModel,
+        _ISTEK_TIPI.ESU_KAPATMA: ESUKapatmaModel,
+    }
+
+    # default retry policies, registering or delisting a charge point twice
+    # is not idempotent whereas re-sending tax payer or update data is
+    _VARSAYILAN_YENIDEN_DENEME = {
+        _ISTEK_TIPI.ESU_KAYIT: YenidenDenemePolitikasi(),
+        _ISTEK_TIPI.ESU_MUKELLEF: YenidenDenemePolitikasi(idempotent=True),
+        _ISTEK_TIPI.ESU_GUNCELLEME: YenidenDenemePolitikasi(idempotent=True),
+        _ISTEK_TIPI.ESU_KAPATMA: YenidenDenemePolitikasi(),
+    }
+
+    # concurrency settings of batch methods, resolved by the clients
+    _eszamanlilik: EszamanlilikAyari
+
+    # http status codes indicating that GIB did not process the request
+    _ISLENMEDI_DURUM_KODLARI = frozenset({429, 503})
+
+    # http status codes failing every request alike, i.e. rejected credentials
+    _SISTEMIK_DURUM_KODLARI = frozenset({401, 403})
+
+    def __init__(
+        self,
+        _config: Optional[Dict[str, str | None]] = None,
+        hiz_limitleri: Optional[Union[float, Mapping[str, float]]] = None,
+        hiz_limitini_paylas: bool = False,
+        yeniden_deneme: Optional[
+            Union[YenidenDenemePolitikasi, Mapping[str, YenidenDenemePolitikasi]]
+        ] = None,
+        zaman_asimi: Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]] = None,
+        devre_kesici: Optional[DevreKesici] = None,
+    ) -> None:
+        """BaseESUServis constructor.
+
+        Args:
+            _config (Optional[Dict[str, str  |  None]], optional):
+            Dictionary or env file path to read the config from. Defaults to None.
+            hiz_limitleri (Optional[Union[float, Mapping[str, float]]], optional):
+            Maximum requests per second, either for all service paths or per
+            service path (e.g. `{"/yeniEsuKayit": 5}`). Defaults to None (no limit).
+            hiz_limitini_paylas (bool, optional): Whether to share the rate limits
+            with all service instances of the same company in the process.
+            Defaults to False.
+            yeniden_deneme (Optional[Union[YenidenDenemePolitikasi,
+            Mapping[str, YenidenDenemePolitikasi]]], optional):
+            Retry policy for all service paths or per service path.
+            Defaults to None (`_VARSAYILAN_YENIDEN_DENEME`).
+            zaman_asimi (Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]],
+            optional): Connect and read timeouts for all service paths or per
+            service path. Defaults to None (`ZamanAsimi()`).
+            devre_kesici (Optional[DevreKesici], optional): Circuit breaker
+            settings. Defaults to None (`DevreKesici()`).
+        """
+        _cfg = dotenv_values(self._DEFAULT_ENV) if _config is None else _config
+        config = ESUServisKonfigurasyonu.model_validate(_cfg)
+        self._api = APIParametreleri(
+            api_sifre=str(config.GIB_API_SIFRE),
+            prod_api=config.PROD_API == EvetVeyaHayir.EVET,
+            ssl_dogrulama=str(config.SSL_DOGRULAMA) == EvetVeyaHayir.EVET,
+            test_firma=config.TEST_FIRMA_KULLAN == EvetVeyaHayir.EVET,
+            test_firma_vkn=config.GIB_TEST_FIRMA_VKN,
+        )
+        self._firma = Firma(
+            firma_kodu=config.GIB_FIRMA_KODU,
+            firma_vkn=(
+                config.FIRMA_VKN
+                if not self._api.test_firma
+                else self._api.test_firma_vkn
+            ),
+            firma_unvan=config.FIRMA_UNVAN,
+            epdk_lisans_no=config.EPDK_LISANS_KODU,
+        )
+        self._api.api_url = (
+            cast(HttpUrl, self._API.PROD.value)
+            if self._api.prod_api
+            else cast(HttpUrl, self._API.TEST.value)
+        )
+        # no ssl warnings will be displayed when `ssl_dogrulama` is set to `0` (False)
+        if not self._api.ssl_dogrulama:
+            import urllib3
+            from urllib3.exceptions import InsecureRequestWarning
+
+            urllib3.disable_warnings(InsecureRequestWarning)
+
+        # configure logging
+        self.logger = logging.getLogger(self.__class__.__name__)
+        handler = logging.StreamHandler()  # console logger
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        handler.setFormatter(formatter)
+        self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+        # request headers are built once, including the basic auth token
+        self._basliklar = self._istek_basliklari()
+
+        # token buckets pacing the requests per service path
+        self._hiz_sinirlayicilar: Dict[BaseESUServis._ISTEK_TIPI, TokenBucket] = {}
+        if hiz_limitleri is not None:
+            for istek_tipi, limit in self._istek_tipine_gore(hiz_limitleri).items():
+                self._hiz_sinirlayicilar[istek_tipi] = (
+                    TokenBucket.shared(
+                        (self._istek_url(istek_tipi), self._firma.firma_kodu), limit
+                    )
+                    if hiz_limitini_paylas
+                    else TokenBucket(limit)
+                )
+
+        # retry policies per service path and the retry budget of a running batch
+        self._yeniden_deneme_politikalari = {
+            **self._VARSAYILAN_YENIDEN_DENEME,
+            **(
+                self._istek_tipine_gore(yeniden_deneme)
+                if yeniden_deneme is not None
+                else {}
+            ),
+        }
+        # connect and read timeouts per service path
+        self._zaman_asimlari = {
+            **self._istek_tipine_gore(ZamanAsimi()),
+            **(self._istek_tipine_gore(zaman_asimi) if zaman_asimi is not None else {}),
+        }
+
+        # circuit breaker failing fast while GIB is down or rejects the credentials
+        self._devre_kesici_ayari = devre_kesici or DevreKesici()
+        self._devre_kesici = CircuitBreaker(
+            self._devre_kesici_ayari.hata_esigi,
+            self._devre_kesici_ayari.bekleme_suresi,
+        )
+
+    def _istek_tipine_gore(
+        self, ayar: Union[T, Mapping[str, T]]
+    ) -> Dict["BaseESUServis._ISTEK_TIPI", T]:
+        """Internal method to map a setting to the service paths it applies to.
+
+        Args:
+            ayar (Union[T, Mapping[str, T]]): Either a single value applying to
+            all service paths, or a mapping of service paths (e.g. "/esuKapatma"
+            or "ESU_KAPATMA") to values
+
+        Raises:
+            ValueError: When the mapping contains an unknown service path
+
+        Returns:
+            Dict[_ISTEK_TIPI, T]: Values per service path
+        """
+        if not isinstance(ayar, Mapping):
+            return {istek_tipi: ayar for istek_tipi in self._ISTEK_TIPI}
+        degerler: Dict[BaseESUServis._ISTEK_TIPI, T] = {}
+        for anahtar, deger in ayar.items():
+            if anahtar in self._ISTEK_TIPI.__members__:
+                degerler[self._ISTEK_TIPI[anahtar]] = deger
+            elif anahtar in {tip.value for tip in self._ISTEK_TIPI}:
+                degerler[self._ISTEK_TIPI(anahtar)] = deger
+            else:
+                raise ValueError(f"{anahtar} geçerli bir servis yolu değil")
+        return degerler
+
+    def _hiz_siniri(self, istek_tipi: _ISTEK_TIPI) -> Optional[TokenBucket]:
+        """Internal method to get the rate limiter of a service path.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path
+
+        Returns:
+            Optional[TokenBucket]: Token bucket pacing the service path, if any
+        """
+        return self._hiz_sinirlayicilar.get(istek_tipi)
+
+    @staticmethod
+    def _eszamanlilik_ayari(
+        eszamanlilik: Optional[EszamanlilikAyari], sabit: Optional[int]
+    ) -> EszamanlilikAyari:
+        """Internal method to resolve the concurrency settings of batch methods.
+
+        Args:
+            eszamanlilik (Optional[EszamanlilikAyari]): Adaptive concurrency
+            settings
+            sabit (Optional[int]): Fixed concurrency, used when no adaptive
+            settings are given
+
+        Raises:
+            ValueError: When the fixed concurrency is not positive
+
+        Returns:
+            EszamanlilikAyari: Concurrency settings
+        """
+        if eszamanlilik is not None:
+            return eszamanlilik
+        if sabit is None:
+            return EszamanlilikAyari()
+        if sabit < 1:
+            raise ValueError("Eşzamanlı istek sayısı en az 1 olmalıdır")
+        return EszamanlilikAyari(baslangic=sabit, asgari=sabit, azami=sabit)
+
+    def _eszamanlilik_siniri(self) -> AIMDLimiter:
+        """Internal method to create the concurrency limiter of a batch.
+
+        Returns:
+            AIMDLimiter: Limiter adapting the number of rows in flight
+        """
+        ayar = self._eszamanlilik
+        return AIMDLimiter(
+            ayar.baslangic, ayar.asgari, ayar.azami, ayar.gecikme_toleransi
+        )
+
+    def _yeniden_deneme_beklemesi(
+        self,
+        istek_tipi: _ISTEK_TIPI,
+        deneme: int,
+        islenmedi: bool,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Internal method to decide whether a failed request is to be retried.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path
+            deneme (int): Number of the failed attempt, starting from 1
+            islenmedi (bool): Whether GIB certainly did not process the request
+            retry_after (Optional[str], optional): `Retry-After` response header.
+            Defaults to None.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, None when the
+            request is not to be retried
+        """
+        # every retryable failure also signals congestion to a running batch
+        islem = _TOPLU_ISLEM.get()
+        if islem is not None and islem.sinirlayici is not None:
+            islem.sinirlayici.backoff()
+        politika = self._yeniden_deneme_politikalari[istek_tipi]
+        if deneme >= politika.azami_deneme:
+            return None
+        if not (islenmedi or politika.idempotent):
+            return None
+        butce = None if islem is None else islem.yeniden_deneme_butcesi
+        if butce is not None and not butce.try_consume():
+            return None
+        bekleme = exponential_backoff(
+            deneme, politika.taban_bekleme, politika.azami_bekleme
+        )
+        if retry_after is not None and retry_after.strip().isdigit():
+            bekleme = max(bekleme, min(float(retry_after), politika.azami_bekleme))
+        return bekleme
+
+    def _durum_kodu_islenmedi(
+        self, istek_tipi: _ISTEK_TIPI, durum_kodu: int
+    ) -> Optional[bool]:
+        """Internal method to classify a http status code for retrying.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path
+            durum_kodu (int): Http status code
+
+        Returns:
+            Optional[bool]: True when GIB did not process the request, False when
+            it may have been processed, None when the status is not retryable
+        """
+        if durum_kodu in self._ISLENMEDI_DURUM_KODLARI:
+            return True
+        if durum_kodu in self._yeniden_deneme_politikalari[istek_tipi].durum_kodlari:
+            return False
+        return None
+
+    def _devreyi_denetle(self, istek_tipi: _ISTEK_TIPI) -> None:
+        """Internal method to reject a request while the circuit is open.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+        """
+        if not self._devre_kesici.allow():
+            raise CircuitOpenError(
+                f"{istek_tipi.value} isteği gönderilmedi, devre kesici açık"
+            )
+
+    def _durum_kodunu_bildir(self, durum_kodu: int) -> bool:
+        """Internal method to report http statuses to the circuit breaker and to
+        the batch row in process.
+
+        Args:
+            durum_kodu (int): Http status code
+
+        Returns:
+            bool: True when the status is recorded as a failure
+        """
+        takip = _SATIR_TAKIBI.get()
+        if takip is not None:
+            takip.durum_kodu = durum_kodu
+        if durum_kodu in self._devre_kesici_ayari.durum_kodlari:
+            self._devre_kesici.record_failure()
+            return True
+        return False
+
+    def _yaniti_bildir(self, yanit: Yanit) -> Yanit:
+        """Internal method to report a parsed response to the circuit breaker.
+
+        Args:
+            yanit (Yanit): GIB ESU EKS service reponse
+
+        Returns:
+            Yanit: The same response
+        """
+        sistemik_kodlar = self._devre_kesici_ayari.sistemik_kodlar
+        if any(sonuc.kod in sistemik_kodlar for sonuc in yanit.sonuc):
+            self._devre_kesici.record_failure()
+        else:
+            self._devre_kesici.record_success()
+        return yanit
+
+    @staticmethod
+    def _sure_doldu(bitis: Optional[float]) -> bool:
+        """Internal method to check whether a batch deadline has passed.
+
+        Args:
+            bitis (Optional[float]): Deadline as a `time.monotonic` value
+
+        Returns:
+            bool: True when there is a deadline and it has passed
+        """
+        return bitis is not None and time.monotonic() >= bitis
+
+    def _istek_url(self, istek_tipi: _ISTEK_TIPI) -> str:
+        """Internal method to construct the url of a service path.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path
+
+        Returns:
+            str: Full url of the service path
+        """
+        return f"{str(self._api.api_url)}{istek_tipi.value}"
+
+    def _istek_basliklari(self) -> Dict[str, str]:
+        """Internal method to construct the request headers including basic auth.
+
+        Returns:
+            Dict[str, str]: Request headers
+        """
+        token = f"{self._firma.firma_kodu}:{self._api.api_sifre}".encode("utf-8")
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Basic {base64.b64encode(token).decode('utf-8')}",
+        }
+
+    @staticmethod
+    def _istek_govdesi(veri: BaseModel) -> bytes:
+        """Internal method to serialize a request model as the request body.
+
+        The model is serialized to json bytes in a single pass, the same bytes
+        are both logged and sent over the wire.
+
+        Args:
+            veri (BaseModel): Request model
+
+        Returns:
+            bytes: Utf-8 encoded json request body
+        """
+        return veri.__pydantic_serializer__.to_json(veri)
+
+    def _istegi_logla(self, govde: bytes) -> None:
+        """Internal method to log a serialized request body at debug level.
+
+        Args:
+            govde (bytes): Utf-8 encoded json request body
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(govde.decode("utf-8"))
+
+    @staticmethod
+    def _yaniti_coz(icerik: bytes) -> Yanit:
+        """Internal method to validate a response model straight from json bytes.
+
+        Args:
+            icerik (bytes): Raw json response body
+
+        Returns:
+            Yanit: GIB ESU EKS service reponse
+        """
+        return Yanit.model_validate_json(icerik)
+
+    def _kayit_modeli_hazirla(
+        self, cihaz_bilgileri: Union[ESUKayitModel, ESU]
+    ) -> ESUKayitModel:
+        """Internal method to construct a charge point registration request model.
+
+        Args:
+            cihaz_bilgileri (Union[ESUKayitModel, ESU]): Charge point information
+
+        Returns:
+            ESUKayitModel: Charge point registration request model
+        """
+        return (
+            cihaz_bilgileri
+            if isinstance(cihaz_bilgileri, ESUKayitModel)
+            else ESUKayitModel.olustur(
+                firma=self._firma,
+                esu=cihaz_bilgileri,
+            )
+        )
+
+    def _mukellef_modeli_hazirla(
+        self,
+        mukellef_bilgileri: Union[ESUMukellefModel, Any] = None,
+        esu: Optional[Union[ESU, str]] = None,
+        lokasyon: Optional[Lokasyon] = None,
+        fatura: Optional[Fatura] = None,
+        mukellef: Optional[Mukellef] = None,
+        mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
+        sertifika: Optional[Sertifika] = None,
+    ) -> ESUMukellefModel:
+        """Internal method to construct a tax payer registration request model.
+
+        Args:
+            mukellef_bilgileri (Union[ESUMukellefModel, Any], optional):
+                Tax payer request model. Defaults to None.
+            esu (Optional[Union[ESU, str]], optional):
+                Charge point information. Defaults to None.
+            lokasyon (Optional[Lokasyon], optional):
+                Location information. Defaults to None.
+            fatura (Optional[Fatura], optional):
+                Invoice information. Defaults to None.
+            mukellef (Optional[Mukellef], optional):
+                Tax payer information. Defaults to None.
+            mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
+                Ownership information. Defaults to None.
+            sertifika (Optional[Sertifika], optional):
+                Certificate information. Defaults to None.
+
+        Raises:
+            ValueError: When some information is missing to construct the request model
+
+        Returns:
+            ESUMukellefModel: Tax payer registration request model
+        """
+        if isinstance(mukellef_bilgileri, ESUMukellefModel):
+            return mukellef_bilgileri
+
+        if not esu or not lokasyon or not mukellef or not (fatura or mulkiyet_sahibi):
+            raise ValueError("Mükellef bilgileri eksik")
+
+        _fatura = (
+            fatura if fatura is not None else Fatura(fatura_tarihi="", fatura_ettn="")
+        )
+        _mukellef = (
+            mukellef
+            if mukellef is not None
+            else Mukellef(
+                mukellef_vkn=self._firma.firma_vkn,
+                mukellef_unvan=str(self._firma.firma_unvan),
+            )
+        )
+        _mulkiyet_sahibi = (
+            mulkiyet_sahibi
+            if mulkiyet_sahibi is not None
+            else MulkiyetSahibi(
+                mulkiyet_sahibi_vkn_tckn="", mulkiyet_sahibi_ad_unvan=""
+            )
+        )
+        _sertifika = (
+            sertifika
+            if sertifika is not None
+            else Sertifika(sertifika_no="", sertifika_tarihi="")
+        )
+        return ESUMukellefModel.olustur(
+            esu_seri_no=esu.esu_seri_no if isinstance(esu, ESU) else esu,
+            firma_kodu=self._firma.firma_kodu,
+            fatura=_fatura,
+            lokasyon=lokasyon,
+            mukellef=_mukellef,
+            mulkiyet_sahibi=_mulkiyet_sahibi,
+            sertifika=_sertifika,
+        )
+
+    def _guncelleme_modeli_hazirla(
+        self,
+        kayit_bilgileri: Union[ESUGuncellemeModel, Any] = None,
+        esu_seri_no: Optional[str] = None,
+        lokasyon: Optional[Lokasyon] = None,
+        fatura: Optional[Fatura] = None,
+        mulkiyet_sahibi: Optional[MulkiyetSahibi] = None,
+        sertifika: Optional[Sertifika] = None,
+        dogrulanmis: bool = False,
+    ) -> ESUGuncellemeModel:
+        """Internal method to construct a charge point update request model.
+
+        Args:
+            kayit_bilgileri (Union[ESUGuncellemeModel, Any], optional):
+                Charge point update request model. Defaults to None.
+            esu_seri_no (Optional[str], optional):
+                Charge point serial number. Defaults to None.
+            lokasyon (Optional[Lokasyon], optional):
+                Location information. Defaults to None.
+            fatura (Optional[Fatura], optional):
+                Invoice information. Defaults to None.
+            mulkiyet_sahibi (Optional[MulkiyetSahibi], optional):
+                Ownership information. Defaults to None.
+            sertifika (Optional[Sertifika], optional):
+                Certificate information. Defaults to None.
+            dogrulanmis (bool, optional):
+                Whether to combine the model instances without validating their
+                fields again. Defaults to False.
+
+        Raises:
+            ValueError: When some information is missing to construct the request model
+
+        Returns:
+            ESUGuncellemeModel: Charge point update request model
+        """
+        if isinstance(kayit_bilgileri, ESUGuncellemeModel):
+            return kayit_bilgileri
+
+        if not esu_seri_no or not lokasyon or not (fatura or mulkiyet_sahibi):
+            raise ValueError("Kayıt bilgileri eksik")
+
+        _fatura = (
+            fatura if fatura is not None else Fatura(fatura_tarihi="", fatura_ettn="")
+        )
+        _mulkiyet_sahibi = (
+            mulkiyet_sahibi
+            if mulkiyet_sahibi is not None
+            else MulkiyetSahibi(
+                mulkiyet_sahibi_vkn_tckn="", mulkiyet_sahibi_ad_unvan=""
+            )
+        )
+        _sertifika = (
+            sertifika
+            if sertifika is not None
+            else Sertifika(sertifika_no="", sertifika_tarihi="")
+        )
+        return ESUGuncellemeModel.olustur(
+            esu_seri_no=ESUSeriNo(esu_seri_no=esu_seri_no),
+            firma_kodu=self._firma.firma_kodu,
+            fatura=_fatura,
+            lokasyon=lokasyon,
+            mulkiyet_sahibi=_mulkiyet_sahibi,
+            sertifika=_sertifika,
+            dogrulanmis=dogrulanmis,
+        )
+
+    def _kapatma_modeli_hazirla(
+        self,
+        cihaz_bilgisi: Optional[ESUKapatmaModel] = None,
+        esu_seri_no: Optional[str] = None,
+    ) -> ESUKapatmaModel:
+        """Internal method to construct a charge point delisting request model.
+
+        Args:
+            cihaz_bilgisi (Optional[ESUKapatmaModel], optional):
+                Charge point delisting request model. Defaults to None.
+            esu_seri_no (Optional[str], optional):
+                Charge point serial number. Defaults to None.
+
+        Raises:
+            ValueError: When none of the arguments are provided
+
+        Returns:
+            ESUKapatmaModel: Charge point delisting request model
+        """
+        cihaz = (
+            cihaz_bilgisi
+            if cihaz_bilgisi and isinstance(cihaz_bilgisi, ESUKapatmaModel)
+            else (
+                ESUKapatmaModel(
+                    firma_kodu=self._firma.firma_kodu,
+                    kapatma_bilgisi=ESUSeriNo(esu_seri_no=esu_seri_no),
+                )
+                if esu_seri_no
+                else None
+            )
+        )
+        if cihaz is None:
+            raise ValueError(
+                "`cihaz_bilgisi` ya da `esu_seri_no` "
+                "verilmemiş ya da verili değer geçersiz"
+            )
+        return cihaz
+
+    @staticmethod
+    def _seri_no(kayit: Mapping[str, str]) -> str:
+        """Internal method to get the serial number of a csv row for reporting.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Returns:
+            str: Serial number of the row, "-" when it is missing
+        """
+        return kayit.get("esu_seri_no") or "-"
+
+    def _gunluk_ac(
+        self, gunluk_dosya_yolu: Optional[str], devam_et: Optional[bool]
+    ) -> Optional[Journal]:
+        """Internal method to open the journal of a batch.
+
+        Args:
+            gunluk_dosya_yolu (Optional[str]): Journal file path
+            devam_et (Optional[bool]): Whether to resume from the journal
+
+        Returns:
+            Optional[Journal]: Journal of the batch, None when neither a path
+            is given nor resuming is requested
+        """
+        if not (gunluk_dosya_yolu or devam_et):
+            return None
+        gunluk = Journal(
+            gunluk_dosya_yolu or "gonderim_gunlugu.jsonl", resume=bool(devam_et)
+        )
+        if devam_et:
+            self.logger.info(
+                f"{gunluk.path} günlüğünden devam ediliyor, "
+                f"{len(gunluk)} tamamlanmış istek"
+            )
+        return gunluk
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _satir_takibi(
+        takip: Optional[_SatirTakibi] = None,
+    ) -> Iterator[_SatirTakibi]:
+        """Internal context manager tracking the processing of a batch row.
+
+        Args:
+            takip (Optional[_SatirTakibi], optional): Processing details of the
+            row's earlier stages to carry on with. Defaults to None.
+
+        Yields:
+            Iterator[_SatirTakibi]: Processing details of the row
+        """
+        takip = takip or _SatirTakibi()
+        token = _SATIR_TAKIBI.set(takip)
+        try:
+            yield takip
+        finally:
+            _SATIR_TAKIBI.reset(token)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _toplu_islemde(islem: _TopluIslem) -> Iterator[_TopluIslem]:
+        """Internal context manager running a part of a batch within its state.
+
+        Args:
+            islem (_TopluIslem): State of the batch
+
+        Yields:
+            Iterator[_TopluIslem]: State of the batch
+        """
+        token = _TOPLU_ISLEM.set(islem)
+        try:
+            yield islem
+        finally:
+            _TOPLU_ISLEM.reset(token)
+
+    @staticmethod
+    def _gunluk() -> Optional[Journal]:
+        """Internal method to get the journal of the batch in process.
+
+        Returns:
+            Optional[Journal]: Journal of the batch, None outside a batch or
+            when the batch has no journal
+        """
+        islem = _TOPLU_ISLEM.get()
+        return None if islem is None else islem.gunluk
+
+    @staticmethod
+    def _anlik_goruntu() -> Optional[SnapshotStore]:
+        """Internal method to get the snapshot of the batch in process.
+
+        Returns:
+            Optional[SnapshotStore]: Snapshot of the batch, None outside a batch
+            or when the batch has no snapshot
+        """
+        islem = _TOPLU_ISLEM.get()
+        return None if islem is None else islem.anlik_goruntu
+
+    @staticmethod
+    def _denemeyi_say() -> None:
+        """Internal method to count an http attempt of the batch row in process."""
+        takip = _SATIR_TAKIBI.get()
+        if takip is not None:
+            takip.deneme += 1
+
+    @staticmethod
+    def _reddi_kaydet(sonuc: Sonuc) -> None:
+        """Internal method to note a result rejected by GIB for the row in process.
+
+        Args:
+            sonuc (Sonuc): Rejected result
+        """
+        takip = _SATIR_TAKIBI.get()
+        if takip is not None:
+            takip.red = sonuc
+
+    @staticmethod
+    def _satir_sonucunu_tamamla(
+        kayit: Mapping[str, str], sonuc: SatirSonucu, takip: _SatirTakibi
+    ) -> None:
+        """Internal method to complete a row result with its processing details.
+
+        Rows rejected by GIB are marked as such, failed and rejected rows keep
+        their input columns so that they can be sent again.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            sonuc (SatirSonucu): Row result
+            takip (_SatirTakibi): Processing details of the row
+        """
+        sonuc.deneme = takip.deneme
+        if takip.red is not None:
+            sonuc.kod = takip.red.kod
+            if sonuc.durum == IslemDurumu.BASARILI:
+                sonuc.durum = IslemDurumu.REDDEDILDI
+                sonuc.hata = takip.red.mesaj
+        if sonuc.durum != IslemDurumu.BASARILI:
+            sonuc.girdi = dict(kayit)
+
+    def _asamayi_tamamla(
+        self,
+        satir: _AsamaliSatir,
+        asama_sayisi: int,
+        istek_tipleri: Tuple[_ISTEK_TIPI, ...],
+    ) -> bool:
+        """Internal method to decide what follows a completed stage of a batch row.
+
+        A row goes on to its next stage only when the completed one succeeded,
+        otherwise its result is completed and the service paths of the
+        remaining stages are listed as not sent.
+
+        Args:
+            satir (_AsamaliSatir): Batch row whose stage is completed
+            asama_sayisi (int): Number of stages of the row operation
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths of the stages
+
+        Returns:
+            bool: Whether the row goes on to its next stage
+        """
+        satir.asama = tamamlanan = satir.asama + 1
+        sonuc = satir.sonuc
+        basarili = sonuc.durum == IslemDurumu.BASARILI and satir.takip.red is None
+        if basarili and tamamlanan < asama_sayisi:
+            return True
+        if tamamlanan < asama_sayisi:
+            sonuc.gonderilmeyen_istekler = [
+                istek_tipi.value for istek_tipi in istek_tipleri[tamamlanan:]
+            ]
+        sonuc.sira = satir.sira + 1
+        sonuc.sure = satir.sure
+        self._satir_sonucunu_tamamla(satir.kayit, sonuc, satir.takip)
+        return False
+
+    def _hatali_sonuc(
+        self, istek_tipi: _ISTEK_TIPI, kayit: Mapping[str, str], hata: Exception
+    ) -> SatirSonucu:
+        """Internal method to build the result of a batch row that failed before
+        its first stage produced one.
+
+        Args:
+            istek_tipi (_ISTEK_TIPI): Service path of the first stage of the row
+            kayit (Mapping[str, str]): Row read from csv input
+            hata (Exception): Exception raised while processing the row
+
+        Returns:
+            SatirSonucu: Failed row result of the batch operation
+        """
+        seri_no = self._seri_no(kayit)
+        aciklama = self._satir_hatasi(kayit, hata)
+        if istek_tipi == self._ISTEK_TIPI.ESU_KAYIT:
+            return ESUTopluKayitSonucu(
+                esu_seri_no=seri_no,
+                esu_kayit_sonucu="",
+                mukellef_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=aciklama,
+            )
+        if istek_tipi == self._ISTEK_TIPI.ESU_GUNCELLEME:
+            return ESUTopluGuncellemeSonucu(
+                esu_seri_no=seri_no,
+                guncelleme_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=aciklama,
+            )
+        return ESUTopluKapatmaSonucu(
+            esu_seri_no=seri_no,
+            kapatma_sonucu="",
+            durum=IslemDurumu.HATALI,
+            hata=aciklama,
+        )
+
+    def _asama_hatasi(
+        self,
+        satir: _AsamaliSatir,
+        hata: Exception,
+        asama_sayisi: int,
+        istek_tipleri: Tuple[_ISTEK_TIPI, ...],
+    ) -> None:
+        """Internal method to fail a batch row whose stage raised an exception.
+
+        The row is completed like a row whose stage failed, so that it is
+        reported with its error rather than dropped from the batch result.
+
+        Args:
+            satir (_AsamaliSatir): Batch row whose stage raised
+            hata (Exception): Exception raised by the stage
+            asama_sayisi (int): Number of stages of the row operation
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths of the stages
+        """
+        if satir.sonuc is None:
+            satir.sonuc = self._hatali_sonuc(istek_tipleri[0], satir.kayit, hata)
+        else:
+            satir.sonuc.durum = IslemDurumu.HATALI
+            satir.sonuc.hata = self._satir_hatasi(satir.kayit, hata)
+        self._asamayi_tamamla(satir, asama_sayisi, istek_tipleri)
+
+    def _hatali_kayitlari_yaz(
+        self, dosya_yolu: str, sonuclar: List[SatirSonucu]
+    ) -> None:
+        """Internal method to write the input rows of failed batch rows as csv.
+
+        Args:
+            dosya_yolu (str): Output csv file path, written empty when no
+            row failed so that a previous run's rows are not sent again
+            sonuclar (List[SatirSonucu]): Row results
+        """
+        girdiler = [sonuc.girdi for sonuc in sonuclar if sonuc.girdi is not None]
+        PyUtils.write_csv(dosya_yolu, girdiler)
+        if girdiler:
+            self.logger.warning(
+                f"{len(girdiler)} hatalı kayıt {dosya_yolu} dosyasına yazıldı"
+            )
+
+    def _gunlukte_kabul_edilen(
+        self, kayit: Mapping[str, str], istek_tipi: _ISTEK_TIPI
+    ) -> Optional[Dict[str, Any]]:
+        """Internal method to get the journal entry of a batch row's request
+        accepted by GIB in a previous run.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipi (_ISTEK_TIPI): Service path
+
+        Returns:
+            Optional[Dict[str, Any]]: Journaled fields of the request, None when
+            it is yet to be sent or was rejected, to be sent again
+        """
+        gunluk = self._gunluk()
+        if gunluk is None:
+            return None
+        # requests of this run, e.g. of an earlier row with the same serial
+        # number, are sent again
+        kaydedilen = gunluk.loaded(self._seri_no(kayit), istek_tipi.value)
+        # entries journaled without a status are responses accepted by GIB
+        if (
+            kaydedilen is None
+            or kaydedilen.get("durum", Durum.SUCCESS.value) != Durum.SUCCESS.value
+        ):
+            return None
+        return kaydedilen
+
+    def _gunlukteki_sonuc(
+        self, kayit: Mapping[str, str], istek_tipi: _ISTEK_TIPI
+    ) -> Optional[Sonuc]:
+        """Internal method to get the journaled result of a batch row's request.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipi (_ISTEK_TIPI): Service path
+
+        Returns:
+            Optional[Sonuc]: Result of the request accepted by GIB in a previous
+            run, None when it is yet to be sent or was rejected
+        """
+        kaydedilen = self._gunlukte_kabul_edilen(kayit, istek_tipi)
+        if kaydedilen is None:
+            return None
+        return Sonuc(
+            esu_seri_no=self._seri_no(kayit),
+            sira_no=1,
+            kod=kaydedilen["kod"],
+            mesaj=kaydedilen["mesaj"],
+        )
+
+    def _gunluge_yaz(
+        self, kayit: Mapping[str, str], istek_tipi: _ISTEK_TIPI, yanit: Yanit
+    ) -> Sonuc:
+        """Internal method to journal the response of a batch row's request.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipi (_ISTEK_TIPI): Service path
+            yanit (Yanit): GIB ESU EKS service reponse
+
+        Returns:
+            Sonuc: Result of the request
+        """
+        sonuc = yanit.sonuc[0]
+        if yanit.durum != Durum.SUCCESS:
+            self._reddi_kaydet(sonuc)
+        gunluk = self._gunluk()
+        if gunluk is not None:
+            gunluk.record(
+                self._seri_no(kayit),
+                istek_tipi.value,
+                kod=sonuc.kod,
+                mesaj=sonuc.mesaj,
+                durum=yanit.durum.value,
+            )
+        return sonuc
+
+    def _gunlukte_tamamlandi(
+        self, kayit: Mapping[str, str], istek_tipleri: Tuple[_ISTEK_TIPI, ...]
+    ) -> bool:
+        """Internal method to check whether a batch row was completed before.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is
+            sent to
+
+        Returns:
+            bool: Whether all requests of the row are journaled as accepted by GIB
+        """
+        return all(
+            self._gunlukte_kabul_edilen(kayit, istek_tipi) is not None
+            for istek_tipi in istek_tipleri
+        )
+
+    def _guncelleme_degismedi(self, kayit: Mapping[str, str]) -> bool:
+        """Internal method to check whether an update row changed since it was
+        last accepted by GIB.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Returns:
+            bool: Whether the normalized update payload of the row matches the
+            snapshot, False for rows that cannot be turned into a payload
+        """
+        anlik_goruntu = self._anlik_goruntu()
+        if anlik_goruntu is None:
+            return False
+        try:
+            veri = self._guncelleme_bilgisi_hazirla(kayit)
+        except Exception:
+            return False  # reported when the row is processed
+        return anlik_goruntu.unchanged(
+            veri.guncelleme_istek_bilgileri.esu_seri_no,
+            SnapshotStore.digest(self._istek_govdesi(veri.guncelleme_istek_bilgileri)),
+        )
+
+    def _anlik_goruntuye_yaz(self, veri: ESUGuncellemeModel, yanit: Yanit) -> None:
+        """Internal method to record an update payload accepted by GIB.
+
+        Args:
+            veri (ESUGuncellemeModel): Charge point update request model
+            yanit (Yanit): GIB ESU EKS service reponse
+        """
+        anlik_goruntu = self._anlik_goruntu()
+        if anlik_goruntu is not None and yanit.durum == Durum.SUCCESS:
+            anlik_goruntu.update(
+                veri.guncelleme_istek_bilgileri.esu_seri_no,
+                SnapshotStore.digest(
+                    self._istek_govdesi(veri.guncelleme_istek_bilgileri)
+                ),
+            )
+
+    def _satir_hatasi(self, kayit: Mapping[str, str], hata: Exception) -> str:
+        """Internal method to log the error of a failed batch row.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            hata (Exception): Exception raised while processing the row
+
+        Returns:
+            str: Error description to report
+        """
+        aciklama = f"{type(hata).__name__}: {hata}"
+        self.logger.error(f"{self._seri_no(kayit)} kaydı işlenemedi: {aciklama}")
+        return aciklama
+
+    def _esu_bilgisi_hazirla(self, kayit: Mapping[str, str]) -> ESU:
+        """
+        Internal method to construct a charge point registration request model instance.
+
+        Rows repeating the socket, brand and model columns of a previous row
+        copy its validated model with their own serial number, sharing its
+        parsed socket models and strings.
+
+        Args:
+            kayit (Mapping[str, str]): Row to convert to an ESU instance.
+
+        Returns:
+            ESU: Constructed charge point registration request model instance.
+        """
+        anahtar = (
+            kayit["esu_soket_tipi"],
+            kayit["esu_soket_sayisi"],
+            kayit["esu_soket_detay"],
+            kayit["esu_markasi"],
+            kayit["esu_modeli"],
+        )
+        esu = self._ESU_SABLONLARI.get(anahtar, lambda: self._esu_olustur(kayit))
+        try:
+            seri_no = ESUSeriNo(esu_seri_no=kayit["esu_seri_no"]).esu_seri_no
+        except ValueError:
+            # the invalid row is built again for the error of the whole model
+            return self._esu_olustur(kayit)
+        return esu.model_copy(
+            update={
+                "esu_seri_no": seri_no,
+                "esu_soket_detay": list(esu.esu_soket_detay),
+            }
+        )
+
+    @staticmethod
+    def _esu_olustur(kayit: Mapping[str, str]) -> ESU:
+        """Internal function validating the charge point columns of a row.
+
+        Args:
+            kayit (Mapping[str, str]): Row to convert to an ESU instance
+
+        Returns:
+            ESU: Constructed charge point model instance
+        """
+        soket_detay = [
+            Soket(
+                soket_no=pair.split(":")[0],
+                soket_tip=cast(SoketTipi, pair.split(":")[1]),
+            )
+            for pair in kayit["esu_soket_detay"].split(";")
+        ]
+
+        return ESU(
+            esu_seri_no=kayit["esu_seri_no"],
+            esu_soket_tipi=cast(ESUTipi, kayit["esu_soket_tipi"]),
+            esu_soket_sayisi=kayit["esu_soket_sayisi"],
+            esu_soket_detay=soket_detay,
+            esu_markasi=kayit["esu_markasi"],
+            esu_modeli=kayit["esu_modeli"],
+        )
+
+    def _lokasyon_hazirla(self, kayit: Mapping[str, str]) -> Lokasyon:
+        """Internal method to construct the location model of a batch row,
+        shared by the rows with the same location columns.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Returns:
+            Lokasyon: Location model instance
+        """
+        anahtar = tuple(kayit.get(alan, _EKSIK) for alan in Lokasyon.model_fields)
+        return self._LOKASYONLAR.get(anahtar, lambda: Lokasyon(**kayit))
+
+    @classmethod
+    def ara_bellek_istatistikleri(cls) -> Dict[str, AraBellekIstatistigi]:
+        """Returns the hit statistics of the caches sharing the charge point
+        and location models across batch rows.
+
+        The caches are kept per process, the rows built in the processes of
+        the pre-validation pool are not counted.
+
+        Returns:
+            Dict[str, AraBellekIstatistigi]: Statistics per cache, `esu` and
+            `lokasyon`
+        """
+        bellekler: Dict[str, LRUCache[Any, Any]] = {
+            "esu": cls._ESU_SABLONLARI,
+            "lokasyon": cls._LOKASYONLAR,
+        }
+        return {
+            ad: AraBellekIstatistigi(
+                boyut=len(bellek), isabet=bellek.hits, iska=bellek.misses
+            )
+            for ad, bellek in bellekler.items()
+        }
+
+    def _kayit_bilgisi_hazirla(self, kayit: Mapping[str, str]) -> ESUKayitModel:
+        """Internal method to construct a charge point registration request model
+        instance from a batch row.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Returns:
+            ESUKayitModel: Constructed charge point registration request model
+        """
+        return ESUKayitModel.olustur(
+            firma=self._firma,
+            esu=self._esu_bilgisi_hazirla(kayit),
+            dogrulanmis=self._GUVENILIR_OLUSTURMA,
+        )
+
+    def _mukellef_bilgisi_hazirla(
+        self, kayit: Mapping[str, str], esu: Union[ESU, str]
+    ) -> ESUMukellefModel:
+        """Internal method to construct a tax payer registration request model instance.
+
+        Args:
+            kayit (Mapping[str, str]): Row to convert to an ESUMukellefModel instance
+            esu (Union[ESU, str]): Charge point model instance, or its validated
+            serial number
+
+        Returns:
+            ESUMukellefModel: Constructed tax payer registration request model instance.
+        """
+        lokasyon = self._lokasyon_hazirla(kayit)
+        if kayit.get("mukellef_vkn") and kayit.get("mukellef_unvan"):
+            mukellef = Mukellef(**kayit)
+        else:
+            mukellef = Mukellef(
+                mukellef_vkn=self._firma.firma_vkn,
+                mukellef_unvan=self._firma.firma_unvan,
+            )
+        fatura = (
+            Fatura(**kayit) if not kayit.get("mulkiyet_sahibi_vkn_tckn") else Fatura()
+        )
+        sertifika = Sertifika(**kayit) if kayit.get("sertifika_no") else Sertifika()
+        mulkiyet = (
+            MulkiyetSahibi(**kayit)
+            if not kayit.get("fatura_ettn")
+            else MulkiyetSahibi()
+        )
+
+        return ESUMukellefModel.olustur(
+            esu_seri_no=esu.esu_seri_no if isinstance(esu, ESU) else esu,
+            firma_kodu=self._firma.firma_kodu,
+            fatura=fatura,
+            lokasyon=lokasyon,
+            mukellef=mukellef,
+            mulkiyet_sahibi=mulkiyet,
+            sertifika=sertifika,
+            dogrulanmis=self._GUVENILIR_OLUSTURMA,
+        )
+
+    def _guncelleme_bilgisi_hazirla(
+        self, kayit: Mapping[str, str]
+    ) -> ESUGuncellemeModel:
+        """Internal method to construct a charge point update request model instance.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Returns:
+            ESUGuncellemeModel: Constructed charge point update request model instance.
+        """
+        return self._guncelleme_modeli_hazirla(
+            esu_seri_no=kayit["esu_seri_no"],
+            lokasyon=self._lokasyon_hazirla(kayit),
+            fatura=(
+                Fatura(**kayit)
+                if not kayit.get("mulkiyet_sahibi_vkn_tckn")
+                else Fatura()
+            ),
+            sertifika=Sertifika(**kayit) if kayit.get("sertifika_no") else Sertifika(),
+            mulkiyet_sahibi=(
+                MulkiyetSahibi(**kayit)
+                if not kayit.get("fatura_ettn")
+                else MulkiyetSahibi()
+            ),
+            dogrulanmis=self._GUVENILIR_OLUSTURMA,
+        )
+
+    def _istek_modellerini_hazirla(
+        self, kayit: Mapping[str, str], istek_tipleri: Tuple[_ISTEK_TIPI, ...]
+    ) -> Dict[_ISTEK_TIPI, BaseModel]:
+        """Internal method to build the request models of a batch row.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths the row is sent to
+
+        Returns:
+            Dict[_ISTEK_TIPI, BaseModel]: Request models per service path
+        """
+        modeller: Dict[BaseESUServis._ISTEK_TIPI, BaseModel] = {}
+        for istek_tipi in istek_tipleri:
+            if istek_tipi == self._ISTEK_TIPI.ESU_KAYIT:
+                modeller[istek_tipi] = self._kayit_bilgisi_hazirla(kayit)
+            elif istek_tipi == self._ISTEK_TIPI.ESU_MUKELLEF:
+                cihaz = modeller.get(self._ISTEK_TIPI.ESU_KAYIT)
+                modeller[istek_tipi] = self._mukellef_bilgisi_hazirla(
+                    kayit,
+                    (
+                        cihaz.kayit_bilgisi
+                        if isinstance(cihaz, ESUKayitModel)
+                        else self._esu_bilgisi_hazirla(kayit)
+                    ),
+                )
+            elif istek_tipi == self._ISTEK_TIPI.ESU_GUNCELLEME:
+                modeller[istek_tipi] = self._guncelleme_bilgisi_hazirla(kayit)
+            else:
+                modeller[istek_tipi] = self._kapatma_modeli_hazirla(
+                    esu_seri_no=kayit.get("esu_seri_no")
+                )
+        return modeller
+
+    @staticmethod
+    def _satiri_dogrula(
+        firma: Firma,
+        istek_tipleri: Tuple[_ISTEK_TIPI, ...],
+        sira_kayit: Tuple[int, Mapping[str, str]],
+    ) -> Union[Dict[_ISTEK_TIPI, BaseModel], DogrulamaHatasi]:
+        """Internal function validating a batch row in a pre-validation process.
+
+        Args:
+            firma (Firma): Company information
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths the row is sent to
+            sira_kayit (Tuple[int, Mapping[str, str]]): Row number and row
+
+        Returns:
+            Union[Dict[_ISTEK_TIPI, BaseModel], DogrulamaHatasi]: Request models
+            per service path, or the validation error of the row
+        """
+        sira, kayit = sira_kayit
+        # the request model builders only need the company information
+        hazirlayici = BaseESUServis.__new__(BaseESUServis)
+        hazirlayici._firma = firma
+        try:
+            return hazirlayici._istek_modellerini_hazirla(kayit, istek_tipleri)
+        except Exception as hata:
+            return DogrulamaHatasi(
+                sira=sira,
+                esu_seri_no=BaseESUServis._seri_no(kayit),
+                hata=f"{type(hata).__name__}: {hata}",
+            )
+
+    def _on_dogrula(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        istek_tipleri: Tuple[_ISTEK_TIPI, ...],
+        islem: _TopluIslem,
+    ) -> Tuple[List[Mapping[str, str]], DogrulamaSonucu]:
+        """Internal method to validate the whole batch input before sending.
+
+        Rows are validated column-wise, then the request models of the valid
+        rows are built across a process pool and kept in the state of the
+        batch, so that they are not built again while sending.
+
+        Args:
+            kayitlar (Iterable[Mapping[str, str]]): Row source
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            islem (_TopluIslem): State of the batch, receiving the request models
+
+        Returns:
+            Tuple[List[Mapping[str, str]], DogrulamaSonucu]: Rows read from the
+            source and the pre-validation result
+        """
+        satirlar = list(kayitlar)
+        # rows are validated column-wise, the request models of the valid rows
+        # are then built across a process pool
+        sutunlu = sutunlari_dogrula(
+            sutunlara_ayir(satirlar),
+            [self._ISTEK_MODELLERI[istek_tipi] for istek_tipi in istek_tipleri],
+        )
+        hatalar = [
+            DogrulamaHatasi(
+                sira=sira + 1,
+                esu_seri_no=self._seri_no(satirlar[sira]),
+                hata="; ".join(sutunlu.mesajlar(sira)),
+            )
+            for sira in sutunlu.hatali_satirlar
+        ]
+        gecerliler = [
+            (sira, kayit)
+            for sira, kayit in enumerate(satirlar, start=1)
+            if not sutunlu.hatalar[sira - 1]
+        ]
+        islem_sayisi = min(
+            os.cpu_count() or 1,
+            -(-len(gecerliler) // self._DOGRULAMA_ISLEM_BASINA_SATIR),
+        )
+        self.logger.info(
+            f"{len(satirlar)} kayıt doğrulandı, {len(gecerliler)} geçerli kaydın "
+            f"istek modelleri {max(islem_sayisi, 1)} işlemle hazırlanıyor"
+        )
+        hazir: Dict[str, Dict[BaseESUServis._ISTEK_TIPI, BaseModel]] = {}
+        tekrarlananlar = set()
+        sonuclar = process_map(
+            functools.partial(self._satiri_dogrula, self._firma, istek_tipleri),
+            gecerliler,
+            workers=max(islem_sayisi, 1),
+        )
+        for (_, kayit), sonuc in zip(gecerliler, sonuclar):
+            if isinstance(sonuc, DogrulamaHatasi):
+                hatalar.append(sonuc)
+                continue
+            seri_no = kayit["esu_seri_no"]
+            if seri_no in hazir:
+                tekrarlananlar.add(seri_no)
+            hazir[seri_no] = sonuc
+        for seri_no in tekrarlananlar:
+            del hazir[seri_no]  # rows sharing a serial number are built as sent
+        islem.hazir_istekler = hazir
+
+        hatalar.sort(key=lambda hata: hata.sira)
+        dogrulama = DogrulamaSonucu(toplam=len(satirlar), hatalar=hatalar)
+        if hatalar:
+            oran = dogrulama.hata_orani * 100
+            self.logger.warning(f"{len(hatalar)} kayıt doğrulanamadı (%{oran:.1f})")
+        return satirlar, dogrulama
+
+    def _kuru_calistir(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        istek_tipleri: Tuple[_ISTEK_TIPI, ...],
+        cikti_dosya_yolu: Optional[str] = None,
+    ) -> KuruCalistirmaSonucu:
+        """Internal method to build the request payloads of a batch without sending.
+
+        Every row is written as a json line holding its request bodies, byte
+        for byte as they would be sent, and the time spent on reading, building
+        and serializing them. Invalid rows are written with their errors.
+
+        Args:
+            kayitlar (Iterable[Mapping[str, str]]): Row source
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            cikti_dosya_yolu (Optional[str], optional): Output file path.
+            Defaults to None ("kuru_calistirma.jsonl").
+
+        Returns:
+            KuruCalistirmaSonucu: Dry run result
+        """
+        yol = cikti_dosya_yolu or "kuru_calistirma.jsonl"
+        self.logger.info(f"Kuru çalıştırma, istekler {yol} dosyasına yazılıyor")
+        sonuc = KuruCalistirmaSonucu(toplam=0, cikti_dosya_yolu=yol)
+        baslangic = time.perf_counter()
+        with JsonLinesWriter(yol) as cikti:
+            satirlar = iter(kayitlar)
+            while True:
+                t0 = time.perf_counter()
+                kayit = next(satirlar, None)
+                t1 = time.perf_counter()
+                if kayit is None:
+                    break
+                sonuc.toplam += 1
+                satir: Dict[str, Any] = {
+                    "sira": sonuc.toplam,
+                    "esu_seri_no": self._seri_no(kayit),
+                }
+                try:
+                    modeller = self._istek_modellerini_hazirla(kayit, istek_tipleri)
+                except Exception as hata:
+                    hata_satiri = DogrulamaHatasi(
+                        **satir, hata=f"{type(hata).__name__}: {hata}"
+                    )
+                    sonuc.hatalar.append(hata_satiri)
+                    cikti.write(self._istek_govdesi(hata_satiri))
+                    continue
+                t2 = time.perf_counter()
+                govdeler = b",".join(
+                    json.dumps(istek_tipi.value).encode()
+                    + b":"
+                    + self._istek_govdesi(veri)
+                    for istek_tipi, veri in modeller.items()
+                )
+                t3 = time.perf_counter()
+                satir["sure"] = {
+                    "okuma": t1 - t0,
+                    "dogrulama": t2 - t1,
+                    "serilestirme": t3 - t2,
+                }
+                sonuc.okuma_suresi += t1 - t0
+                sonuc.dogrulama_suresi += t2 - t1
+                sonuc.serilestirme_suresi += t3 - t2
+                # request bodies are embedded as they are, without parsing again
+                cikti.write(
+                    json.dumps(satir, ensure_ascii=False).encode()[:-1]
+                    + b',"istekler":{'
+                    + govdeler
+                    + b"}}"
+                )
+            sonuc.toplam_sure = time.perf_counter() - baslangic
+            self._rapor_ozeti_yaz(cikti, sonuc.model_dump(exclude={"hatalar"}))
+        self.logger.info(
+            f"{sonuc.toplam} kaydın {len(sonuc.hatalar)} tanesi hatalı, "
+            f"toplam süre {sonuc.toplam_sure:.3f} sn"
+        )
+        return sonuc
+
+    def _istek_modeli(
+        self,
+        kayit: Mapping[str, str],
+        istek_tipi: _ISTEK_TIPI,
+        hazirla: Callable[[], M],
+    ) -> M:
+        """Internal method to get a request model of a batch row.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+            istek_tipi (_ISTEK_TIPI): Service path
+            hazirla (Callable[[], M]): Builds the request model when it is not
+            built by the pre-validation
+
+        Returns:
+            M: Request model
+        """
+        islem = _TOPLU_ISLEM.get()
+        if islem is not None and islem.hazir_istekler is not None:
+            modeller = islem.hazir_istekler.get(kayit.get("esu_seri_no") or "")
+            if modeller is not None and istek_tipi in modeller:
+                return cast(M, modeller[istek_tipi])
+        return hazirla()
+
+    def _dogrulama_esigi_asildi(
+        self,
+        dogrulama: Optional[DogrulamaSonucu],
+        azami_hata_orani: Optional[float],
+    ) -> bool:
+        """Internal method to check the error rate of the pre-validation.
+
+        Args:
+            dogrulama (Optional[DogrulamaSonucu]): Pre-validation result
+            azami_hata_orani (Optional[float]): Maximum ratio of invalid rows
+
+        Returns:
+            bool: Whether the batch should not be sent
+        """
+        if dogrulama is None or azami_hata_orani is None:
+            return False
+        if dogrulama.hata_orani <= azami_hata_orani:
+            return False
+        self.logger.error(
+            f"Hatalı kayıt oranı (%{dogrulama.hata_orani * 100:.1f}) azami orandan "
+            f"(%{azami_hata_orani * 100:.1f}) yüksek olduğu için gönderim başlatılmadı"
+        )
+        return True
+
+    def _dogrulama_sonucunu_isle(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        dogrulama: Optional[DogrulamaSonucu],
+        azami_hata_orani: Optional[float],
+        rapor: Optional[JsonLinesWriter],
+    ) -> Optional[Dict[str, Any]]:
+        """Internal method to report the pre-validation and to gate the batch.
+
+        Args:
+            kayitlar (Iterable[Mapping[str, str]]): Rows of the batch
+            dogrulama (Optional[DogrulamaSonucu]): Pre-validation result
+            azami_hata_orani (Optional[float]): Maximum ratio of invalid rows
+            rapor (Optional[JsonLinesWriter]): Streaming report
+
+        Returns:
+            Optional[Dict[str, Any]]: Fields of the batch result when the batch
+            is not to be sent, None otherwise
+        """
+        if dogrulama is None:
+            return None
+        if rapor is not None:
+            rapor.write(
+                json.dumps(
+                    {"dogrulama": dogrulama.model_dump()}, ensure_ascii=False
+                ).encode()
+            )
+        if not self._dogrulama_esigi_asildi(dogrulama, azami_hata_orani):
+            return None
+        alanlar: Dict[str, Any] = {
+            "sonuclar": [],
+            "toplam": 0,
+            "gonderilmeyenler": [self._seri_no(kayit) for kayit in kayitlar],
+        }
+        if rapor is not None:
+            self._rapor_ozeti_yaz(rapor, alanlar)
+            rapor.close()
+        return alanlar
+
+    @staticmethod
+    def _azami_hata_oranini_denetle(azami_hata_orani: Optional[float]) -> None:
+        """Internal method to validate the maximum error rate of a batch.
+
+        Args:
+            azami_hata_orani (Optional[float]): Maximum ratio of invalid rows
+
+        Raises:
+            ValueError: When the ratio is not between 0 and 1
+        """
+        if azami_hata_orani is not None and not 0 <= azami_hata_orani <= 1:
+            raise ValueError("`azami_hata_orani` 0 ile 1 arasında olmalıdır")
+
+    @staticmethod
+    def _oncu_kayit_sayisini_denetle(oncu_kayit_sayisi: Optional[int]) -> None:
+        """Internal method to validate the number of canary rows of a batch.
+
+        Args:
+            oncu_kayit_sayisi (Optional[int]): Number of canary rows
+
+        Raises:
+            ValueError: When the number is negative
+        """
+        if oncu_kayit_sayisi is not None and oncu_kayit_sayisi < 0:
+            raise ValueError("`oncu_kayit_sayisi` negatif olamaz")
+
+    def _sistemik_hata(self, satir: _AsamaliSatir) -> Optional[Tuple[str, str]]:
+        """Internal method to tell the failure of a canary row which may be
+        systemic, i.e. shared by every row of the batch.
+
+        Args:
+            satir (_AsamaliSatir): Canary row sent to GIB
+
+        Returns:
+            Optional[Tuple[str, str]]: HTTP 401/403 or the result code GIB
+            rejected the row with, and the description of the failure, None
+            when the row succeeded or failed locally
+        """
+        sonuc: SatirSonucu = satir.sonuc
+        if sonuc.durum == IslemDurumu.BASARILI:
+            return None
+        if satir.takip.durum_kodu in self._SISTEMIK_DURUM_KODLARI:
+            return f"HTTP {satir.takip.durum_kodu}", f"HTTP {satir.takip.durum_kodu}"
+        if sonuc.durum == IslemDurumu.REDDEDILDI and sonuc.kod:
+            return sonuc.kod, f"[{sonuc.kod}] {sonuc.hata}"
+        return None
+
+    def _oncu_gonderimi_degerlendir(
+        self, satirlar: List[_AsamaliSatir]
+    ) -> Optional[str]:
+        """Internal method to look for a systemic failure in the canary rows.
+
+        A misconfiguration, e.g. wrong credentials, firm code, test tax number
+        on the production url or an outdated payload schema, fails every row
+        alike, so the batch is stopped when the circuit breaker opens during
+        the canary rows, when all of them fail with HTTP 401/403 or are
+        rejected by GIB with the same result code, or when any of them is
+        rejected with a result code listed in the `sistemik_kodlar` of the
+        circuit breaker settings. Rows rejected for reasons of their own, i.e.
+        with differing result codes, do not stop the batch.
+
+        Args:
+            satirlar (List[_AsamaliSatir]): Canary rows sent to GIB
+
+        Returns:
+            Optional[str]: Reason to stop the batch, None when it may go on
+        """
+        sistemik_kodlar = self._devre_kesici_ayari.sistemik_kodlar
+        listelenen = next(
+            (
+                satir.sonuc
+                for satir in satirlar
+                if satir.sonuc.durum != IslemDurumu.BASARILI
+                and satir.sonuc.kod in sistemik_kodlar
+            ),
+            None,
+        )
+        hatalar = [self._sistemik_hata(satir) for satir in satirlar]
+        kodlar = {None if hata is None else hata[0] for hata in hatalar}
+        if self._devre_kesici.state == CircuitBreaker.OPEN:
+            neden = "Öncü gönderim sırasında devre kesici açıldı"
+        elif listelenen is not None:
+            neden = (
+                "Öncü gönderimde sistemik hata kodu görüldü: "
+                f"[{listelenen.kod}] {listelenen.hata}"
+            )
+        elif len(kodlar) == 1 and hatalar[0] is not None:
+            neden = (
+                f"Öncü gönderimdeki {len(satirlar)} kaydın tümünde aynı hata "
+                f"görüldü: {hatalar[0][1]}"
+            )
+        else:
+            return None
+        self.logger.error(f"Gönderim durduruldu. {neden}")
+        return neden
+
+    def _giris_kaynagi(
+        self,
+        giris_dosya_yolu: Optional[str] = None,
+        csv_string: Optional[io.StringIO] = None,
+    ) -> Union[str, io.StringIO]:
+        """Internal method to resolve the csv input of batch methods.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+
+        Raises:
+            FileNotFoundError: When no input is given and there is no
+            "envanter.csv" file in the working directory
+
+        Returns:
+            Union[str, io.StringIO]: Csv file path or string stream to read from
+        """
+        working_dir = os.getcwd()
+        csv_path = os.path.join(working_dir, "envanter.csv")
+
+        if not giris_dosya_yolu and not csv_string and not os.path.exists(csv_path):
+            raise FileNotFoundError(
+                f"{working_dir} dizininde envanter.csv dosyası bulunamadı"
+            )
+        return giris_dosya_yolu or csv_string or csv_path
+
+    def _csv_satirlari(
+        self,
+        giris_dosya_yolu: Optional[str] = None,
+        csv_string: Optional[io.StringIO] = None,
+    ) -> Iterator[Mapping[str, str]]:
+        """Internal method to read the rows of the csv input of batch methods.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+
+        Returns:
+            Iterator[Mapping[str, str]]: Rows of the csv input, read lazily
+        """
+        giris = self._giris_kaynagi(giris_dosya_yolu, csv_string)
+        kaynak = giris if isinstance(giris, str) else "csv_string"
+        self.logger.info(f"{kaynak} giriş dosyası okunuyor")
+        return PyUtils.iter_csv(giris)
+
+    @contextlib.contextmanager
+    def _toplu_islem_baglami(
+        self,
+        istekleri_logla: Optional[bool] = None,
+        anlik_goruntu_dosya_yolu: Optional[str] = None,
+    ) -> Iterator[_TopluIslem]:
+        """Internal context manager around a batch, shared by the batch methods.
+
+        The calling thread or task runs within the state of the batch, which
+        the worker threads of the batch have to enter by `_toplu_islemde`.
+
+        Args:
+            istekleri_logla (Optional[bool], optional):
+                Boolean flag to log api requests to console. Defaults to None.
+            anlik_goruntu_dosya_yolu (Optional[str], optional):
+                Snapshot file path, loaded on entry and saved on exit.
+                Defaults to None.
+
+        Yields:
+            Iterator[_TopluIslem]: State of the batch
+        """
+        if istekleri_logla:
+            self.logger.setLevel(logging.DEBUG)
+        islem = _TopluIslem(
+            SnapshotStore(anlik_goruntu_dosya_yolu)
+            if anlik_goruntu_dosya_yolu
+            else None
+        )
+        try:
+            with self._toplu_islemde(islem):
+                yield islem
+        finally:
+            if islem.anlik_goruntu is not None:
+                islem.anlik_goruntu.save()
+            # conditionally restore default logging level
+            if istekleri_logla:
+                self.logger.setLevel(logging.INFO)
+
+    @staticmethod
+    def _rapor_ac(cikti_dosya_yolu: Optional[str]) -> Optional[JsonLinesWriter]:
+        """Internal method to open the streaming report of a batch.
+
+        Args:
+            cikti_dosya_yolu (Optional[str]): Output file path
+
+        Returns:
+            Optional[JsonLinesWriter]: Streaming report for ".jsonl" and
+            ".jsonl.gz" paths, None for other paths which receive the whole
+            report as pretty printed json at the end of the batch
+        """
+        yol = cikti_dosya_yolu or "gonderim_raporu.jsonl"
+        if not yol.endswith((".jsonl", ".jsonl.gz")):
+            return None
+        return JsonLinesWriter(yol)
+
+    @staticmethod
+    def _rapor_ozeti_yaz(rapor: JsonLinesWriter, alanlar: Dict[str, Any]) -> None:
+        """Internal method to write the summary line closing a streaming report.
+
+        Args:
+            rapor (JsonLinesWriter): Streaming report
+            alanlar (Dict[str, Any]): Fields of the batch result
+        """
+        ozet = {alan: deger for alan, deger in alanlar.items() if alan != "sonuclar"}
+        rapor.write(json.dumps({"ozet": ozet}, ensure_ascii=False).encode())
+
+    def _dosyaya_yaz(self, cikti_dosya_yolu: str, icerik: str) -> None:
+        """Internal method to write the batch processing results to a file.
+
+        Args:
+            cikti_dosya_yolu (str): Output file path
+            icerik (str): Data to write to the output file
+        """
+        with open(cikti_dosya_yolu, "w") as f:
+            f.write(icerik)
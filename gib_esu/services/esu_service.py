@@ -1,136 +1,234 @@
-import base64
-import concurrent.futures
 import io
-import json
-import logging
-import os
-from enum import Enum
-from typing import Any, Dict, Optional, Union, cast
+import time
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import requests
-from dotenv import dotenv_values
-from pydantic import HttpUrl
-
-from gib_esu.helpers.py_utils import PyUtils
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from gib_esu.helpers.circuit_breaker import CircuitOpenError
+from gib_esu.helpers.dispatcher import pipeline
+from gib_esu.helpers.journal import Journal
+from gib_esu.helpers.jsonl_writer import JsonLinesWriter
+from gib_esu.helpers.result_collector import ResultCollector
+from gib_esu.helpers.retry import RetryBudget
 from gib_esu.models.request_models import (
     ESU,
     ESUGuncellemeModel,
     ESUKapatmaModel,
     ESUKayitModel,
     ESUMukellefModel,
-    ESUSeriNo,
     Fatura,
-    Firma,
     Lokasyon,
     Mukellef,
     MulkiyetSahibi,
     Sertifika,
-    Soket,
 )
 from gib_esu.models.response_models import Yanit
 from gib_esu.models.service_models import (
-    APIParametreleri,
-    ESUServisKonfigurasyonu,
+    DevreKesici,
+    DogrulamaSonucu,
     ESUTopluGuncellemeSonucu,
+    ESUTopluKapatmaSonucu,
     ESUTopluKayitSonucu,
-    EvetVeyaHayir,
+    EszamanlilikAyari,
+    IslemDurumu,
+    SatirSonucu,
     TopluGuncellemeSonuc,
+    TopluIslemSonucu,
+    TopluKapatmaSonuc,
     TopluKayitSonuc,
+    YenidenDenemePolitikasi,
+    ZamanAsimi,
 )
+from gib_esu.services.base_service import BaseESUServis, _AsamaliSatir, _TopluIslem
 
+R = TypeVar("R", bound=SatirSonucu)
 
-class ESUServis:
-    """Class that handles GIB ESU EKS service operations."""
-
-    # name of the default environment file to read the configuration
-    _DEFAULT_ENV = ".env"
-
-    class _API(str, Enum):
-        """Enum for available GIB ESU EKS service base urls."""
-
-        PROD = "https://okc.gib.gov.tr/api/v1/okc/okcesu"
-        TEST = "https://okctest.gib.gov.tr/api/v1/okc/okcesu"
-
-    class _ISTEK_TIPI(str, Enum):
-        """Enum for available GIB ESU EKS service paths."""
 
-        ESU_KAYIT = "/yeniEsuKayit"
-        ESU_MUKELLEF = "/esuMukellefDurum"
-        ESU_GUNCELLEME = "/esuGuncelleme"
-        ESU_KAPATMA = "/esuKapatma"
+class ESUServis(BaseESUServis):
+    """Class that handles GIB ESU EKS service operations."""
 
-    def __init__(self, _config: Optional[Dict[str, str | None]] = None) -> None:
+    def __init__(
+        self,
+        _config: Optional[Dict[str, str | None]] = None,
+        baglanti_havuzu_boyutu: Optional[int] = None,
+        hiz_limitleri: Optional[Union[float, Mapping[str, float]]] = None,
+        hiz_limitini_paylas: bool = False,
+        yeniden_deneme: Optional[
+            Union[YenidenDenemePolitikasi, Mapping[str, YenidenDenemePolitikasi]]
+        ] = None,
+        zaman_asimi: Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]] = None,
+        devre_kesici: Optional[DevreKesici] = None,
+        eszamanlilik: Optional[EszamanlilikAyari] = None,
+    ) -> None:
         """ESUServis constructor.
 
         Args:
             _config (Optional[Dict[str, str  |  None]], optional):
             Dictionary or env file path to read the config from. Defaults to None.
+            baglanti_havuzu_boyutu (Optional[int], optional):
+            Number of keep-alive connections kept open to the GIB host, parallel
+            batches run at this fixed concurrency when `eszamanlilik` is not
+            given. Defaults to None (`azami` of the concurrency settings).
+            hiz_limitleri (Optional[Union[float, Mapping[str, float]]], optional):
+            Maximum requests per second, either for all service paths or per
+            service path (e.g. `{"/yeniEsuKayit": 5}`). Defaults to None (no limit).
+            hiz_limitini_paylas (bool, optional): Whether to share the rate limits
+            with all service instances of the same company in the process.
+            Defaults to False.
+            yeniden_deneme (Optional[Union[YenidenDenemePolitikasi,
+            Mapping[str, YenidenDenemePolitikasi]]], optional):
+            Retry policy for all service paths or per service path.
+            Defaults to None (`_VARSAYILAN_YENIDEN_DENEME`).
+            zaman_asimi (Optional[Union[ZamanAsimi, Mapping[str, ZamanAsimi]]],
+            optional): Connect and read timeouts for all service paths or per
+            service path. Defaults to None (`ZamanAsimi()`).
+            devre_kesici (Optional[DevreKesici], optional): Circuit breaker
+            settings. Defaults to None (`DevreKesici()`).
+            eszamanlilik (Optional[EszamanlilikAyari], optional): Adaptive
+            concurrency settings of parallel batches. Defaults to None
+            (`EszamanlilikAyari()`, unless `baglanti_havuzu_boyutu` is given).
         """
-        _cfg = dotenv_values(ESUServis._DEFAULT_ENV) if _config is None else _config
-        config = ESUServisKonfigurasyonu.model_validate(_cfg)
-        self._api = APIParametreleri(
-            api_sifre=str(config.GIB_API_SIFRE),
-            prod_api=config.PROD_API == EvetVeyaHayir.EVET,
-            ssl_dogrulama=str(config.SSL_DOGRULAMA) == EvetVeyaHayir.EVET,
-            test_firma=config.TEST_FIRMA_KULLAN == EvetVeyaHayir.EVET,
-            test_firma_vkn=config.GIB_TEST_FIRMA_VKN,
-        )
-        self._firma = Firma(
-            firma_kodu=config.GIB_FIRMA_KODU,
-            firma_vkn=(
-                config.FIRMA_VKN
-                if not self._api.test_firma
-                else self._api.test_firma_vkn
-            ),
-            firma_unvan=config.FIRMA_UNVAN,
-            epdk_lisans_no=config.EPDK_LISANS_KODU,
-        )
-        self._api.api_url = (
-            cast(HttpUrl, ESUServis._API.PROD.value)
-            if self._api.prod_api
-            else cast(HttpUrl, ESUServis._API.TEST.value)
+        super().__init__(
+            _config,
+            hiz_limitleri,
+            hiz_limitini_paylas,
+            yeniden_deneme,
+            zaman_asimi,
+            devre_kesici,
         )
-        # no ssl warnings will be displayed when `ssl_dogrulama` is set to `0` (False)
-        if not self._api.ssl_dogrulama:
-            import urllib3
-            from urllib3.exceptions import InsecureRequestWarning
-
-            urllib3.disable_warnings(InsecureRequestWarning)
-
-        # configure logging
-        self.logger = logging.getLogger(self.__class__.__name__)
-        handler = logging.StreamHandler()  # console logger
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+        if baglanti_havuzu_boyutu is not None and baglanti_havuzu_boyutu < 1:
+            raise ValueError("`baglanti_havuzu_boyutu` en az 1 olmalıdır")
+        self._eszamanlilik = self._eszamanlilik_ayari(
+            eszamanlilik, baglanti_havuzu_boyutu
         )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
+
+        # long-lived http session with a keep-alive connection pool
+        havuz_boyutu = baglanti_havuzu_boyutu or self._eszamanlilik.azami
+        self._havuz_boyutu = havuz_boyutu
+        self._oturum = requests.Session()
+        for onek in ("https://", "http://"):
+            self._oturum.mount(
+                onek, HTTPAdapter(pool_connections=1, pool_maxsize=havuz_boyutu)
+            )
+        self._oturum.verify = self._api.ssl_dogrulama
+
+    def __enter__(self) -> "ESUServis":
+        """Enters the runtime context, returning the service instance itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exits the runtime context, closing the underlying http session."""
+        self.kapat()
+
+    def kapat(self) -> None:
+        """Closes the http session along with its pooled connections."""
+        self._oturum.close()
 
     def _api_isteği(
-        self, data: Any, istek_tipi: _ISTEK_TIPI = _ISTEK_TIPI.ESU_KAYIT
+        self,
+        govde: bytes,
+        istek_tipi: BaseESUServis._ISTEK_TIPI = BaseESUServis._ISTEK_TIPI.ESU_KAYIT,
     ) -> Yanit:
         """Internal method to perform API requests.
 
+        Args:
+            govde (bytes): Serialized request body
+            istek_tipi (_ISTEK_TIPI, optional): Service path. Defaults to ESU_KAYIT.
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
         Returns:
             Yanit: GIB ESU EKS service reponse
         """
+        hiz_siniri = self._hiz_siniri(istek_tipi)
+        zaman_asimi = self._zaman_asimlari[istek_tipi]
+        deneme = 0
+        while True:
+            deneme += 1
+            self._denemeyi_say()
+            self._devreyi_denetle(istek_tipi)
+            if hiz_siniri is not None:
+                hiz_siniri.acquire()
+            try:
+                response = self._oturum.post(
+                    url=self._istek_url(istek_tipi),
+                    headers=self._basliklar,
+                    data=govde,
+                    timeout=(zaman_asimi.baglanti, zaman_asimi.okuma),
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as hata:
+                self._devre_kesici.record_failure()
+                bekleme = self._yeniden_deneme_beklemesi(
+                    istek_tipi, deneme, self._istek_gonderilmedi(hata)
+                )
+                if bekleme is None:
+                    raise
+                self.logger.warning(
+                    f"{istek_tipi.value} isteği başarısız ({hata!r}), "
+                    f"{bekleme:.2f} sn sonra yeniden denenecek"
+                )
+                time.sleep(bekleme)
+                continue
+
+            sistemik = self._durum_kodunu_bildir(response.status_code)
+            islenmedi = self._durum_kodu_islenmedi(istek_tipi, response.status_code)
+            if islenmedi is not None:
+                bekleme = self._yeniden_deneme_beklemesi(
+                    istek_tipi, deneme, islenmedi, response.headers.get("Retry-After")
+                )
+                if bekleme is not None:
+                    self.logger.warning(
+                        f"{istek_tipi.value} isteği HTTP {response.status_code} "
+                        f"döndü, {bekleme:.2f} sn sonra yeniden denenecek"
+                    )
+                    time.sleep(bekleme)
+                    continue
+            yanit = self._yaniti_coz(response.content)
+            return yanit if sistemik else self._yaniti_bildir(yanit)
+
+    @staticmethod
+    def _istek_gonderilmedi(hata: Exception) -> bool:
+        """Internal method to check whether a failed request never reached GIB.
 
-        # construct basic auth header
-        token = f"{self._firma.firma_kodu}:{self._api.api_sifre}".encode("utf-8")
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Basic {base64.b64encode(token).decode('utf-8')}",
-        }
-
-        url = f"{str(self._api.api_url)}{istek_tipi.value}"
-        response = requests.post(
-            url=url,
-            headers=headers,
-            json=data,
-            verify=self._api.ssl_dogrulama,
-        )
-        return Yanit.model_validate_json(json_data=json.dumps(response.json()))
+        Args:
+            hata (Exception): Exception raised while sending the request
+
+        Returns:
+            bool: True when the connection could not be established
+        """
+        if isinstance(hata, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(hata, requests.exceptions.ConnectionError) and hata.args:
+            neden = getattr(hata.args[0], "reason", hata.args[0])
+            return isinstance(neden, NewConnectionError)
+        return False
 
     def cihaz_kayit(self, cihaz_bilgileri: Union[ESUKayitModel, ESU]) -> Yanit:
         """Registers a charge point with the GIB ESU EKS system.
@@ -141,16 +239,10 @@ class ESUServis:
         Returns:
             Yanit: GIB ESU EKS service reponse
         """
-        cihaz = (
-            cihaz_bilgileri
-            if isinstance(cihaz_bilgileri, ESUKayitModel)
-            else ESUKayitModel.olustur(
-                firma=self._firma,
-                esu=cihaz_bilgileri,
-            )
-        )
-        self.logger.debug(cihaz.model_dump_json())
-        return self._api_isteği(cihaz.model_dump())
+        cihaz = self._kayit_modeli_hazirla(cihaz_bilgileri)
+        govde = self._istek_govdesi(cihaz)
+        self._istegi_logla(govde)
+        return self._api_isteği(govde)
 
     def mukellef_kayit(
         self,
@@ -186,149 +278,400 @@ class ESUServis:
         Returns:
             Yanit: GIB ESU EKS service reponse
         """
-        veri: Optional[ESUMukellefModel] = None
-        if not isinstance(mukellef_bilgileri, ESUMukellefModel):
-            if (
-                not esu
-                or not lokasyon
-                or not mukellef
-                or not (fatura or mulkiyet_sahibi)
-            ):
-                raise ValueError("Mükellef bilgileri eksik")
-
-            _fatura = (
-                fatura
-                if fatura is not None
-                else Fatura(fatura_tarihi="", fatura_ettn="")
-            )
-            _mukellef = (
-                mukellef
-                if mukellef is not None
-                else Mukellef(
-                    mukellef_vkn=self._firma.firma_vkn,
-                    mukellef_unvan=str(self._firma.firma_unvan),
-                )
-            )
-            _mulkiyet_sahibi = (
-                mulkiyet_sahibi
-                if mulkiyet_sahibi is not None
-                else MulkiyetSahibi(
-                    mulkiyet_sahibi_vkn_tckn="", mulkiyet_sahibi_ad_unvan=""
-                )
-            )
-            _sertifika = (
-                sertifika
-                if sertifika is not None
-                else Sertifika(sertifika_no="", sertifika_tarihi="")
-            )
-            veri = ESUMukellefModel.olustur(
-                esu_seri_no=esu.esu_seri_no if isinstance(esu, ESU) else esu,
-                firma_kodu=self._firma.firma_kodu,
-                fatura=_fatura,
-                lokasyon=lokasyon,
-                mukellef=_mukellef,
-                mulkiyet_sahibi=_mulkiyet_sahibi,
-                sertifika=_sertifika,
-            )
-        elif isinstance(mukellef_bilgileri, ESUMukellefModel):
-            veri = mukellef_bilgileri
-
-        self.logger.debug(veri.model_dump_json())
-
-        return self._api_isteği(
-            veri.model_dump(), istek_tipi=ESUServis._ISTEK_TIPI.ESU_MUKELLEF
+        veri = self._mukellef_modeli_hazirla(
+            mukellef_bilgileri=mukellef_bilgileri,
+            esu=esu,
+            lokasyon=lokasyon,
+            fatura=fatura,
+            mukellef=mukellef,
+            mulkiyet_sahibi=mulkiyet_sahibi,
+            sertifika=sertifika,
         )
+        govde = self._istek_govdesi(veri)
+        self._istegi_logla(govde)
 
-    def _esu_bilgisi_hazirla(self, kayit: dict) -> ESU:
-        """
-        Internal method to construct a charge point registration request model instance.
+        return self._api_isteği(govde, istek_tipi=ESUServis._ISTEK_TIPI.ESU_MUKELLEF)
+
+    def _cihaz_kaydi_isle(self, kayit: Mapping[str, str]) -> ESUTopluKayitSonucu:
+        """Internal method to register the charge point of a batch row, the
+        first stage of a batch registration.
 
         Args:
-            kayit (dict): Dictionary to convert to an ESU instance.
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
 
         Returns:
-            ESU: Constructed charge point registration request model instance.
+            ESUTopluKayitSonucu: Registration result of the charge point, without
+            the tax payer result
         """
-        soket_detay = [
-            Soket(soket_no=pair.split(":")[0], soket_tip=pair.split(":")[1])
-            for pair in kayit["esu_soket_detay"].split(";")
-        ]
-
-        return ESU(
-            esu_seri_no=kayit["esu_seri_no"],
-            esu_soket_tipi=kayit["esu_soket_tipi"],
-            esu_soket_sayisi=kayit["esu_soket_sayisi"],
-            esu_soket_detay=soket_detay,
-            esu_markasi=kayit["esu_markasi"],
-            esu_modeli=kayit["esu_modeli"],
+        try:
+            cihaz = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_KAYIT,
+                lambda: self._kayit_bilgisi_hazirla(kayit),
+            )
+            esu_sonucu = (
+                self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_KAYIT)
+                or self._gunluge_yaz(
+                    kayit, self._ISTEK_TIPI.ESU_KAYIT, self.cihaz_kayit(cihaz)
+                )
+            ).mesaj
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluKayitSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                esu_kayit_sonucu="",
+                mukellef_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
+            )
+        return ESUTopluKayitSonucu(
+            esu_seri_no=cihaz.kayit_bilgisi.esu_seri_no,
+            esu_kayit_sonucu=esu_sonucu,
+            mukellef_kayit_sonucu="",
         )
 
-    def _mukellef_bilgisi_hazirla(self, kayit: dict, esu: ESU) -> ESUMukellefModel:
-        """Internal method to construct a tax payer registration request model instance.
+    def _mukellef_kaydi_isle(
+        self, kayit: Mapping[str, str], sonuc: ESUTopluKayitSonucu
+    ) -> None:
+        """Internal method to register the tax payer of a batch row whose charge
+        point is registered, the second stage of a batch registration.
 
         Args:
-            kayit (dict): Dictionary to convert to an ESUMukellefModel instance
-            esu (ESU): Charge point model instance
-
-        Returns:
-            ESUMukellefModel: Constructed tax payer registration request model instance.
+            kayit (Mapping[str, str]): Row read from csv input
+            sonuc (ESUTopluKayitSonucu): Registration result of the charge point,
+            completed with the tax payer result
         """
-        lokasyon = Lokasyon(**kayit)
-        if kayit.get("mukellef_vkn") and kayit.get("mukellef_unvan"):
-            mukellef = Mukellef(**kayit)
-        else:
-            mukellef = Mukellef(
-                mukellef_vkn=self._firma.firma_vkn,
-                mukellef_unvan=self._firma.firma_unvan,
+        try:
+            mukellef = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_MUKELLEF,
+                lambda: self._mukellef_bilgisi_hazirla(kayit, sonuc.esu_seri_no),
             )
-        fatura = (
-            Fatura(**kayit) if not kayit.get("mulkiyet_sahibi_vkn_tckn") else Fatura()
-        )
-        sertifika = Sertifika(**kayit) if kayit.get("sertifika_no") else Sertifika()
-        mulkiyet = (
-            MulkiyetSahibi(**kayit)
-            if not kayit.get("fatura_ettn")
-            else MulkiyetSahibi()
-        )
-
-        return ESUMukellefModel.olustur(
-            esu_seri_no=esu.esu_seri_no,
-            firma_kodu=self._firma.firma_kodu,
-            fatura=fatura,
-            lokasyon=lokasyon,
-            mukellef=mukellef,
-            mulkiyet_sahibi=mulkiyet,
-            sertifika=sertifika,
-        )
+            sonuc.mukellef_kayit_sonucu = (
+                self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_MUKELLEF)
+                or self._gunluge_yaz(
+                    kayit, self._ISTEK_TIPI.ESU_MUKELLEF, self.mukellef_kayit(mukellef)
+                )
+            ).mesaj
+        except Exception as hata:
+            sonuc.durum = IslemDurumu.HATALI
+            sonuc.hata = self._satir_hatasi(kayit, hata)
 
-    def _kayit_isle(self, kayit: dict, sonuc: TopluKayitSonuc) -> None:
-        """Internal method to register both the charge point and the tax payer.
+    def _kayitlari_gonder(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        isle: Callable[[Mapping[str, str]], R],
+        istek_tipleri: Tuple[BaseESUServis._ISTEK_TIPI, ...],
+        islem: _TopluIslem,
+        paralel: bool,
+        sonraki_asamalar: Sequence[Callable[[Mapping[str, str], R], None]] = (),
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk: Optional[Journal] = None,
+        degismedi: Optional[Callable[[Mapping[str, str]], bool]] = None,
+        rapor: Optional[JsonLinesWriter] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Internal method to send csv rows sequentially or in parallel.
+
+        A row operation may consist of several stages, one per service path,
+        a row going on to its next stage only when the previous one succeeded.
+        In parallel, each stage has its own threads and queue so that the
+        later stages of earlier rows overlap the first stage of later rows.
 
         Args:
-            kayit (dict): Dictionary corresponding to a row read from csv input
-            sonuc (TopluKayitSonuc): Result model for processed registration requests
+            kayitlar (Iterable[Mapping[str, str]]): Rows read from csv input
+            isle (Callable[[Mapping[str, str]], R]): Row processor, the first stage
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            islem (_TopluIslem): State of the batch, shared by its rows only
+            paralel (bool): Boolean flag to control multithreaded processing
+            sonraki_asamalar (Sequence[Callable[..., None]], optional):
+                Later stages, completing the row result. Defaults to ().
+            yeniden_deneme_butcesi (Optional[int], optional):
+                Maximum number of retries across the whole batch. Defaults to None.
+            sure_siniri (Optional[float], optional):
+                Time limit of the batch in seconds. Defaults to None.
+            gunluk (Optional[Journal], optional):
+                Journal of completed requests, closed at the end of the batch.
+                Defaults to None.
+            degismedi (Optional[Callable[[Mapping[str, str]], bool]], optional):
+                Tells the rows unchanged since the last run, which are not sent.
+                Defaults to None.
+            rapor (Optional[JsonLinesWriter], optional):
+                Report receiving a line per finished row and a summary line at
+                the end, closed at the end of the batch. Defaults to None.
+            oncu_kayit_sayisi (Optional[int], optional):
+                Number of canary rows sent one at a time before the others,
+                which are not sent when the canary rows reveal a systemic
+                failure.
+                Defaults to None.
+
+        Returns:
+            Dict[str, Any]: Fields of the batch result, i.e. row results in input
+            order, the serial numbers of the rows skipped after the time limit or
+            while the circuit breaker is open, of the rows completed in a
+            previous run, the number of unchanged rows, the concurrency
+            reached by a parallel run and the reason of a stop after the
+            canary rows
         """
-        esu = self._esu_bilgisi_hazirla(kayit)
-        esu_yanit = self.cihaz_kayit(esu)
-        mukellef = self._mukellef_bilgisi_hazirla(kayit, esu)
-        mukellef_yanit = self.mukellef_kayit(mukellef)
-        sonuc.sonuclar.append(
-            ESUTopluKayitSonucu(
-                esu_seri_no=esu.esu_seri_no,
-                esu_kayit_sonucu=esu_yanit.sonuc[0].mesaj,
-                mukellef_kayit_sonucu=mukellef_yanit.sonuc[0].mesaj,
-            )
+        bitis = None if sure_siniri is None else time.monotonic() + sure_siniri
+        toplayici: ResultCollector[R] = ResultCollector()
+        gonderilmeyenler: List[Tuple[int, str]] = []
+        atlananlar: List[Tuple[int, str]] = []
+        degismeyenler: List[int] = []
+        sinirlayici = self._eszamanlilik_siniri() if paralel else None
+
+        asama_sayisi = 1 + len(sonraki_asamalar)
+
+        def calistir(satir: _AsamaliSatir, asama: Callable[[], Any]) -> Any:
+            if sinirlayici is not None:
+                sinirlayici.acquire()
+            baslangic = time.perf_counter()
+            sure: Optional[float] = None
+            try:
+                with self._satir_takibi(satir.takip):
+                    sonuc = asama()
+                sure = time.perf_counter() - baslangic
+                satir.sure += sure
+                return sonuc
+            finally:
+                # the slot is freed whatever the stage raised, as a failure
+                if sinirlayici is not None:
+                    sinirlayici.release(sure, failed=sure is None)
+
+        def bitir(satir: _AsamaliSatir) -> None:
+            toplayici.put(satir.sira, satir.sonuc)
+            if rapor is not None:
+                rapor.write(satir.sonuc.__pydantic_serializer__.to_json(satir.sonuc))
+
+        def ilerle(satir: _AsamaliSatir) -> bool:
+            if self._asamayi_tamamla(satir, asama_sayisi, istek_tipleri):
+                return True
+            bitir(satir)
+            return False
+
+        def hatali(satir: _AsamaliSatir, hata: Exception) -> None:
+            # a row whose stage raised is reported as failed instead of lost
+            self._asama_hatasi(satir, hata, asama_sayisi, istek_tipleri)
+            bitir(satir)
+
+        def ilk_asama(satir: _AsamaliSatir) -> bool:
+            sira, kayit = satir.sira, satir.kayit
+            if self._gunlukte_tamamlandi(kayit, istek_tipleri):
+                atlananlar.append((sira, self._seri_no(kayit)))
+                return False
+            if degismedi is not None and degismedi(kayit):
+                degismeyenler.append(sira)
+                return False
+            # rows are not sent after the time limit or while the circuit is open
+            if not self._sure_doldu(bitis):
+                try:
+                    satir.sonuc = calistir(satir, lambda: isle(kayit))
+                except CircuitOpenError:
+                    pass
+                else:
+                    return ilerle(satir)
+            gonderilmeyenler.append((sira, self._seri_no(kayit)))
+            return False
+
+        def sonraki_asama(satir: _AsamaliSatir) -> bool:
+            asama = sonraki_asamalar[satir.asama - 1]
+            calistir(satir, lambda: asama(satir.kayit, satir.sonuc))
+            return ilerle(satir)
+
+        asamalar = [ilk_asama] + [sonraki_asama] * len(sonraki_asamalar)
+        satirlar = (
+            _AsamaliSatir(sira, kayit) for sira, kayit in toplayici.enumerate(kayitlar)
         )
 
-    def _dosyaya_yaz(self, cikti_dosya_yolu: str, icerik: str) -> None:
-        """Internal method to write the batch processing results to a file.
+        def sirayla_isle(satir: _AsamaliSatir) -> None:
+            try:
+                for asama in asamalar:
+                    if not asama(satir):
+                        return
+            except Exception as hata:
+                hatali(satir, hata)
+
+        def toplu_islemde(
+            asama: Callable[[_AsamaliSatir], bool]
+        ) -> Callable[[_AsamaliSatir], bool]:
+            # the threads of the pipeline do not inherit the state of the batch
+            def asamayi_calistir(satir: _AsamaliSatir) -> bool:
+                with self._toplu_islemde(islem):
+                    return asama(satir)
+
+            return asamayi_calistir
+
+        islem.yeniden_deneme_butcesi = RetryBudget(yeniden_deneme_butcesi)
+        islem.sinirlayici = sinirlayici
+        islem.gunluk = gunluk
+        try:
+            # canary rows are sent one at a time, stopping the batch before the
+            # rest is sent when they reveal a systemic failure
+            oncu: List[_AsamaliSatir] = []
+            while len(oncu) < (oncu_kayit_sayisi or 0):
+                satir = next(satirlar, None)
+                if satir is None:
+                    break
+                sirayla_isle(satir)
+                if satir.sonuc is not None and satir.sonuc.deneme:
+                    oncu.append(satir)
+            durdurma_nedeni = (
+                self._oncu_gonderimi_degerlendir(oncu) if oncu_kayit_sayisi else None
+            )
+            if durdurma_nedeni is not None:
+                gonderilmeyenler.extend(
+                    (satir.sira, self._seri_no(satir.kayit)) for satir in satirlar
+                )
+            elif sinirlayici is not None:
+                # rows are read lazily and fed to the threads of each stage
+                # through bounded queues, keeping memory use independent of the
+                # input size and overlapping the stages of consecutive rows,
+                # while the limiter adapts the number of requests in flight
+                pipeline(
+                    satirlar,
+                    [toplu_islemde(asama) for asama in asamalar],
+                    workers=sinirlayici.maximum,
+                    on_error=hatali,
+                )
+            else:
+                for satir in satirlar:
+                    sirayla_isle(satir)
+            sonuclar = toplayici.results()
+            alanlar: Dict[str, Any] = {
+                "sonuclar": sonuclar,
+                "toplam": len(sonuclar),
+                "gonderilmeyenler": [
+                    seri_no for _, seri_no in sorted(gonderilmeyenler)
+                ],
+                "atlananlar": [seri_no for _, seri_no in sorted(atlananlar)],
+                "eszamanlilik": None if sinirlayici is None else sinirlayici.limit,
+            }
+            if degismedi is not None:
+                # only the update result has the count of unchanged rows
+                alanlar["degismeyen"] = len(degismeyenler)
+            if durdurma_nedeni is not None:
+                alanlar["durdurma_nedeni"] = durdurma_nedeni
+            if rapor is not None:
+                self._rapor_ozeti_yaz(rapor, alanlar)
+        finally:
+            if gunluk is not None:
+                gunluk.close()
+            if rapor is not None:
+                rapor.close()
+
+        if atlananlar:
+            self.logger.info(f"{len(atlananlar)} kayıt önceki gönderimde tamamlanmış")
+        if degismeyenler:
+            self.logger.info(
+                f"{len(degismeyenler)} kayıt son gönderimden beri değişmedi"
+            )
+        if gonderilmeyenler:
+            self.logger.warning(f"{len(gonderilmeyenler)} kayıt gönderilmedi")
+        if sinirlayici is not None:
+            self.logger.info(f"Eşzamanlılık: {sinirlayici.limit}")
+        return alanlar
+
+    def _toplu_islem(
+        self,
+        kayitlar: Iterable[Mapping[str, str]],
+        isle: Callable[[Mapping[str, str]], R],
+        istek_tipleri: Tuple[BaseESUServis._ISTEK_TIPI, ...],
+        sonuc_modeli: Type[TopluIslemSonucu],
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        paralel_calistir: Optional[bool] = None,
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+        anlik_goruntu_dosya_yolu: Optional[str] = None,
+        degismedi: Optional[Callable[[Mapping[str, str]], bool]] = None,
+        sonraki_asamalar: Sequence[Callable[[Mapping[str, str], R], None]] = (),
+    ) -> dict[str, Any]:
+        """Internal batch engine running a row operation over a row source.
+
+        Keyword arguments other than the ones below are the batch options
+        described in `BaseESUServis`.
 
         Args:
-            cikti_dosya_yolu (str): Output file path
-            icerik (str): Data to write to the output file
+            kayitlar (Iterable[Mapping[str, str]]): Row source, read lazily
+            isle (Callable[[Mapping[str, str]], R]): Row operation
+            istek_tipleri (Tuple[_ISTEK_TIPI, ...]): Service paths a row is sent to
+            sonuc_modeli (Type[TopluIslemSonucu]): Batch result model
+            paralel_calistir (Optional[bool], optional):
+                Boolean flag to control multithreaded processing. Defaults to None.
+            anlik_goruntu_dosya_yolu (Optional[str], optional):
+                Snapshot file path holding the content hashes of the update
+                payloads last accepted by GIB, only new or changed rows are
+                sent and the snapshot is refreshed at the end of the batch.
+                Defaults to None (all rows are sent).
+            degismedi (Optional[Callable[[Mapping[str, str]], bool]], optional):
+                Tells the rows unchanged since the last run, which are not sent.
+                Defaults to None.
+            sonraki_asamalar (Sequence[Callable[..., None]], optional):
+                Later stages of the row operation, one per service path after
+                the first. Defaults to ().
+
+        Returns:
+            dict[str, Any]: Batch result model instance as a dictionary
         """
-        with open(cikti_dosya_yolu, "w") as f:
-            f.write(icerik)
+        self._azami_hata_oranini_denetle(azami_hata_orani)
+        self._oncu_kayit_sayisini_denetle(oncu_kayit_sayisi)
+        if kuru_calistir:
+            return self._kuru_calistir(
+                kayitlar, istek_tipleri, cikti_dosya_yolu
+            ).model_dump()
+        with self._toplu_islem_baglami(
+            istekleri_logla, anlik_goruntu_dosya_yolu
+        ) as islem:
+            dogrulama: Optional[DogrulamaSonucu] = None
+            if on_dogrulama or azami_hata_orani is not None:
+                kayitlar, dogrulama = self._on_dogrula(kayitlar, istek_tipleri, islem)
+            rapor = self._rapor_ac(cikti_dosya_yolu) if dosyaya_yaz else None
+            alanlar = self._dogrulama_sonucunu_isle(
+                kayitlar, dogrulama, azami_hata_orani, rapor
+            )
+            if alanlar is None:
+                self.logger.info("GİB'e gönderim başlıyor...")
+                alanlar = self._kayitlari_gonder(
+                    kayitlar,
+                    isle,
+                    istek_tipleri,
+                    islem,
+                    paralel=bool(paralel_calistir),
+                    sonraki_asamalar=sonraki_asamalar,
+                    yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+                    sure_siniri=sure_siniri,
+                    gunluk=self._gunluk_ac(gunluk_dosya_yolu, devam_et),
+                    degismedi=degismedi,
+                    oncu_kayit_sayisi=oncu_kayit_sayisi,
+                    rapor=rapor,
+                )
+            sonuc = sonuc_modeli(**alanlar, dogrulama=dogrulama)
+            if hatali_kayit_dosya_yolu:
+                self._hatali_kayitlari_yaz(hatali_kayit_dosya_yolu, alanlar["sonuclar"])
+
+            # without a path, the report is the streaming one written above
+            if bool(dosyaya_yaz) and rapor is None and cikti_dosya_yolu:
+                self._dosyaya_yaz(
+                    cikti_dosya_yolu=cikti_dosya_yolu,
+                    icerik=sonuc.model_dump_json(indent=4),
+                )
+
+        return sonuc.model_dump()
 
     def toplu_kayit(
         self,
@@ -337,80 +680,57 @@ class ESUServis:
         dosyaya_yaz: Optional[bool] = None,
         cikti_dosya_yolu: Optional[
             str
-        ] = None,  # using "gonderim_raporu.json" when None
+        ] = None,  # using "gonderim_raporu.jsonl" when None
         paralel_calistir: Optional[bool] = None,
         istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
     ) -> dict[str, Any]:
         """
         Batch registers charge points along with their tax payer information.
 
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
         Args:
             giris_dosya_yolu (Optional[str], optional):
                 Input csv file path. Defaults to None.
             csv_string (Optional[io.StringIO], optional):
                 String data stream as alternative input. Defaults to None.
-            dosyaya_yaz (Optional[bool], optional):
-                Boolean flag to control whether report the results to a file.
-                Defaults to None.
-            cikti_dosya_yolu (Optional[str], optional):
-                Output file path (if `dosyaya_yaz` is True). Defaults to None.
-            paralel (Optional[bool], optional):
+            paralel_calistir (Optional[bool], optional):
                 Boolean flag to control multithreaded processing. Defaults to None.
-            istekleri_logla (Optional[bool], optional):
-                Boolean flag to log api requests to console.
 
         Returns:
             dict[str, Any]: TopluKayitSonuc instance
             (which contains batch processing results) as a dictionary
         """
-        working_dir = os.getcwd()
-        csv_path = os.path.join(working_dir, "envanter.csv")
-
-        if not giris_dosya_yolu and not csv_string and not os.path.exists(csv_path):
-            raise FileNotFoundError(
-                f"{working_dir} dizininde envanter.csv dosyası bulunamadı"
-            )
-
-        if istekleri_logla:
-            self.logger.setLevel(logging.DEBUG)
-
-        records = PyUtils.read_csv(giris_dosya_yolu or csv_string or csv_path)
-        self.logger.info(f"{giris_dosya_yolu or csv_path} giriş dosyası okundu")
-
-        sonuc = TopluKayitSonuc(sonuclar=[], toplam=0)
-
-        self.logger.info("GİB'e gönderim başlıyor...")
-
-        if bool(paralel_calistir):
-
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=max((os.cpu_count() or 6) - 2, 1)
-            ) as executor:
-                futures = [
-                    executor.submit(self._kayit_isle, record, sonuc)
-                    for record in records
-                ]
-                concurrent.futures.wait(
-                    futures, return_when=concurrent.futures.ALL_COMPLETED
-                )
-
-        else:
-            for record in records:
-                self._kayit_isle(record, sonuc)
-
-        sonuc.toplam = len(sonuc.sonuclar)
-
-        if bool(dosyaya_yaz):
-            self._dosyaya_yaz(
-                cikti_dosya_yolu=(cikti_dosya_yolu or "gonderim_raporu.json"),
-                icerik=sonuc.model_dump_json(indent=4),
-            )
-
-        # conditionally restore default logging level
-        if istekleri_logla:
-            self.logger.setLevel(logging.INFO)
-
-        return sonuc.model_dump()
+        return self._toplu_islem(
+            self._csv_satirlari(giris_dosya_yolu, csv_string),
+            self._cihaz_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_KAYIT, self._ISTEK_TIPI.ESU_MUKELLEF),
+            TopluKayitSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            paralel_calistir=paralel_calistir,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
+            sonraki_asamalar=(self._mukellef_kaydi_isle,),
+        )
 
     def kayit_guncelle(
         self,
@@ -443,73 +763,60 @@ class ESUServis:
         Returns:
             Yanit: GIB ESU EKS service reponse
         """
-        veri: Optional[ESUGuncellemeModel] = None
-        if not isinstance(kayit_bilgileri, ESUGuncellemeModel):
-            if not esu_seri_no or not lokasyon or not (fatura or mulkiyet_sahibi):
-                raise ValueError("Kayıt bilgileri eksik")
-
-            _fatura = (
-                fatura
-                if fatura is not None
-                else Fatura(fatura_tarihi="", fatura_ettn="")
-            )
-            _mulkiyet_sahibi = (
-                mulkiyet_sahibi
-                if mulkiyet_sahibi is not None
-                else MulkiyetSahibi(
-                    mulkiyet_sahibi_vkn_tckn="", mulkiyet_sahibi_ad_unvan=""
-                )
-            )
-            _sertifika = (
-                sertifika
-                if sertifika is not None
-                else Sertifika(sertifika_no="", sertifika_tarihi="")
-            )
-            veri = ESUGuncellemeModel.olustur(
-                esu_seri_no=ESUSeriNo(esu_seri_no=esu_seri_no),
-                firma_kodu=self._firma.firma_kodu,
-                fatura=_fatura,
-                lokasyon=lokasyon,
-                mulkiyet_sahibi=_mulkiyet_sahibi,
-                sertifika=_sertifika,
-            )
-        elif isinstance(kayit_bilgileri, ESUGuncellemeModel):
-            veri = kayit_bilgileri
-
-        self.logger.debug(veri.model_dump_json())
-
-        return self._api_isteği(
-            veri.model_dump(), istek_tipi=ESUServis._ISTEK_TIPI.ESU_GUNCELLEME
+        veri = self._guncelleme_modeli_hazirla(
+            kayit_bilgileri=kayit_bilgileri,
+            esu_seri_no=esu_seri_no,
+            lokasyon=lokasyon,
+            fatura=fatura,
+            mulkiyet_sahibi=mulkiyet_sahibi,
+            sertifika=sertifika,
         )
+        govde = self._istek_govdesi(veri)
+        self._istegi_logla(govde)
 
-    def _guncelleme_kaydi_isle(self, kayit: dict, sonuc: TopluGuncellemeSonuc) -> None:
+        return self._api_isteği(govde, istek_tipi=ESUServis._ISTEK_TIPI.ESU_GUNCELLEME)
+
+    def _guncelleme_kaydi_isle(
+        self, kayit: Mapping[str, str]
+    ) -> ESUTopluGuncellemeSonucu:
         """Internal method to update a previously registered charge point's information.
 
         Args:
-            kayit (dict): Dictionary corresponding to a row read from csv input
-            sonuc (TopluGuncellemeSonuc): Result model for processed update requests
-        """
+            kayit (Mapping[str, str]): Row read from csv input
 
-        guncelleme_yanit = self.kayit_guncelle(
-            esu_seri_no=kayit["esu_seri_no"],
-            lokasyon=Lokasyon(**kayit),
-            fatura=(
-                Fatura(**kayit)
-                if not kayit.get("mulkiyet_sahibi_vkn_tckn")
-                else Fatura()
-            ),
-            sertifika=Sertifika(**kayit) if kayit.get("sertifika_no") else Sertifika(),
-            mulkiyet_sahibi=(
-                MulkiyetSahibi(**kayit)
-                if not kayit.get("fatura_ettn")
-                else MulkiyetSahibi()
-            ),
-        )
-        sonuc.sonuclar.append(
-            ESUTopluGuncellemeSonucu(
-                esu_seri_no=kayit["esu_seri_no"],
-                guncelleme_kayit_sonucu=guncelleme_yanit.sonuc[0].mesaj,
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            ESUTopluGuncellemeSonucu: Update result of the charge point
+        """
+        try:
+            veri = self._istek_modeli(
+                kayit,
+                self._ISTEK_TIPI.ESU_GUNCELLEME,
+                lambda: self._guncelleme_bilgisi_hazirla(kayit),
+            )
+            guncelleme_sonuc = self._gunlukteki_sonuc(
+                kayit, self._ISTEK_TIPI.ESU_GUNCELLEME
+            )
+            if guncelleme_sonuc is None:
+                yanit = self.kayit_guncelle(veri)
+                self._anlik_goruntuye_yaz(veri, yanit)
+                guncelleme_sonuc = self._gunluge_yaz(
+                    kayit, self._ISTEK_TIPI.ESU_GUNCELLEME, yanit
+                )
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluGuncellemeSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                guncelleme_kayit_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
             )
+        return ESUTopluGuncellemeSonucu(
+            esu_seri_no=kayit["esu_seri_no"],
+            guncelleme_kayit_sonucu=guncelleme_sonuc.mesaj,
         )
 
     def toplu_guncelle(
@@ -519,81 +826,64 @@ class ESUServis:
         dosyaya_yaz: Optional[bool] = None,
         cikti_dosya_yolu: Optional[
             str
-        ] = None,  # using "gonderim_raporu.json" when None
+        ] = None,  # using "gonderim_raporu.jsonl" when None
         paralel_calistir: Optional[bool] = None,
         istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+        anlik_goruntu_dosya_yolu: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Batch updates previously registered charge points' information.
 
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
         Args:
             giris_dosya_yolu (Optional[str], optional):
                 Input csv file path. Defaults to None.
             csv_string (Optional[io.StringIO], optional):
                 String data stream as alternative input. Defaults to None.
-            dosyaya_yaz (Optional[bool], optional):
-                Boolean flag to control whether report the results to a file.
-                Defaults to None.
-            cikti_dosya_yolu (Optional[str], optional):
-                Output file path (if `dosyaya_yaz` is True). Defaults to None.
-            paralel (Optional[bool], optional):
+            paralel_calistir (Optional[bool], optional):
                 Boolean flag to control multithreaded processing. Defaults to None.
-            istekleri_logla (Optional[bool], optional):
-                Boolean flag to log api requests to console.
+            anlik_goruntu_dosya_yolu (Optional[str], optional):
+                Snapshot file path holding the content hashes of the update
+                payloads last accepted by GIB, only new or changed rows are
+                sent and the snapshot is refreshed at the end of the batch.
+                Defaults to None (all rows are sent).
 
         Returns:
             dict[str, Any]: TopluGuncellemeSonuc instance
             (which contains batch update results) as a dictionary
         """
-
-        working_dir = os.getcwd()
-        csv_path = os.path.join(working_dir, "envanter.csv")
-
-        if not giris_dosya_yolu and not csv_string and not os.path.exists(csv_path):
-            raise FileNotFoundError(
-                f"{working_dir} dizininde envanter.csv dosyası bulunamadı"
-            )
-
-        if istekleri_logla:
-            self.logger.setLevel(logging.DEBUG)
-
-        records = PyUtils.read_csv(giris_dosya_yolu or csv_string or csv_path)
-        self.logger.info(f"{giris_dosya_yolu or csv_path} giriş dosyası okundu")
-
-        sonuc = TopluGuncellemeSonuc(sonuclar=[], toplam=0)
-
-        self.logger.info("GİB'e gönderim başlıyor...")
-
-        if bool(paralel_calistir):
-
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=max((os.cpu_count() or 6) - 2, 1)
-            ) as executor:
-                futures = [
-                    executor.submit(self._guncelleme_kaydi_isle, record, sonuc)
-                    for record in records
-                ]
-                concurrent.futures.wait(
-                    futures, return_when=concurrent.futures.ALL_COMPLETED
-                )
-
-        else:
-            for record in records:
-                self._guncelleme_kaydi_isle(record, sonuc)
-
-        sonuc.toplam = len(sonuc.sonuclar)
-
-        if bool(dosyaya_yaz):
-            self._dosyaya_yaz(
-                cikti_dosya_yolu=(cikti_dosya_yolu or "gonderim_raporu.json"),
-                icerik=sonuc.model_dump_json(indent=4),
-            )
-
-        # conditionally restore default logging level
-        if istekleri_logla:
-            self.logger.setLevel(logging.INFO)
-
-        return sonuc.model_dump()
+        return self._toplu_islem(
+            self._csv_satirlari(giris_dosya_yolu, csv_string),
+            self._guncelleme_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_GUNCELLEME,),
+            TopluGuncellemeSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            paralel_calistir=paralel_calistir,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
+            anlik_goruntu_dosya_yolu=anlik_goruntu_dosya_yolu,
+            degismedi=self._guncelleme_degismedi,
+        )
 
     def cihaz_kapatma(
         self,
@@ -615,23 +905,116 @@ class ESUServis:
             Yanit: GIB ESU EKS service reponse
         """
 
-        cihaz = (
-            cihaz_bilgisi
-            if cihaz_bilgisi and isinstance(cihaz_bilgisi, ESUKapatmaModel)
-            else (
-                ESUKapatmaModel(
-                    firma_kodu=self._firma.firma_kodu,
-                    kapatma_bilgisi=ESUSeriNo(esu_seri_no=esu_seri_no),
+        cihaz = self._kapatma_modeli_hazirla(
+            cihaz_bilgisi=cihaz_bilgisi, esu_seri_no=esu_seri_no
+        )
+        return self._api_isteği(
+            self._istek_govdesi(cihaz), istek_tipi=ESUServis._ISTEK_TIPI.ESU_KAPATMA
+        )
+
+    def _kapatma_kaydi_isle(self, kayit: Mapping[str, str]) -> ESUTopluKapatmaSonucu:
+        """Internal method to delist a charge point read from batch input.
+
+        Args:
+            kayit (Mapping[str, str]): Row read from csv input
+
+        Raises:
+            CircuitOpenError: When the circuit breaker is open
+
+        Returns:
+            ESUTopluKapatmaSonucu: Delisting result of the charge point
+        """
+        try:
+            kapatma_sonuc = self._gunlukteki_sonuc(kayit, self._ISTEK_TIPI.ESU_KAPATMA)
+            if kapatma_sonuc is None:
+                kapatma_sonuc = self._gunluge_yaz(
+                    kayit,
+                    self._ISTEK_TIPI.ESU_KAPATMA,
+                    self.cihaz_kapatma(
+                        self._istek_modeli(
+                            kayit,
+                            self._ISTEK_TIPI.ESU_KAPATMA,
+                            lambda: self._kapatma_modeli_hazirla(
+                                esu_seri_no=kayit.get("esu_seri_no")
+                            ),
+                        )
+                    ),
                 )
-                if esu_seri_no
-                else None
+        except CircuitOpenError:
+            raise
+        except Exception as hata:
+            return ESUTopluKapatmaSonucu(
+                esu_seri_no=self._seri_no(kayit),
+                kapatma_sonucu="",
+                durum=IslemDurumu.HATALI,
+                hata=self._satir_hatasi(kayit, hata),
             )
+        return ESUTopluKapatmaSonucu(
+            esu_seri_no=kayit["esu_seri_no"], kapatma_sonucu=kapatma_sonuc.mesaj
         )
-        if cihaz is None:
-            raise ValueError(
-                "`cihaz_bilgisi` ya da `esu_seri_no` "
-                "verilmemiş ya da verili değer geçersiz"
-            )
-        return self._api_isteği(
-            cihaz.model_dump(), istek_tipi=ESUServis._ISTEK_TIPI.ESU_KAPATMA
+
+    def toplu_kapatma(
+        self,
+        giris_dosya_yolu: Optional[str] = None,  # using "envanter.csv" when None
+        csv_string: Optional[io.StringIO] = None,
+        seri_nolar: Optional[Iterable[str]] = None,
+        dosyaya_yaz: Optional[bool] = None,
+        cikti_dosya_yolu: Optional[
+            str
+        ] = None,  # using "gonderim_raporu.jsonl" when None
+        paralel_calistir: Optional[bool] = None,
+        istekleri_logla: Optional[bool] = None,
+        yeniden_deneme_butcesi: Optional[int] = None,
+        sure_siniri: Optional[float] = None,
+        gunluk_dosya_yolu: Optional[str] = None,
+        devam_et: Optional[bool] = None,
+        on_dogrulama: Optional[bool] = None,
+        azami_hata_orani: Optional[float] = None,
+        kuru_calistir: Optional[bool] = None,
+        hatali_kayit_dosya_yolu: Optional[str] = None,
+        oncu_kayit_sayisi: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Batch delists previously registered charge points.
+
+        The other keyword arguments are the batch options described in
+        `BaseESUServis`.
+
+        Args:
+            giris_dosya_yolu (Optional[str], optional):
+                Input csv file path. Defaults to None.
+            csv_string (Optional[io.StringIO], optional):
+                String data stream as alternative input. Defaults to None.
+            seri_nolar (Optional[Iterable[str]], optional):
+                Serial numbers as alternative input, e.g. a generator.
+                Defaults to None (the `esu_seri_no` column of the csv input).
+            paralel_calistir (Optional[bool], optional):
+                Boolean flag to control multithreaded processing. Defaults to None.
+
+        Returns:
+            dict[str, Any]: TopluKapatmaSonuc instance
+            (which contains batch delisting results) as a dictionary
+        """
+        return self._toplu_islem(
+            (
+                ({"esu_seri_no": seri_no} for seri_no in seri_nolar)
+                if seri_nolar is not None
+                else self._csv_satirlari(giris_dosya_yolu, csv_string)
+            ),
+            self._kapatma_kaydi_isle,
+            (self._ISTEK_TIPI.ESU_KAPATMA,),
+            TopluKapatmaSonuc,
+            dosyaya_yaz=dosyaya_yaz,
+            cikti_dosya_yolu=cikti_dosya_yolu,
+            paralel_calistir=paralel_calistir,
+            istekleri_logla=istekleri_logla,
+            yeniden_deneme_butcesi=yeniden_deneme_butcesi,
+            sure_siniri=sure_siniri,
+            gunluk_dosya_yolu=gunluk_dosya_yolu,
+            devam_et=devam_et,
+            on_dogrulama=on_dogrulama,
+            azami_hata_orani=azami_hata_orani,
+            kuru_calistir=kuru_calistir,
+            hatali_kayit_dosya_yolu=hatali_kayit_dosya_yolu,
+            oncu_kayit_sayisi=oncu_kayit_sayisi,
         )
@@ -0,0 +1,4 @@
+from .fake_gib import FakeGIBServer
+from .load_test import LoadTestReport, run_load_test
+
+__all__ = ["FakeGIBServer", "LoadTestReport", "run_load_test"]
@@ -0,0 +1,3 @@
+from gib_esu.testing.load_test import main
+
+main()
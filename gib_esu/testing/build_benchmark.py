@@ -0,0 +1,124 @@
+import argparse
+import csv
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from gib_esu.models.base_model import CustomBaseModel
+from gib_esu.services.base_service import BaseESUServis
+from gib_esu.testing.load_test import CONFIG, generate_csv
+
+# request models built from a batch row, by the builders of the service
+BUILDERS: Dict[str, Callable[[BaseESUServis, Dict[str, str]], BaseModel]] = {
+    "kayit": lambda servis, kayit: servis._kayit_bilgisi_hazirla(kayit),
+    "mukellef": lambda servis, kayit: servis._mukellef_bilgisi_hazirla(
+        kayit, kayit["esu_seri_no"]
+    ),
+    "guncelleme": lambda servis, kayit: servis._guncelleme_bilgisi_hazirla(kayit),
+}
+
+
+class BuildBenchmarkReport(CustomBaseModel):
+    """Request model build benchmark result model, costs are in microseconds
+    per row."""
+
+    model: str
+    rows: int
+    validating: float  # sub-models validated again when combined
+    trusted: float  # validated sub-models combined as they are
+    speedup: float
+
+
+def _build_costs(
+    servisler: Sequence[BaseESUServis],
+    build: Callable[[BaseESUServis, Dict[str, str]], BaseModel],
+    rows: List[Dict[str, str]],
+    repeat: int,
+) -> List[float]:
+    # best of the repeats per service, in microseconds per row, the services
+    # take turns so that they are equally affected by any drift of the machine
+    best = [float("inf")] * len(servisler)
+    for _ in range(repeat):
+        for index, servis in enumerate(servisler):
+            start = time.perf_counter()
+            for row in rows:
+                build(servis, row)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return [elapsed / len(rows) * 1e6 for elapsed in best]
+
+
+def run_build_benchmark(
+    rows: int = 10000,
+    repeat: int = 3,
+    models: Optional[Sequence[str]] = None,
+) -> List[BuildBenchmarkReport]:
+    """Measures the per row cost of building the request models of a batch,
+    with and without the trusted construction path.
+
+    Args:
+        rows (int, optional): Number of csv rows. Defaults to 10000.
+        repeat (int, optional): Number of measurements per model, the best one
+        is reported. Defaults to 3.
+        models (Optional[Sequence[str]], optional): Keys of `BUILDERS`.
+        Defaults to None (all models).
+
+    Raises:
+        ValueError: When `rows` or `repeat` is not positive
+
+    Returns:
+        List[BuildBenchmarkReport]: Build costs per model
+    """
+    if rows < 1 or repeat < 1:
+        raise ValueError("`rows` ve `repeat` en az 1 olmalıdır")
+    kayitlar = list(csv.DictReader(generate_csv(rows)))
+    validating = BaseESUServis(_config=CONFIG)
+    validating._GUVENILIR_OLUSTURMA = False
+    trusted = BaseESUServis(_config=CONFIG)
+    trusted._GUVENILIR_OLUSTURMA = True
+
+    reports = []
+    for model in models or BUILDERS:
+        before, after = _build_costs(
+            (validating, trusted), BUILDERS[model], kayitlar, repeat
+        )
+        reports.append(
+            BuildBenchmarkReport(
+                model=model,
+                rows=rows,
+                validating=before,
+                trusted=after,
+                speedup=before / after if after else 0.0,
+            )
+        )
+    return reports
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[BuildBenchmarkReport]:
+    """Command line entry point, `python -m gib_esu.testing.build_benchmark`.
+
+    Args:
+        argv (Optional[Sequence[str]], optional): Command line arguments.
+        Defaults to None (`sys.argv`).
+
+    Returns:
+        List[BuildBenchmarkReport]: Build costs per model
+    """
+    parser = argparse.ArgumentParser(description="gib_esu istek modeli oluşturma")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--models", nargs="+", choices=list(BUILDERS), default=None)
+    args = parser.parse_args(argv)
+
+    reports = run_build_benchmark(args.rows, args.repeat, args.models)
+    print(f"{'model':<12}{'rows':>9}{'validating µs':>15}{'trusted µs':>12}{'x':>7}")
+    for report in reports:
+        print(
+            f"{report.model:<12}{report.rows:>9}{report.validating:>15.1f}"
+            f"{report.trusted:>12.1f}{report.speedup:>7.2f}"
+        )
+    return reports
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from pydantic import ValidationError
+
+from gib_esu.helpers.rate_limiter import TokenBucket
+from gib_esu.models.base_model import CustomBaseModel
+from gib_esu.models.request_models import (
+    ESUGuncellemeModel,
+    ESUKapatmaModel,
+    ESUKayitModel,
+    ESUMukellefModel,
+)
+from gib_esu.models.response_models import Durum, Sonuc, Yanit
+
+# base path of the GIB ESU EKS service urls
+BASE_PATH = "/api/v1/okc/okcesu"
+
+# request model and the field holding the serial number, per service path
+ENDPOINTS: Dict[str, Tuple[Type[CustomBaseModel], str]] = {
+    "/yeniEsuKayit": (ESUKayitModel, "kayit_bilgisi"),
+    "/esuMukellefDurum": (ESUMukellefModel, "durum_bilgileri"),
+    "/esuGuncelleme": (ESUGuncellemeModel, "guncelleme_istek_bilgileri"),
+    "/esuKapatma": (ESUKapatmaModel, "kapatma_bilgisi"),
+}
+
+# result codes returned by the fake server
+SUCCESS_CODE = "1000"
+INVALID_PAYLOAD_CODE = "2000"
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # room for the connection bursts of concurrent clients
+    request_queue_size = 1024
+
+
+class FakeGIBServer:
+    """Local stand-in for the GIB ESU EKS service to run load tests against.
+
+    Payloads are validated with the request models of the package. Latency,
+    error rate and throttling are configurable, so that the batch methods can
+    be measured over real sockets without reaching GIB.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[Callable[[], float]] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limit: Optional[float] = None,
+        authorization: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """FakeGIBServer constructor.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, a free port is picked when 0.
+            Defaults to 0.
+            latency (Optional[Callable[[], float]], optional): Returns the
+            response delay in seconds for each request, e.g.
+            `functools.partial(random.lognormvariate, -4, 0.5)`. Must be
+            picklable to run the server in another process. Defaults to None.
+            error_rate (float, optional): Ratio of requests answered with
+            `error_status`. Defaults to 0.
+            error_status (int, optional): Http status of failed requests.
+            Defaults to 503.
+            rate_limit (Optional[float], optional): Requests per second above
+            which HTTP 429 is returned. Defaults to None (no throttling).
+            authorization (Optional[str], optional): Expected `Authorization`
+            header, HTTP 401 is returned on mismatch. Defaults to None.
+            seed (Optional[int], optional): Seed of the error sampling.
+            Defaults to None.
+
+        Raises:
+            ValueError: When `error_rate` is not between 0 and 1
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("`error_rate` 0 ile 1 arasında olmalıdır")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.throttle = TokenBucket(rate_limit, rate_limit) if rate_limit else None
+        self.authorization = authorization
+        self.requests: Dict[str, int] = {path: 0 for path in ENDPOINTS}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = _HTTPServer((host, port), self._handler_class())
+
+    @property
+    def url(self) -> str:
+        """Base url to be used as the `api_url` of a service instance."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}{BASE_PATH}"
+
+    def __enter__(self) -> "FakeGIBServer":
+        """Starts serving in a background thread."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stops the server."""
+        self.stop()
+
+    def start(self) -> None:
+        """Starts serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},  # for a quick shutdown
+            daemon=True,
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """Serves in the calling thread until `stop` is called."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stops serving and closes the listening socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def respond(
+        self, path: str, authorization: Optional[str], body: bytes
+    ) -> Tuple[int, bytes]:
+        """Builds the response of a request.
+
+        Args:
+            path (str): Request path
+            authorization (Optional[str]): `Authorization` header of the request
+            body (bytes): Request body
+
+        Returns:
+            Tuple[int, bytes]: Http status and response body
+        """
+        service_path = path.replace(BASE_PATH, "", 1)
+        endpoint = ENDPOINTS.get(service_path)
+        if not path.startswith(BASE_PATH) or endpoint is None:
+            return 404, b""
+        if self.authorization is not None and authorization != self.authorization:
+            return 401, b"Unauthorized"
+        if self.throttle is not None and not self.throttle.try_acquire():
+            return 429, b""
+
+        with self._lock:
+            self.requests[service_path] += 1
+            failed = self._random.random() < self.error_rate
+        if self.latency is not None:
+            time.sleep(max(self.latency(), 0.0))
+        if failed:
+            return self.error_status, b""
+
+        model, field = endpoint
+        try:
+            request = model.model_validate_json(body)
+        except ValidationError as error:
+            sonuc = Sonuc(
+                esu_seri_no="-",
+                sira_no=1,
+                kod=INVALID_PAYLOAD_CODE,
+                mesaj=str(error),
+            )
+            yanit = Yanit(durum=Durum.FAILURE, sonuc=[sonuc])
+        else:
+            sonuc = Sonuc(
+                esu_seri_no=getattr(request, field).esu_seri_no,
+                sira_no=1,
+                kod=SUCCESS_CODE,
+                mesaj="Basarili",
+            )
+            yanit = Yanit(durum=Durum.SUCCESS, sonuc=[sonuc])
+        return 200, yanit.__pydantic_serializer__.to_json(yanit)
+
+    def _handler_class(self) -> Type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive connections, as used by the service clients
+            protocol_version = "HTTP/1.1"
+            # avoids delayed acks stalling responses written in two parts
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                status, body = server.respond(
+                    self.path,
+                    self.headers.get("Authorization"),
+                    self.rfile.read(length),
+                )
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
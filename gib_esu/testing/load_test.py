@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import io
+import math
+import multiprocessing
+import random
+import statistics
+import sys
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import HttpUrl
+
+from gib_esu.models.base_model import CustomBaseModel
+from gib_esu.services.base_service import BaseESUServis
+from gib_esu.testing.fake_gib import FakeGIBServer
+
+MODES = ("sequential", "threaded", "async")
+
+# service configuration used against the fake server
+CONFIG: Dict[str, Optional[str]] = {
+    "PROD_API": "0",
+    "SSL_DOGRULAMA": "0",
+    "TEST_FIRMA_KULLAN": "0",
+    "GIB_FIRMA_KODU": "J000",
+    "GIB_API_SIFRE": "123456",
+    "FIRMA_UNVAN": "YÜK TESTİ ANONİM ŞİRKETİ",
+    "FIRMA_VKN": "1234567890",
+    "EPDK_LISANS_KODU": "ŞH/12345-6/00789",
+    "GIB_TEST_FIRMA_VKN": "3900383669",
+}
+
+CSV_HEADER = (
+    "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+    "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+    "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+    "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan\n"
+)
+
+
+class LoadTestReport(CustomBaseModel):
+    """Load test result model, latencies are in milliseconds."""
+
+    mode: str
+    rows: int
+    requests: int
+    unsent: int
+    elapsed: float  # seconds
+    rows_per_sec: float
+    p50: float
+    p95: float
+    p99: float
+    peak_rss_mb: Optional[float] = None
+
+
+def generate_csv(rows: int) -> io.StringIO:
+    """Generates a batch registration input with distinct serial numbers.
+
+    Args:
+        rows (int): Number of rows
+
+    Returns:
+        io.StringIO: Csv input for the batch methods
+    """
+    return io.StringIO(
+        CSV_HEADER
+        + "".join(
+            f"LT{i:08d},AC/DC,2,Soket1:AC;Soket2:DC,Vestel,EVC04,034,Üsküdar,"
+            f"2024-08-29,P0{i:012d},,,,,,\n"
+            for i in range(1, rows + 1)
+        )
+    )
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Returns the peak resident set size of the current process in MiB.
+
+    Returns:
+        Optional[float]: Peak RSS, None on platforms without `resource`
+    """
+    try:
+        import resource
+    except ImportError:  # pragma: no cover
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def _serve(connection: Connection, options: Dict[str, Any]) -> None:
+    server = FakeGIBServer(**options)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+def start_server(
+    options: Optional[Dict[str, Any]] = None, in_process: bool = False
+) -> Tuple[str, Callable[[], None]]:
+    """Starts a fake GIB server in a background thread or in a child process.
+
+    A child process keeps the server from competing with the client for the
+    interpreter lock, which would otherwise skew the measurements.
+
+    Args:
+        options (Optional[Dict[str, Any]], optional): FakeGIBServer arguments.
+        Defaults to None.
+        in_process (bool, optional): Whether to serve from a thread of the
+        current process. Defaults to False.
+
+    Returns:
+        Tuple[str, Callable[[], None]]: Base url of the server and a callable
+        stopping it
+    """
+    options = options or {}
+    if in_process:
+        server = FakeGIBServer(**options)
+        server.start()
+        return server.url, server.stop
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_serve, args=(sender, options))
+    process.daemon = True
+    process.start()
+    url = receiver.recv()
+
+    def stop() -> None:
+        process.terminate()
+        process.join()
+
+    return url, stop
+
+
+def _measure(servis: BaseESUServis, latencies: List[float]) -> None:
+    # records the duration of every api call, retries included
+    api_istegi = getattr(servis, "_api_isteği")
+
+    if asyncio.iscoroutinefunction(api_istegi):
+
+        async def measured_async(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await api_istegi(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        setattr(servis, "_api_isteği", measured_async)
+    else:
+
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return api_istegi(*args, **kwargs)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+        setattr(servis, "_api_isteği", measured)
+
+
+def run_load_test(
+    rows: int,
+    mode: str = "threaded",
+    url: Optional[str] = None,
+    server_options: Optional[Dict[str, Any]] = None,
+    service_options: Optional[Dict[str, Any]] = None,
+) -> LoadTestReport:
+    """Runs `toplu_kayit` against a fake GIB server and measures it.
+
+    Args:
+        rows (int): Number of csv rows
+        mode (str, optional): One of `MODES`. Defaults to "threaded".
+        url (Optional[str], optional): Base url of a running fake server, a new
+        server is started in a child process when None. Defaults to None.
+        server_options (Optional[Dict[str, Any]], optional): FakeGIBServer
+        arguments used when starting a new server. Defaults to None.
+        service_options (Optional[Dict[str, Any]], optional): Service
+        constructor arguments. Defaults to None.
+
+    Raises:
+        ValueError: When `mode` is not one of `MODES`
+
+    Returns:
+        LoadTestReport: Throughput, latency percentiles and peak memory
+    """
+    if mode not in MODES:
+        raise ValueError(f"`mode` şunlardan biri olmalıdır: {', '.join(MODES)}")
+
+    stop: Optional[Callable[[], None]] = None
+    if url is None:
+        url, stop = start_server(server_options)
+
+    latencies: List[float] = []
+    csv = generate_csv(rows)
+    try:
+        if mode == "async":
+            from gib_esu.services.async_esu_service import AsyncESUServis
+
+            async def run_async() -> Dict[str, Any]:
+                async with AsyncESUServis(
+                    _config=CONFIG, **(service_options or {})
+                ) as servis:
+                    servis._api.api_url = HttpUrl(url)
+                    _measure(servis, latencies)
+                    return await servis.toplu_kayit(csv_string=csv)
+
+            start = time.perf_counter()
+            sonuc = asyncio.run(run_async())
+        else:
+            from gib_esu.services.esu_service import ESUServis
+
+            with ESUServis(_config=CONFIG, **(service_options or {})) as servis:
+                servis._api.api_url = HttpUrl(url)
+                _measure(servis, latencies)
+                start = time.perf_counter()
+                sonuc = servis.toplu_kayit(
+                    csv_string=csv, paralel_calistir=mode == "threaded"
+                )
+        elapsed = time.perf_counter() - start
+    finally:
+        if stop is not None:
+            stop()
+
+    milliseconds = [latency * 1000 for latency in latencies]
+    return LoadTestReport(
+        mode=mode,
+        rows=rows,
+        requests=len(latencies),
+        unsent=len(sonuc["gonderilmeyenler"]),
+        elapsed=elapsed,
+        rows_per_sec=sonuc["toplam"] / elapsed if elapsed else 0.0,
+        p50=_percentile(milliseconds, 50),
+        p95=_percentile(milliseconds, 95),
+        p99=_percentile(milliseconds, 99),
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> List[LoadTestReport]:
+    """Command line entry point, `python -m gib_esu.testing --help`.
+
+    Every run takes place in a fresh process, so that peak memory usage is
+    reported per run.
+
+    Args:
+        argv (Optional[Sequence[str]], optional): Command line arguments.
+        Defaults to None (`sys.argv`).
+
+    Returns:
+        List[LoadTestReport]: Reports of all runs
+    """
+    parser = argparse.ArgumentParser(description="gib_esu toplu kayıt yük testi")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="median")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server_options: Dict[str, Any] = {
+        "error_rate": args.error_rate,
+        "rate_limit": args.rate_limit,
+        "seed": args.seed,
+    }
+    if args.latency_ms > 0:
+        server_options["latency"] = functools.partial(
+            random.lognormvariate, math.log(args.latency_ms / 1000), args.latency_sigma
+        )
+
+    print(
+        f"{'mode':<12}{'rows':>9}{'rows/s':>11}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'unsent':>8}{'rss MiB':>9}"
+    )
+    reports = []
+    for rows in args.rows:
+        for mode in args.modes:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+                report = executor.submit(
+                    run_load_test, rows, mode, None, server_options
+                ).result()
+            reports.append(report)
+            print(
+                f"{report.mode:<12}{report.rows:>9}{report.rows_per_sec:>11.1f}"
+                f"{report.p50:>9.2f}{report.p95:>9.2f}{report.p99:>9.2f}"
+                f"{report.unsent:>8}{report.peak_rss_mb or 0:>9.1f}"
+            )
+    return reports
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import csv
+import io
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from gib_esu.helpers.py_utils import PyUtils
+from gib_esu.models.base_model import CustomBaseModel
+from gib_esu.testing.load_test import generate_csv
+
+
+class MemoryBenchmarkReport(CustomBaseModel):
+    """Csv row memory benchmark result model, sizes are in bytes per row."""
+
+    rows: int
+    dict_bytes: float  # a dictionary per row, as csv.DictReader reads rows
+    compact_bytes: float  # rows read by `PyUtils.read_csv`
+    ratio: float
+    dict_seconds: float  # wall time of reading the whole input
+    compact_seconds: float
+
+
+def _dict_rows(kaynak: io.StringIO) -> List[Dict[str, str]]:
+    # rows read as dictionaries, as `PyUtils.read_csv` read them before
+    reader = csv.DictReader(kaynak)
+    return [
+        {key: str(row.get(key, "") or "") for key in reader.fieldnames or []}
+        for row in reader
+    ]
+
+
+def _measure(
+    read: Callable[[io.StringIO], Sequence[Mapping[str, str]]], rows: int
+) -> Tuple[float, float]:
+    # peak memory allocated while reading the whole input, in bytes per row,
+    # and the elapsed seconds, the generated input itself is not counted
+    kaynak = generate_csv(rows)
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        satirlar = read(kaynak)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del satirlar
+    return peak / rows, elapsed
+
+
+def run_memory_benchmark(rows: int = 1000000) -> MemoryBenchmarkReport:
+    """Measures the peak memory of keeping a whole generated inventory in
+    memory, as dictionaries and as the compact rows of `PyUtils.read_csv`.
+
+    Memory is traced with `tracemalloc`, which slows down the reading, the
+    elapsed times are only comparable with each other.
+
+    Args:
+        rows (int, optional): Number of csv rows. Defaults to 1000000.
+
+    Raises:
+        ValueError: When `rows` is not positive
+
+    Returns:
+        MemoryBenchmarkReport: Memory per row of both representations
+    """
+    if rows < 1:
+        raise ValueError("`rows` en az 1 olmalıdır")
+    dict_bytes, dict_seconds = _measure(_dict_rows, rows)
+    compact_bytes, compact_seconds = _measure(PyUtils.read_csv, rows)
+    return MemoryBenchmarkReport(
+        rows=rows,
+        dict_bytes=dict_bytes,
+        compact_bytes=compact_bytes,
+        ratio=dict_bytes / compact_bytes if compact_bytes else 0.0,
+        dict_seconds=dict_seconds,
+        compact_seconds=compact_seconds,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> MemoryBenchmarkReport:
+    """Command line entry point, `python -m gib_esu.testing.memory_benchmark`.
+
+    Args:
+        argv (Optional[Sequence[str]], optional): Command line arguments.
+        Defaults to None (`sys.argv`).
+
+    Returns:
+        MemoryBenchmarkReport: Memory per row of both representations
+    """
+    parser = argparse.ArgumentParser(description="gib_esu csv satırı bellek ölçümü")
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args(argv)
+
+    report = run_memory_benchmark(args.rows)
+    print(
+        f"{'rows':<10}{'dict B':>10}{'compact B':>12}{'x':>7}"
+        f"{'dict s':>9}{'compact s':>12}"
+    )
+    print(
+        f"{report.rows:<10}{report.dict_bytes:>10.0f}{report.compact_bytes:>12.0f}"
+        f"{report.ratio:>7.2f}{report.dict_seconds:>9.2f}"
+        f"{report.compact_seconds:>12.2f}"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from gib_esu.helpers import AIMDLimiter
+
+
+def complete(limiter: AIMDLimiter, times: int = 1, **kwargs: Any) -> None:
+    for _ in range(times):
+        limiter.acquire()
+        limiter.release(**kwargs)
+
+
+def test_aimd_limiter_adapts() -> None:
+    """Test AIMDLimiter additive increase and multiplicative decrease."""
+
+    limiter = AIMDLimiter(initial=4, minimum=2, maximum=8)
+
+    # about a window of healthy completions grows the limit by one
+    complete(limiter, 5, latency=0.1)
+    assert limiter.limit == 5
+
+    complete(limiter, 100, latency=0.1)
+    assert limiter.limit == limiter.peak == 8
+
+    # slow completions halve the limit, once per window
+    complete(limiter, 5, latency=1.0)
+    assert limiter.limit == 4
+    limiter.backoff()
+    assert limiter.limit == 4
+
+    complete(limiter, 10, failed=True)
+    assert limiter.limit == 2  # bounded by the minimum
+    assert limiter.in_flight == 0
+
+    with pytest.raises(ValueError):
+        AIMDLimiter(initial=10, maximum=5)
+    with pytest.raises(ValueError):
+        AIMDLimiter(latency_tolerance=0.5)
+
+
+def test_aimd_limiter_bounds_in_flight() -> None:
+    """Test AIMDLimiter bounding in-flight threads and tasks."""
+
+    limiter = AIMDLimiter(initial=2, minimum=2, maximum=2)
+    lock = threading.Lock()
+    observed = [0]
+
+    def work() -> None:
+        limiter.acquire()
+        with lock:
+            observed[0] = max(observed[0], limiter.in_flight)
+        time.sleep(0.01)
+        limiter.release()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert observed[0] == 2
+    assert limiter.in_flight == 0
+
+    async def work_async() -> None:
+        await limiter.acquire_async()
+        observed[0] = max(observed[0], limiter.in_flight)
+        await asyncio.sleep(0.01)
+        limiter.release()
+
+    async def run() -> None:
+        await asyncio.gather(*(work_async() for _ in range(8)))
+
+    observed[0] = 0
+    asyncio.run(run())
+    assert observed[0] == 2
+    assert limiter.in_flight == 0
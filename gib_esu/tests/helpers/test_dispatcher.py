@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from gib_esu.helpers import dispatch, dispatch_async, pipeline, pipeline_async
+
+
+def counting(items: int, read: List[int]) -> Iterator[int]:
+    for i in range(items):
+        read[0] += 1
+        yield i
+
+
+def test_dispatch() -> None:
+    """Test that dispatch reads the input lazily and processes every item."""
+
+    read = [0]
+    processed: List[Tuple[int, int]] = []
+    lock = threading.Lock()
+
+    def worker(item: int) -> None:
+        with lock:
+            # items read ahead of processing are bounded by the queue and threads
+            processed.append((item, read[0]))
+
+    dispatch(counting(1000, read), worker, workers=4, queue_size=8)
+    assert sorted(item for item, _ in processed) == list(range(1000))
+    assert all(read_ahead - item <= 4 + 8 + 1 for item, read_ahead in processed)
+
+
+def test_dispatch_errors() -> None:
+    """Test error handling of dispatch."""
+
+    def worker(item: int) -> None:
+        if item % 10 == 0:
+            raise RuntimeError(item)
+
+    failed: List[int] = []
+    dispatch(range(100), worker, workers=3, on_error=lambda i, _: failed.append(i))
+    assert sorted(failed) == list(range(0, 100, 10))
+
+    # without an error handler the first error stops reading and is raised
+    read = [0]
+    with pytest.raises(RuntimeError):
+        dispatch(counting(1000, read), worker, workers=2)
+    assert read[0] < 1000
+
+    with pytest.raises(ValueError):
+        dispatch(range(1), worker, workers=0)
+
+
+def test_pipeline() -> None:
+    """Test that pipeline overlaps the stages and stops the items held back."""
+
+    second_started = threading.Event()
+    second: List[int] = []
+    lock = threading.Lock()
+
+    def first_stage(item: int) -> bool:
+        if item == 1:
+            second_started.wait(timeout=5)
+        return item % 2 == 0
+
+    def second_stage(item: int) -> bool:
+        second_started.set()
+        with lock:
+            second.append(item)
+        return True
+
+    # the first stage of item 1 waits for the second stage of item 0
+    pipeline(range(20), [first_stage, second_stage], workers=1)
+    assert second_started.is_set()
+    assert sorted(second) == list(range(0, 20, 2))
+
+    failed: List[int] = []
+
+    def failing(item: int) -> bool:
+        raise RuntimeError(item)
+
+    pipeline(
+        range(10),
+        [first_stage, failing],
+        workers=2,
+        on_error=lambda i, _: failed.append(i),
+    )
+    assert sorted(failed) == list(range(0, 10, 2))
+
+    with pytest.raises(RuntimeError):
+        pipeline(range(10), [first_stage, failing], workers=2)
+    with pytest.raises(ValueError):
+        pipeline(range(1), [], workers=1)
+
+
+def test_pipeline_async() -> None:
+    """Test that pipeline_async overlaps the stages of consecutive items."""
+
+    events: List[Tuple[str, int]] = []
+
+    async def first_stage(item: int) -> bool:
+        events.append(("first", item))
+        await asyncio.sleep(0)
+        return item != 3
+
+    async def second_stage(item: int) -> bool:
+        events.append(("second", item))
+        await asyncio.sleep(0)
+        return True
+
+    asyncio.run(pipeline_async(range(6), [first_stage, second_stage], workers=1))
+    assert sorted(item for stage, item in events if stage == "second") == [
+        0,
+        1,
+        2,
+        4,
+        5,
+    ]
+    # the second stage of an item starts before the first stage of later ones
+    assert events.index(("second", 0)) < events.index(("first", 2))
+
+
+def test_dispatch_async() -> None:
+    """Test that dispatch_async bounds in-flight items and propagates errors."""
+
+    read = [0]
+    in_flight = [0, 0]
+    processed: List[int] = []
+
+    async def worker(item: int) -> None:
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        assert read[0] - item <= 4 + 8 + 1
+        await asyncio.sleep(0)
+        in_flight[0] -= 1
+        processed.append(item)
+
+    async def failing(item: int) -> None:
+        if item == 5:
+            raise RuntimeError(item)
+
+    async def run() -> None:
+        await dispatch_async(counting(500, read), worker, workers=4, queue_size=8)
+        with pytest.raises(RuntimeError):
+            await dispatch_async(range(1000), failing, workers=2)
+        with pytest.raises(ValueError):
+            await dispatch_async(range(1), failing, workers=0)
+
+    asyncio.run(run())
+    assert sorted(processed) == list(range(500))
+    assert in_flight[1] == 4
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from gib_esu.helpers import Journal
+
+
+def test_journal_resume(tmp_path: Path) -> None:
+    """Test Journal recording and resuming from an interrupted run."""
+
+    path = str(tmp_path / "journal.jsonl")
+    with Journal(path) as journal:
+        journal.record("1", "/yeniEsuKayit", kod="1000", mesaj="Başarılı")
+        journal.record("2", "/yeniEsuKayit", kod="1000", mesaj="Başarılı")
+        assert journal.get("1", "/yeniEsuKayit") == {"kod": "1000", "mesaj": "Başarılı"}
+        assert journal.get("1", "/esuMukellefDurum") is None
+        assert journal.loaded("1", "/yeniEsuKayit") is None
+
+    # a line cut short by a crash is ignored
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"key": "3", "operation": "/yeni')
+
+    with Journal(path, resume=True) as journal:
+        assert len(journal) == 2
+        assert journal.get("3", "/yeniEsuKayit") is None
+        assert journal.loaded("1", "/yeniEsuKayit") is not None
+        journal.record("3", "/yeniEsuKayit", kod="1000", mesaj="Başarılı")
+        # entries recorded in this run are not loaded from a previous one
+        assert journal.get("3", "/yeniEsuKayit") is not None
+        assert journal.loaded("3", "/yeniEsuKayit") is None
+
+    with Journal(path, resume=True, fsync=True) as journal:
+        assert len(journal) == 3
+        assert journal.get("3", "/yeniEsuKayit") is not None
+
+    # a new run starts with an empty journal
+    with Journal(path) as journal:
+        assert len(journal) == 0
+    assert Path(path).read_text(encoding="utf-8") == ""
@@ -0,0 +1,27 @@
+import gzip
+import json
+from pathlib import Path
+
+from gib_esu.helpers import JsonLinesWriter
+
+
+def test_jsonl_writer(tmp_path: Path) -> None:
+    """Test JsonLinesWriter with plain and gzip compressed files."""
+
+    path = tmp_path / "rapor.jsonl"
+    with JsonLinesWriter(str(path)) as writer:
+        writer.write(b'{"sira": 1}')
+        # lines can be read while the file is being written
+        assert path.read_text() == '{"sira": 1}\n'
+        writer.write(json.dumps({"seri": "ŞH"}, ensure_ascii=False).encode())
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [
+        {"sira": 1},
+        {"seri": "ŞH"},
+    ]
+
+    path = tmp_path / "rapor.jsonl.gz"
+    with JsonLinesWriter(str(path)) as writer:
+        assert writer.compressed
+        writer.write(b'{"sira": 1}')
+    with gzip.open(path, "rt") as file:
+        assert file.read() == '{"sira": 1}\n'
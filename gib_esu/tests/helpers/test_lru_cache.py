@@ -0,0 +1,34 @@
+import pytest
+
+from gib_esu.helpers import LRUCache
+
+
+def test_lru_cache() -> None:
+    """Test LRUCache lookups, eviction order and hit statistics."""
+
+    cache: LRUCache[str, list] = LRUCache(maxsize=2)
+    assert cache.hit_rate == 0.0
+
+    a = cache.get("a", lambda: ["a"])
+    assert cache.get("a", lambda: ["other"]) is a
+    cache.get("b", lambda: ["b"])
+
+    # "a" was used more recently than "b", which is evicted
+    cache.get("a", lambda: ["other"])
+    cache.get("c", lambda: ["c"])
+    assert len(cache) == 2
+    assert cache.get("a", lambda: ["other"]) is a
+    assert cache.get("b", lambda: ["new b"]) == ["new b"]
+    assert (cache.hits, cache.misses) == (3, 4)
+    assert cache.hit_rate == 3 / 7
+
+    # nothing is cached when the value cannot be built
+    with pytest.raises(ValueError):
+        cache.get("d", lambda: [int("d")])
+    assert cache.get("d", lambda: ["d"]) == ["d"]
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from gib_esu.helpers import process_map
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def process_id(_: int) -> int:
+    return os.getpid()
+
+
+def test_process_map() -> None:
+    """Test that process_map keeps the input order in and out of a pool."""
+
+    assert list(process_map(square, range(50), workers=2)) == [i * i for i in range(50)]
+    assert os.getpid() not in process_map(process_id, range(4), workers=2)
+
+    # a single worker or item is processed in the calling process
+    assert set(process_map(process_id, range(4), workers=1)) == {os.getpid()}
+    assert list(process_map(process_id, [0], workers=4)) == [os.getpid()]
+
+    with pytest.raises(ValueError):
+        list(process_map(square, range(3), workers=-1))
@@ -1,10 +1,11 @@
 import io
-from typing import Union
+import pickle
+from typing import Any, Union
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from gib_esu.helpers import PyUtils
+from gib_esu.helpers import CsvRow, PyUtils
 
 
 def make_csv(stream: bool = True) -> Union[io.StringIO, str]:
@@ -47,3 +48,63 @@ def test_read_csv(csv: Union[io.StringIO, str]) -> None:
     assert rows[0].get("sertifika_tarihi") == ""
     assert rows[0].get("mulkiyet_sahibi_vkn_tckn") == ""
     assert rows[0].get("mulkiyet_sahibi_ad_unvan") == ""
+
+
+def test_iter_csv() -> None:
+    """Test that PyUtils.iter_csv reads rows lazily."""
+
+    stream = io.StringIO(
+        "esu_seri_no,il_kodu\n" + "".join(f"{i},034\n" for i in range(3))
+    )
+    rows = PyUtils.iter_csv(stream)
+    assert next(rows) == {"esu_seri_no": "0", "il_kodu": "034"}
+    assert not stream.closed
+    assert [row["esu_seri_no"] for row in rows] == ["1", "2"]
+    assert stream.closed
+
+
+def test_csv_rows() -> None:
+    """Test the compact rows of PyUtils.iter_csv against csv.DictReader rows."""
+
+    stream = io.StringIO(
+        "esu_seri_no,il_kodu,ilce\n"
+        "1,034,Üsküdar\n"
+        "\n"
+        "2,034\n"  # short row
+        "3,034,Üsküdar,fazla\n"  # row longer than the header
+    )
+    rows = PyUtils.read_csv(stream)
+    assert all(isinstance(row, CsvRow) for row in rows)
+    assert [dict(row) for row in rows] == [
+        {"esu_seri_no": "1", "il_kodu": "034", "ilce": "Üsküdar"},
+        {"esu_seri_no": "2", "il_kodu": "034", "ilce": ""},
+        {"esu_seri_no": "3", "il_kodu": "034", "ilce": "Üsküdar"},
+    ]
+
+    # the column index and the repeated values are shared across rows
+    assert rows[0]._columns is rows[2]._columns
+    assert rows[0]["ilce"] is rows[2]["ilce"]
+
+    row = rows[0]
+    assert list(row) == ["esu_seri_no", "il_kodu", "ilce"] and len(row) == 3
+    assert "ilce" in row and None not in row
+    assert row.get("koordinat") is None and row.get("koordinat", "") == ""
+    assert {**row, "ilce": "Kadıköy"}["ilce"] == "Kadıköy"
+    assert "Üsküdar" in repr(row)
+    with pytest.raises(KeyError):
+        row["koordinat"]
+    with pytest.raises(AttributeError):
+        setattr(row, "ilce", "Kadıköy")
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_write_csv(tmp_path: Any) -> None:
+    """Test PyUtils.write_csv method round trip."""
+
+    rows = PyUtils.read_csv(make_csv())
+    path = str(tmp_path / "rows.csv")
+    PyUtils.write_csv(path, rows)
+    assert PyUtils.read_csv(path) == rows
+
+    PyUtils.write_csv(path, [])
+    assert PyUtils.read_csv(path) == []
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from gib_esu.helpers import TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_reserve() -> None:
+    """Test TokenBucket.reserve pacing."""
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    # burst up to capacity, then evenly spaced reservations
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    # refill does not exceed capacity
+    clock.now = 100.0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=-1)
+
+
+def test_token_bucket_acquire() -> None:
+    """Test blocking and async acquisition."""
+
+    bucket = TokenBucket(rate=5, clock=FakeClock())
+    with patch("gib_esu.helpers.rate_limiter.time.sleep") as mock_sleep:
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.2)
+    mock_sleep.assert_called_once_with(pytest.approx(0.2))
+
+    async def acquire_twice() -> List[float]:
+        bucket = TokenBucket(rate=1000)
+        return [await bucket.acquire_async(), await bucket.acquire_async()]
+
+    waits = asyncio.run(acquire_twice())
+    assert waits[0] == 0 and 0 < waits[1] <= 0.001
+
+
+def test_token_bucket_thread_safety() -> None:
+    """Test that concurrent reservations are spaced without overlaps."""
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100, clock=clock)
+    waits: List[float] = []
+    lock = threading.Lock()
+
+    def reserve() -> None:
+        for _ in range(50):
+            delay = bucket.reserve()
+            with lock:
+                waits.append(delay)
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(round(w, 6) for w in waits) == [round(i / 100, 6) for i in range(400)]
+
+
+def test_token_bucket_shared() -> None:
+    """Test process-wide shared buckets."""
+
+    first = TokenBucket.shared(("test", "shared"), rate=3)
+    second = TokenBucket.shared(("test", "shared"), rate=50)
+    assert first is second
+    assert second.rate == 3
+    assert TokenBucket.shared(("test", "other"), rate=3) is not first
+
+
+def test_token_bucket_try_acquire() -> None:
+    """Test TokenBucket.try_acquire without going into debt."""
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 0.05
+    assert not bucket.try_acquire()
+    clock.now = 0.1
+    assert bucket.try_acquire()
@@ -0,0 +1,18 @@
+from gib_esu.helpers import ResultCollector, dispatch
+
+
+def test_result_collector() -> None:
+    """Test that ResultCollector keeps the input order of concurrent results."""
+
+    collector: ResultCollector[str] = ResultCollector()
+
+    def worker(item: tuple) -> None:
+        index, value = item
+        if value % 7:
+            collector.put(index, f"sonuc-{value}")
+
+    dispatch(collector.enumerate(range(100)), worker, workers=8)
+
+    assert len(collector) == 100
+    assert collector.results() == [f"sonuc-{i}" for i in range(100) if i % 7]
+    assert collector.reserve() == 100
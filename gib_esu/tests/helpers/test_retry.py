@@ -0,0 +1,45 @@
+import threading
+from typing import List
+
+import pytest
+
+from gib_esu.helpers.retry import RetryBudget, exponential_backoff
+
+
+@pytest.mark.parametrize(
+    "attempt,expected",
+    [(1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (5, 5.0), (10, 5.0)],
+)
+def test_exponential_backoff(attempt: int, expected: float) -> None:
+    """Test capped exponential backoff with full jitter."""
+
+    assert exponential_backoff(attempt, 0.5, 5.0, rng=lambda: 1.0) == expected
+    assert exponential_backoff(attempt, 0.5, 5.0, rng=lambda: 0.0) == 0.0
+    assert 0 <= exponential_backoff(attempt, 0.5, 5.0) <= expected
+
+
+def test_retry_budget() -> None:
+    """Test batch wide retry budget."""
+
+    budget = RetryBudget(3)
+    allowed: List[bool] = []
+
+    def consume() -> None:
+        for _ in range(10):
+            allowed.append(budget.try_consume())
+
+    threads = [threading.Thread(target=consume) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert allowed.count(True) == 3
+    assert budget.used == 3
+
+    unlimited = RetryBudget()
+    assert all(unlimited.try_consume() for _ in range(1000))
+
+    assert RetryBudget(0).try_consume() is False
+    with pytest.raises(ValueError):
+        RetryBudget(-1)
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from gib_esu.helpers import SnapshotStore
+
+
+def test_snapshot_store(tmp_path: Path) -> None:
+    """Test SnapshotStore change detection and persistence."""
+
+    path = str(tmp_path / "snapshot.json")
+    store = SnapshotStore(path)
+    digest = SnapshotStore.digest(b'{"esu_seri_no":"1"}')
+    assert len(digest) == 64
+    assert not store.unchanged("1", digest)
+
+    store.update("1", digest)
+    assert store.unchanged("1", digest)
+    assert not store.unchanged("1", SnapshotStore.digest(b'{"esu_seri_no":"2"}'))
+    assert not Path(path).exists()  # written on save only
+
+    store.save()
+    reloaded = SnapshotStore(path)
+    assert len(reloaded) == 1
+    assert reloaded.get("1") == digest
+    assert not Path(f"{path}.tmp").exists()
@@ -0,0 +1,219 @@
+import io
+import random
+from typing import Dict, List, Optional, Tuple, Type
+
+import pytest
+from pydantic import BaseModel
+
+from gib_esu.helpers.py_utils import PyUtils
+from gib_esu.models import (
+    DogrulamaKurali,
+    ESUGuncellemeModel,
+    ESUKapatmaModel,
+    ESUKayitModel,
+    ESUMukellefModel,
+    Firma,
+    csv_dogrula,
+    csv_sutunlari,
+    sutunlara_ayir,
+    sutunlari_dogrula,
+)
+from gib_esu.services.base_service import BaseESUServis
+
+ISTEK_TIPI = BaseESUServis._ISTEK_TIPI
+
+SATIR = {
+    "esu_seri_no": "SN1",
+    "esu_soket_tipi": "AC",
+    "esu_soket_sayisi": "1",
+    "esu_soket_detay": "Soket1:AC",
+    "esu_markasi": "Vestel",
+    "esu_modeli": "EVC04",
+    "il_kodu": "034",
+    "ilce": "Üsküdar",
+    "mukellef_vkn": "",
+    "mukellef_unvan": "",
+    "fatura_tarihi": "2024-08-29",
+    "fatura_ettn": "P01",
+    "mulkiyet_sahibi_vkn_tckn": "",
+    "mulkiyet_sahibi_ad_unvan": "",
+    "sertifika_no": "",
+    "sertifika_tarihi": "",
+}
+
+# invalid values per field, including the whitespace and pattern anchors on
+# which pydantic and python's `str.strip` and `re` differ
+GECERSIZ: Dict[str, List[Optional[str]]] = {
+    "esu_seri_no": ["", " ", "　", None],
+    "esu_soket_tipi": ["ac", "AC ", "", None],
+    "esu_soket_sayisi": ["0", "10", "1\n", "٣", None],
+    "esu_soket_detay": ["Soket1", "Soket1:XX", "soket1:AC", "Soket1\n:AC", ""],
+    "esu_markasi": ["", " ", None],
+    "esu_modeli": ["", "\x1c", None],
+    "il_kodu": ["34", "0345", "034\n", "x٠٣٤", " ", None],
+    "ilce": ["", "\x1f", None],
+    "mukellef_vkn": ["123", "٠١٢٣٤٥٦٧٨٩", " 0123456789 "],
+    "mukellef_unvan": ["", "Mükellef"],
+    "fatura_tarihi": ["", "2024-8-29", "2024-08-29\n", " ", None],
+    "fatura_ettn": ["", " ", None],
+    "mulkiyet_sahibi_vkn_tckn": ["0123456789", "12345678901", " "],
+    "mulkiyet_sahibi_ad_unvan": ["Sahip", " "],
+    "sertifika_no": ["C1", " "],
+    "sertifika_tarihi": ["2024-08-29", "bad", " "],
+}
+
+FIRMA = Firma(
+    firma_kodu="J000",
+    firma_vkn="0123456789",
+    epdk_lisans_no="ŞH/12345-1/12345",
+    firma_unvan="ABC A.Ş.",
+)
+
+
+def rastgele_satirlar(adet: int) -> List[Dict]:
+    """Valid rows with a few fields replaced by values that might be invalid."""
+    secim = random.Random(adet)
+    satirlar = []
+    for _ in range(adet):
+        satir: Dict = dict(SATIR)
+        if secim.random() < 0.5:
+            satir.update(
+                fatura_tarihi="",
+                fatura_ettn="",
+                mulkiyet_sahibi_vkn_tckn="0123456789",
+                mulkiyet_sahibi_ad_unvan="Sahip",
+            )
+        if secim.random() < 0.3:
+            satir.update(sertifika_no="C1", sertifika_tarihi="2024-08-29")
+        if secim.random() < 0.3:
+            satir.update(
+                esu_soket_tipi="AC/DC",
+                esu_soket_sayisi="2",
+                esu_soket_detay="Soket1:AC;Soket2:DC",
+            )
+        for _ in range(secim.choice([0, 0, 1, 1, 2])):
+            alan = secim.choice(list(GECERSIZ))
+            satir[alan] = secim.choice(GECERSIZ[alan])
+        satirlar.append(satir)
+    return satirlar
+
+
+def test_sutunlari_dogrula() -> None:
+    """Test the rules reported in the error bitmap of the rows."""
+
+    satirlar = [
+        SATIR,
+        {**SATIR, "esu_soket_tipi": "DC"},
+        {**SATIR, "esu_soket_tipi": "AC/DC", "esu_soket_detay": "Soket1:DC"},
+        {**SATIR, "il_kodu": " 34 ", "mulkiyet_sahibi_vkn_tckn": "0123456789"},
+        {**SATIR, "fatura_tarihi": "29-08-2024", "sertifika_no": "C1"},
+        {**SATIR, "esu_seri_no": " ", "esu_soket_detay": "Soket1"},
+    ]
+    sonuc = sutunlari_dogrula(
+        sutunlara_ayir(satirlar), [ESUKayitModel, ESUMukellefModel]
+    )
+    assert sonuc.hatali_satirlar == [1, 2, 3, 4, 5]
+    assert sonuc.kurallar(1) == [DogrulamaKurali.SOKET_TIPI_UYUMU]
+    assert sonuc.kurallar(2) == [DogrulamaKurali.AC_DC_SOKETLERI]
+    # an invoice and an owner given together are both left out
+    assert sonuc.kurallar(3) == [
+        DogrulamaKurali.IL_KODU,
+        DogrulamaKurali.FATURA_YA_DA_MULKIYET,
+    ]
+    assert sonuc.kurallar(4) == [
+        DogrulamaKurali.SERTIFIKA_TUTARLILIGI,
+        DogrulamaKurali.FATURA_TARIHI,
+    ]
+    # socket constraints are not checked for invalid socket fields
+    assert sonuc.kurallar(5) == [
+        DogrulamaKurali.ESU_SERI_NO,
+        DogrulamaKurali.ESU_SOKET_DETAY,
+    ]
+    assert sonuc.mesajlar(5)[0] == "`esu_seri_no` boş olamaz"
+
+    # the socket fields are not part of the update model
+    assert sutunlari_dogrula(
+        sutunlara_ayir(satirlar), [ESUGuncellemeModel]
+    ).hatali_satirlar == [3, 4, 5]
+
+    with pytest.raises(ValueError):
+        sutunlari_dogrula({"esu_seri_no": ["1"], "ilce": []}, [ESUKapatmaModel])
+    with pytest.raises(ValueError):
+        sutunlari_dogrula({}, [Firma])
+    assert sutunlari_dogrula({}, [ESUKapatmaModel]).hatalar == []
+
+
+@pytest.mark.parametrize(
+    "istek_tipleri",
+    [
+        (ISTEK_TIPI.ESU_KAYIT, ISTEK_TIPI.ESU_MUKELLEF),
+        (ISTEK_TIPI.ESU_KAYIT,),
+        (ISTEK_TIPI.ESU_MUKELLEF,),
+        (ISTEK_TIPI.ESU_GUNCELLEME,),
+        (ISTEK_TIPI.ESU_KAPATMA,),
+    ],
+)
+def test_sutunlu_dogrulama_modellerle_uyumlu(
+    istek_tipleri: Tuple[BaseESUServis._ISTEK_TIPI, ...]
+) -> None:
+    """Test that the column-wise validation agrees with building the request
+    models of every row."""
+
+    satirlar = rastgele_satirlar(600)
+    sonuc = sutunlari_dogrula(
+        sutunlara_ayir(satirlar),
+        [BaseESUServis._ISTEK_MODELLERI[tip] for tip in istek_tipleri],
+    )
+    beklenen = [
+        not isinstance(
+            BaseESUServis._satiri_dogrula(FIRMA, istek_tipleri, (sira, satir)), dict
+        )
+        for sira, satir in enumerate(satirlar, start=1)
+    ]
+    assert [bool(bitler) for bitler in sonuc.hatalar] == beklenen
+    assert 0 < sum(beklenen) < len(satirlar)
+
+
+def test_csv_dogrula() -> None:
+    """Test reading a csv input as columns the way the batch methods read rows."""
+
+    basliklar = ",".join(SATIR)
+    satir = ",".join(value or "" for value in SATIR.values())
+    icerik = "\n".join(
+        [
+            basliklar,
+            satir,
+            "",
+            satir.replace("Soket1:AC", "Soket1:DC"),
+            "SN2,AC,1",  # short row
+            satir + ",fazla",  # row longer than the header
+            satir,
+        ]
+    )
+    satirlar = list(PyUtils.iter_csv(io.StringIO(icerik)))
+    modeller: List[Type[BaseModel]] = [ESUKayitModel, ESUMukellefModel]
+
+    parcalar = list(csv_sutunlari(io.StringIO(icerik), parca_boyutu=2))
+    assert [len(parca["esu_seri_no"]) for parca in parcalar] == [1, 2, 2]
+    # short rows are padded, the values beyond the header are left out
+    assert parcalar[1]["il_kodu"] == ("034", "")
+    assert parcalar[2]["sertifika_tarihi"] == ("", "")
+
+    sonuc = csv_dogrula(io.StringIO(icerik), modeller, parca_boyutu=2)
+    assert (
+        sonuc.hatalar == sutunlari_dogrula(sutunlara_ayir(satirlar), modeller).hatalar
+    )
+    assert sonuc.hatali_satirlar == [1, 2]
+    # as the request models the service builds from the rows
+    istek_tipleri = (ISTEK_TIPI.ESU_KAYIT, ISTEK_TIPI.ESU_MUKELLEF)
+    assert [bool(bitler) for bitler in sonuc.hatalar] == [
+        not isinstance(
+            BaseESUServis._satiri_dogrula(FIRMA, istek_tipleri, (sira, satir)), dict
+        )
+        for sira, satir in enumerate(satirlar, start=1)
+    ]
+    assert "`esu_soket_tipi`" in sonuc.mesajlar(1)[0]
+
+    with pytest.raises(ValueError):
+        csv_dogrula(io.StringIO(icerik), modeller, parca_boyutu=0)
+    assert csv_dogrula(io.StringIO(""), modeller).hatalar == []
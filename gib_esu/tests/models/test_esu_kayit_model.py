@@ -123,3 +123,23 @@ def test_esu_kayit_olustur(my_model: ESUKayitModel) -> None:
         ESUKayitModel.olustur(firma=firma, esu=esu)
     except Exception as excinfo:
         pytest.fail(f"Unexpected exception raised: {excinfo}")
+
+
+def test_esu_kayit_olustur_dogrulanmis(my_model: ESUKayitModel) -> None:
+    """Test that the trusted construction path of ESUKayit.olustur() builds the
+    same model and still validates the socket rules."""
+
+    firma = Firma(**my_model.model_dump())
+    esu = my_model.kayit_bilgisi
+
+    model = ESUKayitModel.olustur(firma=firma, esu=esu, dogrulanmis=True)
+    assert model == ESUKayitModel.olustur(firma=firma, esu=esu)
+    assert model.model_dump_json() == my_model.model_dump_json()
+
+    for soket_tipi in (ESUTipi.AC, ESUTipi.DC):
+        with pytest.raises(ValidationError):
+            ESUKayitModel.olustur(
+                firma=firma,
+                esu=esu.model_copy(update={"esu_soket_tipi": soket_tipi}),
+                dogrulanmis=True,
+            )
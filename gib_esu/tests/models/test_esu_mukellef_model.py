@@ -1,5 +1,5 @@
 from copy import deepcopy
-from typing import List, cast
+from typing import Any, Dict, List, cast
 
 import pytest
 from pydantic import ValidationError
@@ -169,3 +169,43 @@ def test_esu_mukellef_olustur(my_model: ESUMukellefModel) -> None:
         )
     except Exception as excinfo:
         pytest.fail(f"Unexpected exception raised: {excinfo}")
+
+
+def test_esu_mukellef_olustur_dogrulanmis(my_model: ESUMukellefModel) -> None:
+    """Test that the trusted construction path of ESUMukellef.olustur() and
+    ESUGuncelleme.olustur() builds the same models and still validates the
+    cross-field rules."""
+
+    durum = my_model.durum_bilgileri.model_dump()
+    alt_modeller: Dict[str, Any] = dict(
+        firma_kodu=my_model.firma_kodu,
+        fatura=Fatura(**durum),
+        lokasyon=Lokasyon(**durum),
+        mukellef=Mukellef(**durum),
+        mulkiyet_sahibi=MulkiyetSahibi(**durum),
+        sertifika=Sertifika(**durum),
+    )
+
+    model = ESUMukellefModel.olustur(
+        esu_seri_no=durum["esu_seri_no"], dogrulanmis=True, **alt_modeller
+    )
+    assert model == my_model
+    assert model.model_dump_json() == my_model.model_dump_json()
+
+    guncelleme_modelleri = {
+        key: value for key, value in alt_modeller.items() if key != "mukellef"
+    }
+    seri_no = ESUSeriNo(esu_seri_no="SN001")
+    assert ESUGuncellemeModel.olustur(
+        esu_seri_no=seri_no, dogrulanmis=True, **guncelleme_modelleri
+    ) == ESUGuncellemeModel.olustur(esu_seri_no=seri_no, **guncelleme_modelleri)
+
+    # a certificate date without a certificate number is rejected either way
+    alt_modeller["sertifika"] = Sertifika.model_construct(
+        sertifika_no="", sertifika_tarihi="2024-12-30"
+    )
+    for dogrulanmis in (False, True):
+        with pytest.raises(ValidationError):
+            ESUMukellefModel.olustur(
+                esu_seri_no="SN001", dogrulanmis=dogrulanmis, **alt_modeller
+            )
@@ -0,0 +1,631 @@
+import asyncio
+import gzip
+import io
+import json
+from io import StringIO
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+import httpx
+import pytest
+import requests_mock
+from dotenv import dotenv_values
+
+from gib_esu.helpers.journal import Journal
+from gib_esu.models.request_models import (
+    ESU,
+    ESUTipi,
+    Fatura,
+    Lokasyon,
+    Mukellef,
+    Soket,
+    SoketTipi,
+)
+from gib_esu.models.response_models import Durum, Sonuc, Yanit
+from gib_esu.models.service_models import (
+    DevreKesici,
+    IslemDurumu,
+    KuruCalistirmaSonucu,
+    TopluGuncellemeSonuc,
+    TopluKapatmaSonuc,
+    TopluKayitSonuc,
+    ZamanAsimi,
+)
+from gib_esu.services import AsyncESUServis, ESUServis
+
+
+@pytest.fixture
+def test_config() -> Dict[str, Any]:
+    return dotenv_values(
+        stream=StringIO(
+            "PROD_API=0\nSSL_DOGRULAMA=0\nTEST_FIRMA_KULLAN=0\n"
+            "GIB_FIRMA_KODU=J000\nGIB_API_SIFRE=123456\n"
+            "FIRMA_UNVAN=ENERJİ ANONİM ŞİRKETİ\n"
+            "FIRMA_VKN=1234567890\n"
+            "EPDK_LISANS_KODU=ŞH/12345-6/00789\n"
+            "GIB_TEST_FIRMA_VKN=3900383669"
+        )
+    )
+
+
+@pytest.fixture
+def test_esu() -> ESU:
+    return ESU(
+        esu_seri_no="123",
+        esu_markasi="ABB",
+        esu_modeli="DC-Model",
+        esu_soket_tipi=ESUTipi.AC_DC,
+        esu_soket_sayisi="2",
+        esu_soket_detay=[
+            Soket(soket_no="Soket1", soket_tip=SoketTipi.AC),
+            Soket(soket_no="Soket2", soket_tip=SoketTipi.DC),
+        ],
+    )
+
+
+@pytest.fixture
+def csv_rows() -> str:
+    header = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan\n"
+    )
+    rows = "".join(
+        f"{i},AC,1,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P0{i},,,,,,\n"
+        for i in range(1, 21)
+    )
+    return header + rows
+
+
+def yanit_ureten(
+    istekler: List[httpx.Request], eszamanli: Optional[List[int]] = None
+) -> Callable[..., Any]:
+    """Returns a mock transport handler echoing the request's serial number."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        istekler.append(request)
+        if eszamanli is not None:
+            # track the number of in-flight requests as [current, peak]
+            eszamanli[0] += 1
+            eszamanli[1] = max(eszamanli)
+            await asyncio.sleep(0.001)
+            eszamanli[0] -= 1
+        govde = json.loads(request.content)
+        bilgi = (
+            govde.get("kayit_bilgisi")
+            or govde.get("durum_bilgileri")
+            or govde.get("guncelleme_istek_bilgileri")
+            or govde.get("kapatma_bilgisi")
+        )
+        yanit = Yanit(
+            durum=Durum.SUCCESS,
+            sonuc=[
+                Sonuc(
+                    esu_seri_no=bilgi["esu_seri_no"],
+                    sira_no=1,
+                    kod="1000",
+                    mesaj="Basarili",
+                )
+            ],
+        )
+        return httpx.Response(200, json=yanit.model_dump())
+
+    return handler
+
+
+def servis_olustur(
+    config: Dict[str, Any],
+    istekler: List[httpx.Request],
+    eszamanli: Optional[List[int]] = None,
+    **kwargs: Any,
+) -> AsyncESUServis:
+    servis = AsyncESUServis(_config=config, **kwargs)
+    servis._istemci = httpx.AsyncClient(
+        transport=httpx.MockTransport(yanit_ureten(istekler, eszamanli))
+    )
+    return servis
+
+
+def test_async_tekil_istekler(test_config: Dict[str, Any], test_esu: ESU) -> None:
+    """Test single request methods of AsyncESUServis."""
+
+    istekler: List[httpx.Request] = []
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            yanit = await servis.cihaz_kayit(test_esu)
+            assert yanit.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+            yanit = await servis.mukellef_kayit(
+                esu=test_esu,
+                lokasyon=Lokasyon(il_kodu="034", ilce="Beşiktaş"),
+                fatura=Fatura(fatura_ettn="ff01", fatura_tarihi="2024-12-19"),
+                mukellef=Mukellef(mukellef_vkn="1234567890", mukellef_unvan="A"),
+            )
+            assert yanit.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+            yanit = await servis.kayit_guncelle(
+                esu_seri_no=test_esu.esu_seri_no,
+                lokasyon=Lokasyon(il_kodu="034", ilce="Beşiktaş"),
+                fatura=Fatura(fatura_ettn="ff01", fatura_tarihi="2024-12-19"),
+            )
+            assert yanit.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+            yanit = await servis.cihaz_kapatma(esu_seri_no=test_esu.esu_seri_no)
+            assert yanit.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+            with pytest.raises(ValueError):
+                await servis.cihaz_kapatma()
+        assert servis._istemci.is_closed
+
+    asyncio.run(calistir())
+
+    assert [r.url.path.rsplit("/", 1)[-1] for r in istekler] == [
+        "yeniEsuKayit",
+        "esuMukellefDurum",
+        "esuGuncelleme",
+        "esuKapatma",
+    ]
+    assert istekler[0].headers["Authorization"].startswith("Basic ")
+
+
+def test_async_senkron_ile_ayni_govde(
+    test_config: Dict[str, Any], test_esu: ESU
+) -> None:
+    """Test that async and sync clients send identical request bodies."""
+
+    istekler: List[httpx.Request] = []
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            await servis.cihaz_kayit(test_esu)
+
+    asyncio.run(calistir())
+
+    with requests_mock.Mocker() as m, ESUServis(_config=test_config) as servis:
+        m.post(
+            f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT.value}",
+            json=Yanit(
+                durum=Durum.SUCCESS,
+                sonuc=[Sonuc(esu_seri_no="123", sira_no=1, kod="1000", mesaj="")],
+            ).model_dump(),
+        )
+        servis.cihaz_kayit(test_esu)
+        assert m.last_request.body == istekler[0].content
+
+
+def test_async_toplu_islemler(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test batch methods of AsyncESUServis with bounded concurrency."""
+
+    istekler: List[httpx.Request] = []
+    eszamanli = [0, 0]
+
+    async def calistir() -> None:
+        async with servis_olustur(
+            test_config, istekler, eszamanli, azami_eszamanli_istek=4
+        ) as servis:
+            kayit = await servis.toplu_kayit(csv_string=io.StringIO(csv_rows))
+            guncelleme = await servis.toplu_guncelle(
+                csv_string=io.StringIO(csv_rows), istekleri_logla=True
+            )
+
+        sonuc = TopluKayitSonuc(**kayit)
+        assert sonuc.toplam == 20
+        assert [s.esu_seri_no for s in sonuc.sonuclar] == [str(i) for i in range(1, 21)]
+        assert TopluGuncellemeSonuc(**guncelleme).toplam == 20
+
+    asyncio.run(calistir())
+    assert len(istekler) == 60
+    assert 1 < eszamanli[1] <= 4
+
+    with pytest.raises(ValueError):
+        AsyncESUServis(_config=test_config, azami_eszamanli_istek=-1)
+
+
+def test_async_yeniden_deneme(test_config: Dict[str, Any], test_esu: ESU) -> None:
+    """Test retries of AsyncESUServis."""
+
+    istekler: List[httpx.Request] = []
+    basarili = yanit_ureten(istekler)
+    hatalar: List[Any] = [httpx.ConnectError("baglanti yok"), 503]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if hatalar:
+            hata = hatalar.pop(0)
+            istekler.append(request)
+            if isinstance(hata, Exception):
+                raise hata
+            return httpx.Response(hata)
+        return await basarili(request)
+
+    async def calistir() -> None:
+        async with AsyncESUServis(_config=test_config) as servis:
+            servis._istemci = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            yanit = await servis.cihaz_kayit(test_esu)
+            assert yanit.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+            # read errors are not retried when registering a charge point
+            hatalar.append(httpx.ReadTimeout("zaman asimi"))
+            with pytest.raises(httpx.ReadTimeout):
+                await servis.cihaz_kayit(test_esu)
+
+    with patch("gib_esu.services.async_esu_service.asyncio.sleep") as mock_sleep:
+        asyncio.run(calistir())
+    assert len(istekler) == 4
+    assert mock_sleep.call_count == 2
+
+
+def test_async_zaman_asimi_ve_sure_siniri(
+    test_config: Dict[str, Any], test_esu: ESU, csv_rows: str
+) -> None:
+    """Test per-endpoint timeouts and the time limit of batch methods."""
+
+    istekler: List[httpx.Request] = []
+
+    async def calistir() -> None:
+        async with servis_olustur(
+            test_config, istekler, zaman_asimi=ZamanAsimi(baglanti=2, okuma=5)
+        ) as servis:
+            await servis.cihaz_kayit(test_esu)
+            sonuc = TopluGuncellemeSonuc(
+                **await servis.toplu_guncelle(
+                    csv_string=io.StringIO(csv_rows), sure_siniri=0
+                )
+            )
+            assert sonuc.toplam == 0
+            assert sonuc.gonderilmeyenler == [str(i) for i in range(1, 21)]
+
+    asyncio.run(calistir())
+    assert len(istekler) == 1
+    assert istekler[0].extensions["timeout"] == {
+        "connect": 2.0,
+        "read": 5.0,
+        "write": 5.0,
+        "pool": 5.0,
+    }
+
+
+def test_async_devre_kesici(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test that batch rows are not sent while the circuit breaker is open."""
+
+    istekler: List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        istekler.append(request)
+        raise httpx.ConnectError("baglanti yok")
+
+    async def calistir() -> None:
+        async with AsyncESUServis(
+            _config=test_config,
+            azami_eszamanli_istek=1,
+            devre_kesici=DevreKesici(hata_esigi=2),
+        ) as servis:
+            servis._istemci = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            sonuc = TopluKayitSonuc(
+                **await servis.toplu_kayit(csv_string=io.StringIO(csv_rows))
+            )
+            assert sonuc.toplam == 0
+            assert sonuc.gonderilmeyenler == [str(i) for i in range(1, 21)]
+
+    with patch("gib_esu.services.async_esu_service.asyncio.sleep"):
+        asyncio.run(calistir())
+    # the circuit opens before the last retry of the first row
+    assert len(istekler) == 2
+
+
+def test_async_gunluk_ile_devam(
+    test_config: Dict[str, Any], csv_rows: str, tmp_path: Any
+) -> None:
+    """Test resuming batch updates of AsyncESUServis from the journal."""
+
+    istekler: List[httpx.Request] = []
+    gunluk = str(tmp_path / "gunluk.jsonl")
+    with Journal(gunluk) as onceki:
+        for i in range(1, 11):
+            onceki.record(str(i), "/esuGuncelleme", kod="1000", mesaj="Basarili")
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            sonuc = TopluGuncellemeSonuc(
+                **await servis.toplu_guncelle(
+                    csv_string=io.StringIO(csv_rows),
+                    gunluk_dosya_yolu=gunluk,
+                    devam_et=True,
+                )
+            )
+        assert sonuc.atlananlar == [str(i) for i in range(1, 11)]
+        assert [s.esu_seri_no for s in sonuc.sonuclar] == [
+            str(i) for i in range(11, 21)
+        ]
+
+    asyncio.run(calistir())
+    assert len(istekler) == 10
+    with Journal(gunluk, resume=True) as sonraki:
+        assert len(sonraki) == 20
+
+
+def test_async_eszamanli_toplu_islemler(
+    test_config: Dict[str, Any], csv_rows: str, tmp_path: Any
+) -> None:
+    """Test batches running at the same time on an AsyncESUServis client."""
+
+    istekler: List[httpx.Request] = []
+    gunluk = str(tmp_path / "gunluk.jsonl")
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            # only the first batch has a journal
+            await asyncio.gather(
+                servis.toplu_kayit(
+                    csv_string=io.StringIO(csv_rows), gunluk_dosya_yolu=gunluk
+                ),
+                servis.toplu_kayit(csv_string=io.StringIO(csv_rows)),
+            )
+
+    asyncio.run(calistir())
+    assert len(istekler) == 80
+    # the journal has both requests of every row of the first batch only
+    with Journal(gunluk, resume=True) as sonraki:
+        assert len(sonraki) == 40
+
+    istekler.clear()
+    anlik_goruntu = str(tmp_path / "anlik_goruntu.json")
+
+    async def guncelle() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            # only the first batch has a snapshot
+            await asyncio.gather(
+                servis.toplu_guncelle(
+                    csv_string=io.StringIO(csv_rows),
+                    anlik_goruntu_dosya_yolu=anlik_goruntu,
+                ),
+                servis.toplu_guncelle(csv_string=io.StringIO(csv_rows)),
+            )
+            # every row of the first batch is in the snapshot
+            sonuc = TopluGuncellemeSonuc(
+                **await servis.toplu_guncelle(
+                    csv_string=io.StringIO(csv_rows),
+                    anlik_goruntu_dosya_yolu=anlik_goruntu,
+                )
+            )
+            assert sonuc.degismeyen == 20
+
+    asyncio.run(guncelle())
+    assert len(istekler) == 40
+
+    istekler.clear()
+
+    async def on_dogrula() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            # both batches pre-build the models of the same serial numbers
+            await asyncio.gather(
+                *(
+                    servis.toplu_guncelle(
+                        csv_string=io.StringIO(csv_rows.replace("Üsküdar", ilce)),
+                        on_dogrulama=True,
+                    )
+                    for ilce in ("Üsküdar", "Kadıköy")
+                )
+            )
+
+    asyncio.run(on_dogrula())
+    assert len(istekler) == 40
+    # every batch sends the models built from its own rows
+    ilceler = [
+        json.loads(istek.content)["guncelleme_istek_bilgileri"]["ilce"]
+        for istek in istekler
+    ]
+    assert ilceler.count("Üsküdar") == ilceler.count("Kadıköy") == 20
+
+
+def test_async_toplu_kapatma(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test batch delisting of AsyncESUServis from serial numbers and csv input."""
+
+    istekler: List[httpx.Request] = []
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            sonuc = TopluKapatmaSonuc(
+                **await servis.toplu_kapatma(seri_nolar=["1", "2", "3"])
+            )
+            assert [s.esu_seri_no for s in sonuc.sonuclar] == ["1", "2", "3"]
+            sonuc = TopluKapatmaSonuc(
+                **await servis.toplu_kapatma(csv_string=io.StringIO(csv_rows))
+            )
+            assert sonuc.toplam == 20
+            assert all(s.kapatma_sonucu == "Basarili" for s in sonuc.sonuclar)
+            assert all(s.deneme == 1 and s.girdi is None for s in sonuc.sonuclar)
+
+    asyncio.run(calistir())
+    assert len(istekler) == 23
+    assert all(istek.url.path.endswith("/esuKapatma") for istek in istekler)
+
+
+def test_async_on_dogrulama(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test the pre-validation gate of AsyncESUServis batch methods."""
+
+    istekler: List[httpx.Request] = []
+    hatali = csv_rows.replace("\n1,AC,", "\n1,XX,")
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            sonuc = TopluGuncellemeSonuc(
+                **await servis.toplu_guncelle(
+                    csv_string=io.StringIO(hatali), azami_hata_orani=0
+                )
+            )
+            assert sonuc.toplam == 20 and sonuc.dogrulama is not None
+            assert sonuc.dogrulama.hatalar == []
+            kayit_sonuc = TopluKayitSonuc(
+                **await servis.toplu_kayit(
+                    csv_string=io.StringIO(hatali), azami_hata_orani=0
+                )
+            )
+            assert kayit_sonuc.toplam == 0
+            assert len(kayit_sonuc.gonderilmeyenler) == 20
+            assert kayit_sonuc.dogrulama is not None
+            assert [h.sira for h in kayit_sonuc.dogrulama.hatalar] == [1]
+
+    asyncio.run(calistir())
+    # the socket type is not part of the update payload
+    assert len(istekler) == 20
+
+
+def test_async_kuru_calistirma(
+    test_config: Dict[str, Any], csv_rows: str, tmp_path: Any
+) -> None:
+    """Test dry runs of AsyncESUServis batch methods."""
+
+    istekler: List[httpx.Request] = []
+    yol = str(tmp_path / "kuru.jsonl.gz")
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            sonuc = KuruCalistirmaSonucu(
+                **await servis.toplu_guncelle(
+                    csv_string=io.StringIO(csv_rows),
+                    kuru_calistir=True,
+                    cikti_dosya_yolu=yol,
+                )
+            )
+            assert sonuc.toplam == 20 and sonuc.hatalar == []
+
+    asyncio.run(calistir())
+    assert istekler == []
+    with gzip.open(yol, "rt", encoding="utf-8") as cikti:
+        satirlar = [json.loads(satir) for satir in cikti]
+    assert [list(satir["istekler"]) for satir in satirlar[:-1]] == [
+        ["/esuGuncelleme"]
+    ] * 20
+
+
+def test_async_asama_hatasi(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test that a row whose stage raises is reported as failed."""
+
+    istekler: List[httpx.Request] = []
+
+    async def calistir() -> None:
+        async with servis_olustur(test_config, istekler) as servis:
+            gunlukte_tamamlandi = servis._gunlukte_tamamlandi
+
+            def gunlukte_ara(kayit: Any, istek_tipleri: Any) -> bool:
+                if kayit["esu_seri_no"] == "2":
+                    raise RuntimeError("gunluk okunamadi")
+                return gunlukte_tamamlandi(kayit, istek_tipleri)
+
+            with patch.object(servis, "_gunlukte_tamamlandi", gunlukte_ara):
+                sonuc = TopluKayitSonuc(
+                    **await servis.toplu_kayit(
+                        csv_string=io.StringIO(csv_rows), oncu_kayit_sayisi=3
+                    )
+                )
+            assert sonuc.toplam == 20 and sonuc.durdurma_nedeni is None
+            assert sonuc.sonuclar[1].durum == IslemDurumu.HATALI
+            assert sonuc.sonuclar[1].hata == "RuntimeError: gunluk okunamadi"
+            assert [s.durum for s in sonuc.sonuclar].count(IslemDurumu.BASARILI) == 19
+
+    asyncio.run(calistir())
+    assert len(istekler) == 38
+
+
+def test_async_iptal_edilen_toplu_islem(
+    test_config: Dict[str, Any], csv_rows: str
+) -> None:
+    """Test that cancelling a batch frees the concurrency slots of its rows."""
+
+    istekler: List[httpx.Request] = []
+    sinirlayicilar: List[Any] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        istekler.append(request)
+        await asyncio.Event().wait()  # never answered
+        raise AssertionError
+
+    async def calistir() -> None:
+        async with AsyncESUServis(_config=test_config) as servis:
+            servis._istemci = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            sinirla = servis._eszamanlilik_siniri
+
+            def eszamanlilik_siniri() -> Any:
+                sinirlayicilar.append(sinirla())
+                return sinirlayicilar[-1]
+
+            with patch.object(servis, "_eszamanlilik_siniri", eszamanlilik_siniri):
+                gorev = asyncio.ensure_future(
+                    servis.toplu_kayit(csv_string=io.StringIO(csv_rows))
+                )
+                while len(istekler) < 2:
+                    await asyncio.sleep(0)
+                assert sinirlayicilar[0].in_flight > 0
+                gorev.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await gorev
+
+    asyncio.run(calistir())
+    assert sinirlayicilar[0].in_flight == 0
+
+
+def test_async_kayit_asamalari(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test the two stage pipeline of AsyncESUServis batch registration."""
+
+    istekler: List[httpx.Request] = []
+    yanitla = yanit_ureten(istekler)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        govde = json.loads(request.content)
+        if govde.get("kayit_bilgisi", {}).get("esu_seri_no") in ("3", "7"):
+            istekler.append(request)
+            return httpx.Response(500)
+        return await yanitla(request)
+
+    async def calistir() -> TopluKayitSonuc:
+        async with AsyncESUServis(
+            _config=test_config, azami_eszamanli_istek=4
+        ) as servis:
+            servis._istemci = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return TopluKayitSonuc(
+                **await servis.toplu_kayit(csv_string=io.StringIO(csv_rows))
+            )
+
+    sonuc = asyncio.run(calistir())
+    kayit, mukellef = (
+        AsyncESUServis._ISTEK_TIPI.ESU_KAYIT.value,
+        AsyncESUServis._ISTEK_TIPI.ESU_MUKELLEF.value,
+    )
+    yollar = [istek.url.path.rsplit("/", 1)[-1] for istek in istekler]
+    assert yollar.count(kayit[1:]) == 20
+    assert yollar.count(mukellef[1:]) == 18
+    # tax payers of earlier rows are registered along with later charge points
+    assert yollar.index(mukellef[1:]) < len(yollar) - 1 - yollar[::-1].index(kayit[1:])
+    hatalilar = [s for s in sonuc.sonuclar if s.durum == IslemDurumu.HATALI]
+    assert [s.esu_seri_no for s in hatalilar] == ["3", "7"]
+    assert all(
+        s.gonderilmeyen_istekler == [mukellef] and s.girdi is not None
+        for s in hatalilar
+    )
+
+
+def test_async_oncu_gonderim(test_config: Dict[str, Any], csv_rows: str) -> None:
+    """Test the canary rows of AsyncESUServis batch methods."""
+
+    istekler: List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        istekler.append(request)
+        return httpx.Response(401)
+
+    async def calistir() -> TopluKayitSonuc:
+        async with AsyncESUServis(_config=test_config) as servis:
+            servis._istemci = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return TopluKayitSonuc(
+                **await servis.toplu_kayit(
+                    csv_string=io.StringIO(csv_rows), oncu_kayit_sayisi=2
+                )
+            )
+
+    sonuc = asyncio.run(calistir())
+    assert len(istekler) == 2
+    assert sonuc.toplam == 2 and len(sonuc.gonderilmeyenler) == 18
+    assert sonuc.durdurma_nedeni is not None
+    assert "HTTP 401" in sonuc.durdurma_nedeni
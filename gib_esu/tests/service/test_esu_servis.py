@@ -1,14 +1,21 @@
+import gzip
 import io
 import json
 import logging
 from io import StringIO
-from typing import Any
+from typing import Any, List, cast
 from unittest.mock import mock_open, patch
 
 import pytest
+import requests
 import requests_mock
 from dotenv import dotenv_values
+from pydantic import ValidationError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 
+from gib_esu.helpers.circuit_breaker import CircuitOpenError
+from gib_esu.helpers.py_utils import PyUtils
+from gib_esu.helpers.retry import RetryBudget
 from gib_esu.models.request_models import (
     ESU,
     ESUGuncellemeBilgisi,
@@ -19,6 +26,7 @@ from gib_esu.models.request_models import (
     ESUSeriNo,
     ESUTipi,
     Fatura,
+    FirmaKodu,
     Lokasyon,
     Mukellef,
     MulkiyetSahibi,
@@ -28,11 +36,19 @@ from gib_esu.models.request_models import (
 )
 from gib_esu.models.response_models import Durum, Sonuc, Yanit
 from gib_esu.models.service_models import (
+    DevreKesici,
     ESUTopluGuncellemeSonucu,
     ESUTopluKayitSonucu,
+    EszamanlilikAyari,
+    IslemDurumu,
+    KuruCalistirmaSonucu,
     TopluGuncellemeSonuc,
+    TopluKapatmaSonuc,
     TopluKayitSonuc,
+    YenidenDenemePolitikasi,
+    ZamanAsimi,
 )
+from gib_esu.services.base_service import _TOPLU_ISLEM, _TopluIslem
 from gib_esu.services.esu_service import ESUServis
 
 
@@ -102,6 +118,8 @@ def test_kayit_sonuc() -> TopluKayitSonuc:
                 mukellef_kayit_sonucu="Basarili",
                 esu_kayit_sonucu="Basarili",
                 esu_seri_no="123",
+                sira=1,
+                deneme=2,
             ),
         ],
         toplam=1,
@@ -115,6 +133,8 @@ def test_guncelleme_sonuc() -> TopluGuncellemeSonuc:
             ESUTopluGuncellemeSonucu(
                 guncelleme_kayit_sonucu="Basarili",
                 esu_seri_no="123",
+                sira=1,
+                deneme=1,
             ),
         ],
         toplam=1,
@@ -299,6 +319,9 @@ def test_toplu_kayit(
         resp = servis.toplu_kayit(
             csv_string=sample_csv3, dosyaya_yaz=True, cikti_dosya_yolu=dummy_output_path
         )
+        # processing time of the row is the only value not known in advance
+        icerik = json.loads(mock_write.call_args.kwargs["icerik"])
+        test_kayit_sonuc.sonuclar[0].sure = icerik["sonuclar"][0]["sure"]
         mock_write.assert_called_once_with(
             cikti_dosya_yolu=dummy_output_path,
             icerik=json.dumps(test_kayit_sonuc.model_dump(), indent=4),
@@ -400,6 +423,9 @@ def test_toplu_guncelle(
         resp = servis.toplu_guncelle(
             csv_string=sample_csv3, dosyaya_yaz=True, cikti_dosya_yolu=dummy_output_path
         )
+        # processing time of the row is the only value not known in advance
+        icerik = json.loads(mock_write.call_args.kwargs["icerik"])
+        test_guncelleme_sonuc.sonuclar[0].sure = icerik["sonuclar"][0]["sure"]
         mock_write.assert_called_once_with(
             cikti_dosya_yolu=dummy_output_path,
             icerik=json.dumps(test_guncelleme_sonuc.model_dump(), indent=4),
@@ -437,3 +463,1153 @@ def test_cihaz_kapatma(
 
     resp = servis.cihaz_kapatma(esu_seri_no=test_esu.esu_seri_no)
     assert resp.sonuc[0].esu_seri_no == test_esu.esu_seri_no
+
+
+def test_esu_servis_oturum(
+    test_config: str, test_esu: ESU, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test pooled http session and context manager support."""
+
+    config = dotenv_values(stream=StringIO(test_config))
+
+    with ESUServis(_config=config, baglanti_havuzu_boyutu=4) as servis:
+        adapter = servis._oturum.get_adapter(str(servis._api.api_url))
+        assert servis._havuz_boyutu == 4
+        assert adapter._pool_maxsize == 4  # type: ignore[attr-defined]
+        assert servis._oturum.verify is False
+
+        mock_api.post(
+            f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}",
+            json=test_yanit.model_dump(),
+        )
+        servis.cihaz_kayit(test_esu)
+        servis.cihaz_kayit(test_esu)
+        assert mock_api.call_count == 2
+
+    servis = ESUServis(_config=config)
+    assert servis._havuz_boyutu == servis._eszamanlilik.azami == 32
+    with patch.object(servis._oturum, "close") as mock_close:
+        with servis:
+            pass
+    mock_close.assert_called_once()
+
+    with pytest.raises(ValueError) as e:
+        ESUServis(_config=config, baglanti_havuzu_boyutu=-1)
+    assert "baglanti_havuzu_boyutu" in e.value.args[0]
+
+
+def test_tek_gecisli_serilestirme(
+    test_config: str, test_esu: ESU, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test single-pass request serialization and response parsing."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    basliklar = servis._basliklar
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}",
+        content=test_yanit.model_dump_json().encode("utf-8"),
+    )
+
+    servis.logger.setLevel(logging.DEBUG)
+    with patch.object(servis.logger, "debug") as mock_debug:
+        resp = servis.cihaz_kayit(test_esu)
+    servis.logger.setLevel(logging.INFO)
+
+    beklenen = servis._kayit_modeli_hazirla(test_esu).model_dump_json()
+    assert resp == test_yanit
+    assert mock_api.last_request.body == beklenen.encode("utf-8")
+    assert json.loads(mock_api.last_request.body) == json.loads(beklenen)
+    mock_debug.assert_called_once_with(beklenen)
+    assert servis._basliklar is basliklar
+    assert mock_api.last_request.headers["Authorization"] == basliklar["Authorization"]
+
+    with patch.object(servis.logger, "debug") as mock_debug:
+        servis.cihaz_kayit(test_esu)
+    mock_debug.assert_not_called()
+
+
+def test_istek_govdesi_firma_bilgileri(
+    test_config: str, sample_csv: io.StringIO
+) -> None:
+    """Test that the request bodies of batch rows match `model_dump_json` and
+    start with the company fields of the instance."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    kayit = next(PyUtils.iter_csv(sample_csv))
+    firma = servis._firma.model_dump_json().encode("utf-8")
+    firma_kodu = FirmaKodu(firma_kodu=servis._firma.firma_kodu).model_dump_json()
+
+    kayit_modeli = servis._kayit_bilgisi_hazirla(kayit)
+    modeller: List[Any] = [
+        kayit_modeli,
+        servis._mukellef_bilgisi_hazirla(kayit, kayit_modeli.kayit_bilgisi),
+        servis._guncelleme_bilgisi_hazirla(kayit),
+        ESUKapatmaModel(
+            firma_kodu=servis._firma.firma_kodu,
+            kapatma_bilgisi=ESUSeriNo(esu_seri_no=kayit["esu_seri_no"]),
+        ),
+    ]
+    for model, onek in zip(modeller, [firma] + [firma_kodu.encode("utf-8")] * 3):
+        govde = servis._istek_govdesi(model)
+        assert govde == model.model_dump_json().encode("utf-8")
+        assert govde.startswith(onek[:-1] + b",")
+
+
+def test_paylasilan_satir_degerleri(test_config: str, sample_csv: io.StringIO) -> None:
+    """Test that rows repeating the charge point and location columns share
+    their validated models, and that invalid rows fail as before."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    ESUServis._ESU_SABLONLARI.clear()
+    ESUServis._LOKASYONLAR.clear()
+    kayit = next(PyUtils.iter_csv(sample_csv))
+
+    esu = servis._esu_bilgisi_hazirla(kayit)
+    diger = servis._esu_bilgisi_hazirla({**kayit, "esu_seri_no": " 124 "})
+    assert esu == servis._esu_olustur(kayit)
+    assert diger == servis._esu_olustur({**kayit, "esu_seri_no": "124"})
+    assert diger.esu_soket_detay[0] is esu.esu_soket_detay[0]
+    assert diger.esu_soket_detay is not esu.esu_soket_detay
+    assert diger.esu_markasi is esu.esu_markasi
+
+    # the error of a row is the one of the whole model
+    for hatali in ({**kayit, "esu_seri_no": " "}, {**kayit, "esu_markasi": ""}):
+        with pytest.raises(ValidationError) as hata:
+            servis._esu_bilgisi_hazirla(hatali)
+        with pytest.raises(ValidationError) as beklenen:
+            servis._esu_olustur(hatali)
+        assert str(hata.value) == str(beklenen.value)
+
+    lokasyon = servis._lokasyon_hazirla(kayit)
+    assert servis._lokasyon_hazirla(dict(kayit)) is lokasyon
+    assert servis._lokasyon_hazirla({**kayit, "koordinat": "1,2"}) is not lokasyon
+
+    istatistikler = ESUServis.ara_bellek_istatistikleri()
+    assert istatistikler["esu"].isabet == 2 and istatistikler["esu"].iska == 2
+    assert istatistikler["lokasyon"].boyut == 2
+    assert istatistikler["lokasyon"].isabet_orani == 1 / 3
+
+
+def test_hiz_limitleri(
+    test_config: str, test_esu: ESU, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test per service path rate limiting."""
+
+    config = dotenv_values(stream=StringIO(test_config))
+
+    servis = ESUServis(_config=config, hiz_limitleri=5)
+    assert set(servis._hiz_sinirlayicilar) == set(ESUServis._ISTEK_TIPI)
+
+    servis = ESUServis(
+        _config=config, hiz_limitleri={"/yeniEsuKayit": 2, "ESU_KAPATMA": 1}
+    )
+    limitler = servis._hiz_sinirlayicilar
+    assert limitler[ESUServis._ISTEK_TIPI.ESU_KAYIT].rate == 2
+    assert limitler[ESUServis._ISTEK_TIPI.ESU_KAPATMA].rate == 1
+    assert servis._hiz_siniri(ESUServis._ISTEK_TIPI.ESU_MUKELLEF) is None
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}",
+        json=test_yanit.model_dump(),
+    )
+    with patch("gib_esu.helpers.rate_limiter.time.sleep") as mock_sleep:
+        servis.cihaz_kayit(test_esu)
+        servis.cihaz_kayit(test_esu)
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args[0][0] <= 0.5
+
+    with pytest.raises(ValueError) as e:
+        ESUServis(_config=config, hiz_limitleri={"/yok": 1})
+    assert "/yok" in e.value.args[0]
+
+    paylasilan = [
+        ESUServis(_config=config, hiz_limitleri=1, hiz_limitini_paylas=True)
+        for _ in range(2)
+    ]
+    tip = ESUServis._ISTEK_TIPI.ESU_GUNCELLEME
+    assert paylasilan[0]._hiz_siniri(tip) is paylasilan[1]._hiz_siniri(tip)
+    assert servis._hiz_siniri(tip) is not paylasilan[0]._hiz_siniri(tip)
+
+
+def test_yeniden_deneme(
+    test_config: str, test_esu: ESU, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test retries with backoff according to per service path policies."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    kayit_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}"
+    guncelleme_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}"
+    basarili = {"json": test_yanit.model_dump()}
+    guncelleme = servis._guncelleme_modeli_hazirla(
+        esu_seri_no="123",
+        lokasyon=Lokasyon(il_kodu="034", ilce="Beşiktaş"),
+        fatura=Fatura(fatura_ettn="ff01", fatura_tarihi="2024-12-19"),
+    )
+
+    with patch("gib_esu.services.esu_service.time.sleep") as mock_sleep:
+        # unprocessed requests are retried even on non-idempotent paths
+        mock_api.post(
+            kayit_url,
+            [
+                {"exc": requests.exceptions.ConnectTimeout},
+                {"status_code": 429, "headers": {"Retry-After": "3"}},
+                basarili,
+            ],
+        )
+        assert servis.cihaz_kayit(test_esu) == test_yanit
+        assert mock_api.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert mock_sleep.call_args[0][0] == 3
+
+        # possibly processed requests are not retried on non-idempotent paths
+        mock_api.post(kayit_url, [{"exc": requests.exceptions.ReadTimeout}])
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            servis.cihaz_kayit(test_esu)
+        assert mock_api.call_count == 4
+
+        # but they are retried on idempotent paths
+        mock_api.post(
+            guncelleme_url,
+            [
+                {"status_code": 500, "text": "hata"},
+                {"exc": requests.exceptions.ReadTimeout},
+                basarili,
+            ],
+        )
+        assert servis.kayit_guncelle(guncelleme) == test_yanit
+        assert mock_api.call_count == 7
+
+        # retries are limited by `azami_deneme`
+        mock_api.post(guncelleme_url, [{"status_code": 503}] * 5 + [basarili])
+        with pytest.raises(ValidationError):
+            servis.kayit_guncelle(guncelleme)
+        assert mock_api.call_count == 10
+
+        # and by the batch retry budget
+        mock_api.post(guncelleme_url, [{"status_code": 503}, basarili])
+        islem = _TopluIslem()
+        islem.yeniden_deneme_butcesi = RetryBudget(0)
+        with servis._toplu_islemde(islem), pytest.raises(ValidationError):
+            servis.kayit_guncelle(guncelleme)
+        assert mock_api.call_count == 11
+
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)),
+        yeniden_deneme={"ESU_KAYIT": YenidenDenemePolitikasi(azami_deneme=1)},
+    )
+    politikalar = servis._yeniden_deneme_politikalari
+    assert politikalar[ESUServis._ISTEK_TIPI.ESU_KAYIT].azami_deneme == 1
+    assert politikalar[ESUServis._ISTEK_TIPI.ESU_GUNCELLEME].idempotent
+    mock_api.post(kayit_url, [{"exc": requests.exceptions.ConnectTimeout}])
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        servis.cihaz_kayit(test_esu)
+
+    assert ESUServis._istek_gonderilmedi(
+        requests.exceptions.ConnectionError(
+            MaxRetryError(
+                cast(Any, None), "/", NewConnectionError(cast(Any, None), "yok")
+            )
+        )
+    )
+    assert not ESUServis._istek_gonderilmedi(
+        requests.exceptions.ConnectionError(ConnectionResetError())
+    )
+
+
+def test_toplu_yeniden_deneme_butcesi(
+    sample_csv: io.StringIO, test_config: str, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test that batch methods apply and then release the retry budget."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        [{"status_code": 503}, {"json": test_yanit.model_dump()}],
+    )
+    with patch("gib_esu.services.esu_service.time.sleep"):
+        resp = servis.toplu_guncelle(csv_string=sample_csv, yeniden_deneme_butcesi=1)
+    assert TopluGuncellemeSonuc(**resp).toplam == 1
+    assert mock_api.call_count == 2
+    assert _TOPLU_ISLEM.get() is None
+
+
+def test_zaman_asimi_ve_sure_siniri(
+    sample_csv: io.StringIO,
+    test_config: str,
+    test_esu: ESU,
+    test_yanit: Yanit,
+    mock_api: Any,
+) -> None:
+    """Test per-endpoint timeouts and the time limit of batch methods."""
+
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)),
+        zaman_asimi={"ESU_KAYIT": ZamanAsimi(baglanti=2, okuma=5)},
+    )
+    mock_api.post(requests_mock.ANY, json=test_yanit.model_dump())
+
+    servis.cihaz_kayit(test_esu)
+    assert mock_api.last_request.timeout == (2.0, 5.0)
+    servis.cihaz_kapatma(esu_seri_no="123")
+    assert mock_api.last_request.timeout == (10.0, 60.0)
+
+    with pytest.raises(ValueError):
+        ESUServis(
+            _config=dotenv_values(stream=StringIO(test_config)),
+            zaman_asimi={"/bilinmeyen": ZamanAsimi()},
+        )
+
+    mock_api.reset_mock()
+    resp = servis.toplu_kayit(csv_string=sample_csv, sure_siniri=0)
+    sonuc = TopluKayitSonuc(**resp)
+    assert sonuc.toplam == 0
+    assert sonuc.gonderilmeyenler == ["123"]
+    assert mock_api.call_count == 0
+
+
+def test_devre_kesici(
+    test_config: str, test_esu: ESU, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test that the circuit breaker fails fast after consecutive failures."""
+
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)),
+        devre_kesici=DevreKesici(hata_esigi=2, sistemik_kodlar=frozenset({"9999"})),
+    )
+    url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}"
+
+    # systemic result codes count as failures
+    yanit = test_yanit.model_copy(deep=True)
+    yanit.sonuc[0].kod = "9999"
+    mock_api.post(url, json=yanit.model_dump())
+    servis.cihaz_kayit(test_esu)
+    servis.cihaz_kayit(test_esu)
+    with pytest.raises(CircuitOpenError):
+        servis.cihaz_kayit(test_esu)
+    assert mock_api.call_count == 2
+
+    # rejected credentials open the circuit, remaining rows are not sent
+    servis._devre_kesici.record_success()
+    mock_api.reset_mock()
+    mock_api.post(url, status_code=401, text="Unauthorized")
+    rows = "".join(
+        f"\n{i},AC,1,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P0{i},,,,,,"
+        for i in range(1, 11)
+    )
+    csv = io.StringIO(
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan" + rows
+    )
+    resp = servis.toplu_kayit(csv_string=csv, paralel_calistir=True)
+    sonuc = TopluKayitSonuc(**resp)
+    assert 2 <= mock_api.call_count < 10
+    # rejected rows are reported as failed, the rest are not sent
+    assert sonuc.toplam == mock_api.call_count
+    assert all(s.durum == IslemDurumu.HATALI for s in sonuc.sonuclar)
+    assert all("ValidationError" in str(s.hata) for s in sonuc.sonuclar)
+    assert len(sonuc.gonderilmeyenler) == 10 - mock_api.call_count
+
+
+def test_toplu_sonuc_sirasi(test_config: str, test_yanit: Yanit, mock_api: Any) -> None:
+    """Test that batch results keep the input order and record failed rows."""
+
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)),
+        baglanti_havuzu_boyutu=4,
+    )
+
+    def yanit(request: Any, context: Any) -> Any:
+        seri_no = request.json()["guncelleme_istek_bilgileri"]["esu_seri_no"]
+        if seri_no == "5":
+            context.status_code = 400
+            return {}
+        sonuc = test_yanit.model_copy(deep=True)
+        sonuc.sonuc[0].esu_seri_no = seri_no
+        return sonuc.model_dump()
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}", json=yanit
+    )
+    csv = io.StringIO(
+        "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n"
+        + "".join(f"{i},034,Üsküdar,2024-08-29,P0{i}\n" for i in range(1, 21))
+    )
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=csv, paralel_calistir=True)
+    )
+
+    assert sonuc.toplam == 20
+    assert [s.sira for s in sonuc.sonuclar] == list(range(1, 21))
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == [str(i) for i in range(1, 21)]
+    assert all(s.sure is not None and s.sure >= 0 for s in sonuc.sonuclar)
+    hatali = [s for s in sonuc.sonuclar if s.durum == IslemDurumu.HATALI]
+    assert [s.esu_seri_no for s in hatali] == ["5"]
+    assert hatali[0].hata is not None and hatali[0].guncelleme_kayit_sonucu == ""
+    assert sonuc.eszamanlilik == 4  # fixed concurrency of the connection pool
+
+
+def test_uyarlanabilir_eszamanlilik(
+    test_config: str, test_yanit: Yanit, mock_api: Any
+) -> None:
+    """Test adaptive concurrency of parallel batch methods."""
+
+    ayar = EszamanlilikAyari(baslangic=2, asgari=1, azami=6)
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)), eszamanlilik=ayar
+    )
+    assert servis._havuz_boyutu == 6
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=test_yanit.model_dump(),
+    )
+    csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(
+        f"{i},034,Üsküdar,2024-08-29,P0{i}\n" for i in range(1, 41)
+    )
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=io.StringIO(csv), paralel_calistir=True)
+    )
+    assert sonuc.toplam == 40
+    assert sonuc.eszamanlilik is not None
+    assert ayar.asgari <= sonuc.eszamanlilik <= ayar.azami
+    assert _TOPLU_ISLEM.get() is None
+
+    # sequential runs do not report a concurrency
+    sonuc = TopluGuncellemeSonuc(**servis.toplu_guncelle(csv_string=io.StringIO(csv)))
+    assert sonuc.eszamanlilik is None
+
+    with pytest.raises(ValidationError):
+        EszamanlilikAyari(baslangic=8, azami=4)
+
+
+def test_gunluk_ile_devam(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any
+) -> None:
+    """Test resuming batch registration from the journal of a previous run."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    kayit_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}"
+    mukellef_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_MUKELLEF}"
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan"
+        + "".join(
+            f"\n{i},AC,1,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P0{i},,,,,,"
+            for i in range(1, 11)
+        )
+    )
+    gunluk = str(tmp_path / "gunluk.jsonl")
+
+    # charge points are registered, tax payer registration fails
+    kayit = mock_api.post(kayit_url, json=test_yanit.model_dump())
+    mock_api.post(mukellef_url, status_code=400, json={})
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk)
+    )
+    assert all(s.durum == IslemDurumu.HATALI for s in sonuc.sonuclar)
+    assert kayit.call_count == 10
+    assert _TOPLU_ISLEM.get() is None
+
+    # registered charge points are not registered again
+    mukellef = mock_api.post(mukellef_url, json=test_yanit.model_dump())
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(
+            csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk, devam_et=True
+        )
+    )
+    assert sonuc.toplam == 10 and sonuc.atlananlar == []
+    assert all(s.durum == IslemDurumu.BASARILI for s in sonuc.sonuclar)
+    assert sonuc.sonuclar[0].esu_kayit_sonucu == test_yanit.sonuc[0].mesaj
+    assert kayit.call_count == 10
+    assert mukellef.call_count == 10
+
+    # completed rows are skipped altogether
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(
+            csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk, devam_et=True
+        )
+    )
+    assert sonuc.toplam == 0
+    assert sonuc.atlananlar == [str(i) for i in range(1, 11)]
+    assert kayit.call_count == mukellef.call_count == 10
+
+    # a run without resuming starts a new journal
+    servis.toplu_kayit(csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk)
+    assert kayit.call_count == mukellef.call_count == 20
+
+
+def test_gunluk_ile_devam_reddedilenler(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any
+) -> None:
+    """Test that resuming from the journal sends the rejected requests again."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    kayit_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}"
+    mukellef_url = f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_MUKELLEF}"
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan"
+        + "".join(
+            f"\n{i},AC,1,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P0{i},,,,,,"
+            for i in range(1, 6)
+        )
+    )
+    gunluk = str(tmp_path / "gunluk.jsonl")
+
+    # GIB rejects the charge points
+    reddedilen = test_yanit.model_copy(update={"durum": Durum.FAILURE})
+    kayit = mock_api.post(kayit_url, json=reddedilen.model_dump())
+    mukellef = mock_api.post(mukellef_url, json=test_yanit.model_dump())
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk)
+    )
+    assert all(s.durum == IslemDurumu.REDDEDILDI for s in sonuc.sonuclar)
+    assert kayit.call_count == 5
+
+    # rejected requests are sent again when resuming
+    kayit = mock_api.post(kayit_url, json=test_yanit.model_dump())
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(
+            csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk, devam_et=True
+        )
+    )
+    assert sonuc.toplam == 5 and sonuc.atlananlar == []
+    assert all(s.durum == IslemDurumu.BASARILI for s in sonuc.sonuclar)
+    assert kayit.call_count == mukellef.call_count == 5
+
+    # and are skipped once accepted
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(
+            csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk, devam_et=True
+        )
+    )
+    assert sonuc.atlananlar == [str(i) for i in range(1, 6)]
+    assert kayit.call_count == mukellef.call_count == 5
+
+
+def test_gunluk_ayni_seri_no(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any
+) -> None:
+    """Test that rows sharing a serial number are all sent with a journal."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=test_yanit.model_dump(),
+    )
+    csv = (
+        "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n"
+        "1,034,Üsküdar,2024-08-29,P01\n"
+        "1,034,Kadıköy,2024-08-29,P01\n"
+    )
+    gunluk = str(tmp_path / "gunluk.jsonl")
+
+    # the journal of this run does not skip the second row
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk)
+    )
+    assert guncelleme.call_count == 2
+    assert sonuc.toplam == 2 and sonuc.atlananlar == []
+    assert "Kad" in guncelleme.last_request.text
+
+    # both rows are completed in a previous run when resuming
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(
+            csv_string=io.StringIO(csv), gunluk_dosya_yolu=gunluk, devam_et=True
+        )
+    )
+    assert guncelleme.call_count == 2
+    assert sonuc.atlananlar == ["1", "1"]
+
+
+def test_degisen_kayitlarin_guncellenmesi(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any
+) -> None:
+    """Test that incremental batch updates send only new or changed rows."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=test_yanit.model_dump(),
+    )
+    anlik_goruntu = str(tmp_path / "anlik_goruntu.json")
+    satirlar = [f"{i},034,Üsküdar,2024-08-29,P0{i}\n" for i in range(1, 11)]
+
+    def guncelle() -> TopluGuncellemeSonuc:
+        csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(satirlar)
+        return TopluGuncellemeSonuc(
+            **servis.toplu_guncelle(
+                csv_string=io.StringIO(csv),
+                paralel_calistir=True,
+                anlik_goruntu_dosya_yolu=anlik_goruntu,
+            )
+        )
+
+    sonuc = guncelle()
+    assert sonuc.toplam == 10 and sonuc.degismeyen == 0
+    assert guncelle().degismeyen == 10
+    assert guncelleme.call_count == 10
+
+    # a changed and a new row are sent, the rest are not
+    satirlar[2] = "3,034,Kadıköy,2024-08-29,P03\n"
+    satirlar.append("11,034,Üsküdar,2024-08-29,P011\n")
+    sonuc = guncelle()
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == ["3", "11"]
+    assert sonuc.degismeyen == 9
+    assert guncelleme.call_count == 12
+
+    # rejected updates are sent again
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=test_yanit.model_copy(update={"durum": Durum.FAILURE}).model_dump(),
+    )
+    satirlar[0] = "1,034,Kadıköy,2024-08-29,P01\n"
+    assert guncelle().toplam == 1
+    assert guncelle().toplam == 1
+    assert _TOPLU_ISLEM.get() is None
+
+
+@pytest.mark.parametrize("dosya_adi", ["rapor.jsonl", "rapor.jsonl.gz"])
+def test_akan_rapor(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any, dosya_adi: str
+) -> None:
+    """Test batch reports streamed as json lines."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=test_yanit.model_dump(),
+    )
+    csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(
+        f"{i},034,Üsküdar,2024-08-29,P0{i}\n" for i in range(1, 11)
+    )
+    yol = str(tmp_path / dosya_adi)
+    with patch.object(servis, "_dosyaya_yaz") as mock_write:
+        sonuc = servis.toplu_guncelle(
+            csv_string=io.StringIO(csv),
+            dosyaya_yaz=True,
+            cikti_dosya_yolu=yol,
+            paralel_calistir=True,
+        )
+    mock_write.assert_not_called()
+
+    with gzip.open(yol, "rt") if yol.endswith(".gz") else open(yol) as rapor:
+        satirlar = [json.loads(satir) for satir in rapor]
+    assert sorted(satir["sira"] for satir in satirlar[:-1]) == list(range(1, 11))
+    assert satirlar[-1] == {
+        "ozet": {
+            "toplam": 10,
+            "gonderilmeyenler": [],
+            "atlananlar": [],
+            "degismeyen": 0,
+            "eszamanlilik": sonuc["eszamanlilik"],
+        }
+    }
+
+    # the summary line holds the fields of the batch result model only
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAPATMA}",
+        json=test_yanit.model_dump(),
+    )
+    servis.toplu_kapatma(
+        seri_nolar=(str(i) for i in range(1, 11)),
+        dosyaya_yaz=True,
+        cikti_dosya_yolu=yol,
+    )
+    with gzip.open(yol, "rt") if yol.endswith(".gz") else open(yol) as rapor:
+        satirlar = [json.loads(satir) for satir in rapor]
+    assert "degismeyen" not in satirlar[-1]["ozet"]
+    assert set(satirlar[-1]["ozet"]) <= set(TopluKapatmaSonuc.model_fields)
+
+
+def test_toplu_kapatma(test_config: str, test_yanit: Yanit, mock_api: Any) -> None:
+    """Test batch delisting from serial numbers and from csv input."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    kapatma = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAPATMA}",
+        json=test_yanit.model_dump(),
+    )
+
+    sonuc = TopluKapatmaSonuc(
+        **servis.toplu_kapatma(
+            seri_nolar=(str(i) for i in range(1, 11)), paralel_calistir=True
+        )
+    )
+    assert sonuc.toplam == 10
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == [str(i) for i in range(1, 11)]
+    assert all(s.kapatma_sonucu == test_yanit.sonuc[0].mesaj for s in sonuc.sonuclar)
+    assert kapatma.call_count == 10
+
+    # rows without a serial number fail on their own
+    sonuc = TopluKapatmaSonuc(
+        **servis.toplu_kapatma(csv_string=io.StringIO("esu_seri_no,not\n11,\n,x\n"))
+    )
+    assert [s.durum for s in sonuc.sonuclar] == [
+        IslemDurumu.BASARILI,
+        IslemDurumu.HATALI,
+    ]
+    assert kapatma.call_count == 11
+
+
+def test_on_dogrulama(test_config: str, test_yanit: Yanit, mock_api: Any) -> None:
+    """Test validating the batch input across processes before sending."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    servis._DOGRULAMA_ISLEM_BASINA_SATIR = 2
+    kayit = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}",
+        json=test_yanit.model_dump(),
+    )
+    mukellef = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_MUKELLEF}",
+        json=test_yanit.model_dump(),
+    )
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan"
+        + "".join(
+            f"\n{i},{'XX' if i in (3, 7) else 'AC'},1,Soket1:AC,Vestel,EVC04,034,"
+            f"Üsküdar,2024-08-29,P0{i},,,,,,"
+            for i in range(1, 11)
+        )
+    )
+
+    # the request models of the valid rows are built in a process pool
+    with patch("gib_esu.services.base_service.os.cpu_count", return_value=2):
+        with patch.object(
+            servis, "_esu_bilgisi_hazirla", wraps=servis._esu_bilgisi_hazirla
+        ) as mock_hazirla:
+            sonuc = TopluKayitSonuc(
+                **servis.toplu_kayit(
+                    csv_string=io.StringIO(csv),
+                    paralel_calistir=True,
+                    on_dogrulama=True,
+                )
+            )
+    assert sonuc.dogrulama is not None and sonuc.dogrulama.toplam == 10
+    assert [(h.sira, h.esu_seri_no) for h in sonuc.dogrulama.hatalar] == [
+        (3, "3"),
+        (7, "7"),
+    ]
+    assert "esu_soket_tipi" in sonuc.dogrulama.hatalar[0].hata
+    assert [s.durum for s in sonuc.sonuclar].count(IslemDurumu.HATALI) == 2
+    assert kayit.call_count == mukellef.call_count == 8
+    assert mock_hazirla.call_count == 2  # only the invalid rows are built again
+    assert _TOPLU_ISLEM.get() is None
+
+    # nothing is sent when the error rate is above the threshold
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(csv_string=io.StringIO(csv), azami_hata_orani=0.1)
+    )
+    assert sonuc.toplam == 0 and sonuc.sonuclar == []
+    assert sonuc.gonderilmeyenler == [str(i) for i in range(1, 11)]
+    assert sonuc.dogrulama is not None and sonuc.dogrulama.hata_orani == 0.2
+    assert kayit.call_count == 8
+
+    with pytest.raises(ValueError):
+        servis.toplu_kayit(csv_string=io.StringIO(csv), azami_hata_orani=2)
+
+
+def test_kuru_calistirma(test_config: str, mock_api: Any, tmp_path: Any) -> None:
+    """Test dry runs writing the request payloads without sending them."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan\n"
+        "1,AC,1,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P01,,,,,,\n"
+        "2,AC,2,Soket1:AC,Vestel,EVC04,034,Üsküdar,2024-08-29,P02,,,,,,\n"
+    )
+    yol = str(tmp_path / "kuru.jsonl")
+
+    sonuc = KuruCalistirmaSonucu(
+        **servis.toplu_kayit(
+            csv_string=io.StringIO(csv), kuru_calistir=True, cikti_dosya_yolu=yol
+        )
+    )
+    assert mock_api.call_count == 0
+    assert sonuc.toplam == 2 and sonuc.cikti_dosya_yolu == yol
+    assert [h.esu_seri_no for h in sonuc.hatalar] == ["2"]
+    assert "esu_soket_sayisi" in sonuc.hatalar[0].hata
+    assert sonuc.toplam_sure >= sonuc.dogrulama_suresi > 0
+
+    with open(yol, encoding="utf-8") as cikti:
+        satirlar = [json.loads(satir) for satir in cikti]
+    assert len(satirlar) == 3
+    istekler = satirlar[0]["istekler"]
+    assert list(istekler) == ["/yeniEsuKayit", "/esuMukellefDurum"]
+    assert istekler["/yeniEsuKayit"] == json.loads(
+        servis._istek_govdesi(
+            servis._kayit_modeli_hazirla(
+                servis._esu_bilgisi_hazirla(next(PyUtils.iter_csv(io.StringIO(csv))))
+            )
+        )
+    )
+    assert set(satirlar[0]["sure"]) == {"okuma", "dogrulama", "serilestirme"}
+    assert satirlar[1]["sira"] == 2 and "hata" in satirlar[1]
+    assert satirlar[2]["ozet"]["toplam"] == 2
+
+    # delisting payloads need only the serial numbers
+    sonuc = KuruCalistirmaSonucu(
+        **servis.toplu_kapatma(
+            seri_nolar=["1"], kuru_calistir=True, cikti_dosya_yolu=yol
+        )
+    )
+    assert sonuc.toplam == 1 and sonuc.hatalar == []
+    assert mock_api.call_count == 0
+
+
+def test_hatali_kayitlar(test_config: str, mock_api: Any, tmp_path: Any) -> None:
+    """Test capturing failed rows and exporting them for a rerun."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    gonderilenler: List[str] = []
+    gecici_hatalar = {"4"}
+
+    def yanit(request: Any, context: Any) -> Any:
+        seri_no = request.json()["guncelleme_istek_bilgileri"]["esu_seri_no"]
+        gonderilenler.append(seri_no)
+        if seri_no in gecici_hatalar:
+            gecici_hatalar.remove(seri_no)
+            context.status_code = 503
+            return {}
+        basarili = seri_no != "2"
+        return Yanit(
+            durum=Durum.SUCCESS if basarili else Durum.FAILURE,
+            sonuc=[
+                Sonuc(
+                    esu_seri_no=seri_no,
+                    sira_no=1,
+                    kod="1000" if basarili else "2001",
+                    mesaj="Basarili" if basarili else "Kayit bulunamadi",
+                )
+            ],
+        ).model_dump()
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}", json=yanit
+    )
+    csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(
+        f"{i},034,{'' if i == 5 else 'Üsküdar'},2024-08-29,P0{i}\n" for i in range(1, 7)
+    )
+    hatali = str(tmp_path / "hatali.csv")
+
+    with patch("gib_esu.services.esu_service.time.sleep"):
+        sonuc = TopluGuncellemeSonuc(
+            **servis.toplu_guncelle(
+                csv_string=io.StringIO(csv),
+                paralel_calistir=True,
+                hatali_kayit_dosya_yolu=hatali,
+            )
+        )
+    durumlar = {s.esu_seri_no: s for s in sonuc.sonuclar}
+    assert durumlar["2"].durum == IslemDurumu.REDDEDILDI
+    assert (durumlar["2"].kod, durumlar["2"].hata) == ("2001", "Kayit bulunamadi")
+    assert durumlar["4"].durum == IslemDurumu.BASARILI
+    assert durumlar["4"].deneme == 2 and durumlar["1"].deneme == 1
+    assert durumlar["5"].durum == IslemDurumu.HATALI and durumlar["5"].deneme == 0
+    assert durumlar["5"].girdi == {
+        "esu_seri_no": "5",
+        "il_kodu": "034",
+        "ilce": "",
+        "fatura_tarihi": "2024-08-29",
+        "fatura_ettn": "P05",
+    }
+    assert durumlar["1"].girdi is None
+
+    # only the failed rows are sent again from the exported file
+    gonderilenler.clear()
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(giris_dosya_yolu=hatali, hatali_kayit_dosya_yolu=hatali)
+    )
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == ["2", "5"]
+    assert gonderilenler == ["2"]
+    assert [kayit["esu_seri_no"] for kayit in PyUtils.read_csv(hatali)] == ["2", "5"]
+
+
+def test_asama_hatasi_eszamanlilik(test_config: str, mock_api: Any) -> None:
+    """Test that a row whose stage raises frees its concurrency slot."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    sinirlayicilar = []
+    sinirla = servis._eszamanlilik_siniri
+
+    def eszamanlilik_siniri() -> Any:
+        sinirlayicilar.append(sinirla())
+        return sinirlayicilar[-1]
+
+    csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(
+        f"{i},034,Üsküdar,2024-08-29,P0{i}\n" for i in range(1, 6)
+    )
+    with patch.object(
+        servis, "_eszamanlilik_siniri", eszamanlilik_siniri
+    ), patch.object(servis, "_satir_takibi", side_effect=RuntimeError("hata")):
+        servis.toplu_guncelle(csv_string=io.StringIO(csv), paralel_calistir=True)
+    assert sinirlayicilar[0].in_flight == 0
+
+
+@pytest.mark.parametrize("paralel", [False, True])
+def test_kayit_asamalari(
+    test_config: str, test_yanit: Yanit, mock_api: Any, paralel: bool
+) -> None:
+    """Test that tax payers are registered only after their charge points."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+
+    def cihaz_yaniti(request: Any, context: Any) -> Any:
+        seri_no = request.json()["kayit_bilgisi"]["esu_seri_no"]
+        basarili = seri_no not in ("2", "5")
+        return Yanit(
+            durum=Durum.SUCCESS if basarili else Durum.FAILURE,
+            sonuc=[
+                Sonuc(
+                    esu_seri_no=seri_no,
+                    sira_no=1,
+                    kod="1000" if basarili else "2002",
+                    mesaj="Basarili" if basarili else "Cihaz zaten kayitli",
+                )
+            ],
+        ).model_dump()
+
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}", json=cihaz_yaniti
+    )
+    mukellef = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_MUKELLEF}",
+        json=test_yanit.model_dump(),
+    )
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan"
+        + "".join(
+            f"\n{i},AC,1,Soket1:AC,Vestel,EVC04,034," f"Üsküdar,2024-08-29,P0{i},,,,,,"
+            for i in range(1, 7)
+        )
+    )
+
+    sonuc = TopluKayitSonuc(
+        **servis.toplu_kayit(csv_string=io.StringIO(csv), paralel_calistir=paralel)
+    )
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == [str(i) for i in range(1, 7)]
+    gonderilen = sorted(
+        istek.json()["durum_bilgileri"]["esu_seri_no"]
+        for istek in mukellef.request_history
+    )
+    assert gonderilen == ["1", "3", "4", "6"]
+    for satir in sonuc.sonuclar:
+        if satir.esu_seri_no in ("2", "5"):
+            assert satir.durum == IslemDurumu.REDDEDILDI
+            assert (satir.kod, satir.hata) == ("2002", "Cihaz zaten kayitli")
+            assert satir.esu_kayit_sonucu == "Cihaz zaten kayitli"
+            assert satir.mukellef_kayit_sonucu == ""
+            assert satir.gonderilmeyen_istekler == [
+                ESUServis._ISTEK_TIPI.ESU_MUKELLEF.value
+            ]
+            assert satir.deneme == 1
+        else:
+            assert satir.durum == IslemDurumu.BASARILI
+            assert satir.mukellef_kayit_sonucu == test_yanit.sonuc[0].mesaj
+            assert satir.gonderilmeyen_istekler is None
+            assert satir.deneme == 2
+
+
+@pytest.mark.parametrize("paralel", [False, True])
+def test_asama_hatasi(
+    test_config: str, test_yanit: Yanit, mock_api: Any, tmp_path: Any, paralel: bool
+) -> None:
+    """Test that a row whose stage raises is reported as failed."""
+
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_KAYIT}",
+        json=test_yanit.model_dump(),
+    )
+    mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_MUKELLEF}",
+        json=test_yanit.model_dump(),
+    )
+    csv = (
+        "esu_seri_no,esu_soket_tipi,esu_soket_sayisi,esu_soket_detay,"
+        "esu_markasi,esu_modeli,il_kodu,ilce,fatura_tarihi,fatura_ettn,"
+        "mukellef_vkn,mukellef_unvan,sertifika_no,sertifika_tarihi,"
+        "mulkiyet_sahibi_vkn_tckn,mulkiyet_sahibi_ad_unvan"
+        + "".join(
+            f"\n{i},AC,1,Soket1:AC,Vestel,EVC04,034," f"Üsküdar,2024-08-29,P0{i},,,,,,"
+            for i in range(1, 6)
+        )
+    )
+    rapor = str(tmp_path / "rapor.jsonl")
+    hatali = str(tmp_path / "hatali.csv")
+    gunlukte_tamamlandi = servis._gunlukte_tamamlandi
+    mukellef_kaydi_isle = servis._mukellef_kaydi_isle
+
+    # the journal lookup of the first stage raises for the second row and
+    # the second stage raises for the fourth row
+    def gunlukte_ara(kayit: Any, istek_tipleri: Any) -> bool:
+        if kayit["esu_seri_no"] == "2":
+            raise RuntimeError("gunluk okunamadi")
+        return gunlukte_tamamlandi(kayit, istek_tipleri)
+
+    def mukellef_kaydet(kayit: Any, sonuc: Any) -> None:
+        if kayit["esu_seri_no"] == "4":
+            raise RuntimeError("mukellef hazirlanamadi")
+        mukellef_kaydi_isle(kayit, sonuc)
+
+    with patch.object(servis, "_gunlukte_tamamlandi", gunlukte_ara), patch.object(
+        servis, "_mukellef_kaydi_isle", mukellef_kaydet
+    ):
+        sonuc = TopluKayitSonuc(
+            **servis.toplu_kayit(
+                csv_string=io.StringIO(csv),
+                paralel_calistir=paralel,
+                dosyaya_yaz=True,
+                cikti_dosya_yolu=rapor,
+                hatali_kayit_dosya_yolu=hatali,
+            )
+        )
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == [str(i) for i in range(1, 6)]
+    durumlar = {s.esu_seri_no: s for s in sonuc.sonuclar}
+    assert durumlar["2"].durum == IslemDurumu.HATALI
+    assert durumlar["2"].hata == "RuntimeError: gunluk okunamadi"
+    assert durumlar["2"].sira == 2 and durumlar["2"].esu_kayit_sonucu == ""
+    assert durumlar["2"].gonderilmeyen_istekler == [
+        ESUServis._ISTEK_TIPI.ESU_MUKELLEF.value
+    ]
+    assert durumlar["4"].durum == IslemDurumu.HATALI
+    assert durumlar["4"].hata == "RuntimeError: mukellef hazirlanamadi"
+    assert durumlar["4"].esu_kayit_sonucu == test_yanit.sonuc[0].mesaj
+    assert durumlar["4"].gonderilmeyen_istekler is None
+    for seri_no in ("1", "3", "5"):
+        assert durumlar[seri_no].durum == IslemDurumu.BASARILI
+    assert sonuc.gonderilmeyenler == []
+
+    with open(rapor, encoding="utf-8") as dosya:
+        satirlar = [json.loads(satir) for satir in dosya]
+    assert sorted(satir["esu_seri_no"] for satir in satirlar[:-1]) == [
+        str(i) for i in range(1, 6)
+    ]
+    assert [kayit["esu_seri_no"] for kayit in PyUtils.read_csv(hatali)] == ["2", "4"]
+
+
+def test_oncu_gonderim(test_config: str, test_yanit: Yanit, mock_api: Any) -> None:
+    """Test stopping a batch when its canary rows reveal a systemic failure."""
+
+    # default circuit breaker settings, no result code is listed as systemic
+    servis = ESUServis(_config=dotenv_values(stream=StringIO(test_config)))
+    hatali_yanit = Yanit(
+        durum=Durum.FAILURE,
+        sonuc=[
+            Sonuc(
+                esu_seri_no="1",
+                sira_no=1,
+                kod="2005",
+                mesaj="Firma kodu hatali",
+            )
+        ],
+    )
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        json=hatali_yanit.model_dump(),
+    )
+    # the first row is invalid and not sent, it is not a canary row
+    csv = "esu_seri_no,il_kodu,ilce,fatura_tarihi,fatura_ettn\n" + "".join(
+        f"{i},034,{'' if i == 1 else 'Üsküdar'},2024-08-29,P0{i}\n"
+        for i in range(1, 11)
+    )
+
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(
+            csv_string=io.StringIO(csv), paralel_calistir=True, oncu_kayit_sayisi=3
+        )
+    )
+    assert guncelleme.call_count == 3
+    assert [s.esu_seri_no for s in sonuc.sonuclar] == ["1", "2", "3", "4"]
+    assert sonuc.gonderilmeyenler == [str(i) for i in range(5, 11)]
+    assert sonuc.durdurma_nedeni is not None
+    assert "tümünde aynı hata" in sonuc.durdurma_nedeni
+    assert "[2005] Firma kodu hatali" in sonuc.durdurma_nedeni
+
+    # the batch goes on when a canary row is accepted
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        [{"json": hatali_yanit.model_dump()}, {"json": test_yanit.model_dump()}],
+    )
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=io.StringIO(csv), oncu_kayit_sayisi=3)
+    )
+    assert guncelleme.call_count == 9
+    assert sonuc.toplam == 10 and sonuc.gonderilmeyenler == []
+    assert sonuc.durdurma_nedeni is None
+
+    # and when the canary rows are rejected for reasons of their own
+    def satira_ozgu_yanit(kod: str) -> dict:
+        return hatali_yanit.model_copy(
+            update={
+                "sonuc": [
+                    Sonuc(esu_seri_no="1", sira_no=1, kod=kod, mesaj="Satir hatali")
+                ]
+            }
+        ).model_dump()
+
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        [{"json": satira_ozgu_yanit(kod)} for kod in ("2010", "2011", "2012")],
+    )
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(
+            csv_string=io.StringIO(csv), paralel_calistir=True, oncu_kayit_sayisi=3
+        )
+    )
+    assert guncelleme.call_count == 9
+    assert sonuc.toplam == 10 and sonuc.gonderilmeyenler == []
+    assert [s.durum for s in sonuc.sonuclar].count(IslemDurumu.REDDEDILDI) == 9
+    assert sonuc.durdurma_nedeni is None
+
+    # nothing else is sent while the circuit breaker is open
+    for _ in range(servis._devre_kesici.failure_threshold):
+        servis._devre_kesici.record_failure()
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=io.StringIO(csv), oncu_kayit_sayisi=3)
+    )
+    assert guncelleme.call_count == 9
+    assert sonuc.toplam == 1 and len(sonuc.gonderilmeyenler) == 9
+    assert sonuc.durdurma_nedeni is not None
+    assert "devre kesici" in sonuc.durdurma_nedeni
+
+    # batches without canary rows are not stopped
+    sonuc = TopluGuncellemeSonuc(**servis.toplu_guncelle(csv_string=io.StringIO(csv)))
+    assert len(sonuc.gonderilmeyenler) == 9 and sonuc.durdurma_nedeni is None
+
+    # a result code listed as systemic stops the batch on a single canary row
+    servis = ESUServis(
+        _config=dotenv_values(stream=StringIO(test_config)),
+        devre_kesici=DevreKesici(sistemik_kodlar=frozenset({"2005"})),
+    )
+    guncelleme = mock_api.post(
+        f"{servis._api.api_url}{ESUServis._ISTEK_TIPI.ESU_GUNCELLEME}",
+        [{"json": test_yanit.model_dump()}, {"json": hatali_yanit.model_dump()}]
+        + [{"json": test_yanit.model_dump()}],
+    )
+    sonuc = TopluGuncellemeSonuc(
+        **servis.toplu_guncelle(csv_string=io.StringIO(csv), oncu_kayit_sayisi=3)
+    )
+    assert guncelleme.call_count == 3
+    assert sonuc.durdurma_nedeni is not None
+    assert "sistemik hata kodu" in sonuc.durdurma_nedeni
+
+    with pytest.raises(ValueError):
+        servis.toplu_guncelle(csv_string=io.StringIO(csv), oncu_kayit_sayisi=-1)
@@ -0,0 +1,25 @@
+import pytest
+
+from gib_esu.testing.build_benchmark import BUILDERS, main, run_build_benchmark
+
+
+def test_run_build_benchmark() -> None:
+    """Test build cost measurements of every request model."""
+
+    reports = run_build_benchmark(rows=20, repeat=1)
+    assert [report.model for report in reports] == list(BUILDERS)
+    for report in reports:
+        assert report.rows == 20
+        assert report.validating > 0 and report.trusted > 0
+        assert report.speedup == pytest.approx(report.validating / report.trusted)
+
+    with pytest.raises(ValueError):
+        run_build_benchmark(rows=0)
+
+
+def test_build_benchmark_main(capsys: pytest.CaptureFixture) -> None:
+    """Test the command line entry point."""
+
+    reports = main(["--rows", "5", "--repeat", "1", "--models", "mukellef"])
+    assert [report.model for report in reports] == ["mukellef"]
+    assert "mukellef" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+import requests
+
+from gib_esu.models.response_models import Durum, Yanit
+from gib_esu.testing import FakeGIBServer, run_load_test
+from gib_esu.testing.fake_gib import INVALID_PAYLOAD_CODE, SUCCESS_CODE
+from gib_esu.testing.load_test import CONFIG, generate_csv, main
+
+KAPATMA = json.dumps(
+    {"firma_kodu": "J000", "kapatma_bilgisi": {"esu_seri_no": "123"}}
+).encode()
+
+
+def test_fake_gib_server() -> None:
+    """Test payload validation, error injection and throttling of the fake server."""
+
+    with FakeGIBServer() as server:
+        yanit = Yanit.model_validate_json(
+            requests.post(f"{server.url}/esuKapatma", data=KAPATMA).content
+        )
+        assert yanit.durum == Durum.SUCCESS
+        assert yanit.sonuc[0].esu_seri_no == "123"
+        assert yanit.sonuc[0].kod == SUCCESS_CODE
+
+        yanit = Yanit.model_validate_json(
+            requests.post(f"{server.url}/yeniEsuKayit", data=KAPATMA).content
+        )
+        assert yanit.durum == Durum.FAILURE
+        assert yanit.sonuc[0].kod == INVALID_PAYLOAD_CODE
+
+        assert requests.post(f"{server.url}/bilinmeyen", data=b"").status_code == 404
+        assert server.requests["/esuKapatma"] == 1
+
+    with FakeGIBServer(error_rate=1, error_status=502) as server:
+        assert (
+            requests.post(f"{server.url}/esuKapatma", data=KAPATMA).status_code == 502
+        )
+
+    with FakeGIBServer(rate_limit=1) as server:
+        assert (
+            requests.post(f"{server.url}/esuKapatma", data=KAPATMA).status_code == 200
+        )
+        response = requests.post(f"{server.url}/esuKapatma", data=KAPATMA)
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    with FakeGIBServer(authorization="Basic x") as server:
+        assert (
+            requests.post(f"{server.url}/esuKapatma", data=KAPATMA).status_code == 401
+        )
+
+    with pytest.raises(ValueError):
+        FakeGIBServer(error_rate=2)
+
+
+@pytest.mark.parametrize("mode", ["sequential", "threaded", "async"])
+def test_run_load_test(mode: str) -> None:
+    """Test load test runs of every mode against a fake server thread."""
+
+    with FakeGIBServer() as server:
+        report = run_load_test(20, mode=mode, url=server.url)
+        assert server.requests["/yeniEsuKayit"] == 20
+        assert server.requests["/esuMukellefDurum"] == 20
+
+    assert report.mode == mode
+    assert report.rows == 20
+    assert report.requests == 40
+    assert report.unsent == 0
+    assert report.rows_per_sec > 0
+    assert 0 < report.p50 <= report.p95 <= report.p99
+
+    with pytest.raises(ValueError):
+        run_load_test(1, mode="bilinmeyen")
+
+
+def test_load_test_main(capsys: pytest.CaptureFixture) -> None:
+    """Test the command line entry point with a server in a child process."""
+
+    reports = main(["--rows", "5", "--modes", "sequential", "--latency-ms", "1"])
+    assert len(reports) == 1
+    assert reports[0].rows_per_sec > 0
+    assert "sequential" in capsys.readouterr().out
+
+    assert generate_csv(3).getvalue().count("\n") == 4
+    assert CONFIG["GIB_FIRMA_KODU"] == "J000"
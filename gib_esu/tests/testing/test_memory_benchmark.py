@@ -0,0 +1,23 @@
+import pytest
+
+from gib_esu.testing.memory_benchmark import main, run_memory_benchmark
+
+
+def test_run_memory_benchmark() -> None:
+    """Test that the compact rows take less memory than dictionaries."""
+
+    report = run_memory_benchmark(rows=2000)
+    assert report.rows == 2000
+    assert 0 < report.compact_bytes < report.dict_bytes
+    assert report.ratio == pytest.approx(report.dict_bytes / report.compact_bytes)
+
+    with pytest.raises(ValueError):
+        run_memory_benchmark(rows=0)
+
+
+def test_memory_benchmark_main(capsys: pytest.CaptureFixture) -> None:
+    """Test the command line entry point."""
+
+    report = main(["--rows", "10"])
+    assert report.rows == 10
+    assert "compact" in capsys.readouterr().out